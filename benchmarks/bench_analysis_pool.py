@@ -0,0 +1,75 @@
+# ======================================================
+# BENCHMARK DA CAMADA DE ANÁLISE (ESCALA POR NÚCLEOS)
+#
+# Roda analisar_pagina sobre milhares de páginas armazenadas,
+# em linha (0 workers) e no AnalysisPool com 1..N processos.
+#
+# Uso: python benchmarks/bench_analysis_pool.py [n_paginas | dir_html] [max_workers]
+# ======================================================
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.page_analysis import AnalysisPool
+
+
+def gerar_pagina(i):
+    rnd = random.Random(i)
+    blocos = "".join(
+        f'<div><p>{"Serviço especializado em Curitiba. " * rnd.randint(5, 30)}</p>'
+        f'<a href="/servico-{n}">Saiba mais</a></div>'
+        for n in range(rnd.randint(50, 150))
+    )
+    return (
+        f'<html><body><a href="/contato">Contato</a>{blocos}'
+        f'<a href="mailto:contato@empresa{i}.com.br">email</a>'
+        f'<footer>vendas@empresa{i}.com.br | empresa{i}@gmail.com</footer></body></html>'
+    ).encode("utf-8")
+
+
+def carregar(arg):
+    if os.path.isdir(arg):
+        paginas = []
+        for nome in sorted(os.listdir(arg)):
+            if nome.endswith((".html", ".htm")):
+                with open(os.path.join(arg, nome), "rb") as f:
+                    paginas.append(f.read())
+        return paginas
+
+    return [gerar_pagina(i) for i in range(int(arg))]
+
+
+def medir(paginas, workers):
+    pool = AnalysisPool(workers=workers)
+
+    # aquece o pool (spawn dos processos fora da medição)
+    pool.map([(paginas[0], "utf-8", "https://aquecimento")] * max(1, workers))
+
+    start = time.perf_counter()
+    pool.map([(body, "utf-8", f"https://empresa{i}.com.br") for i, body in enumerate(paginas)])
+    elapsed = time.perf_counter() - start
+
+    pool.close()
+    return len(paginas) / elapsed
+
+
+if __name__ == "__main__":
+    arg = sys.argv[1] if len(sys.argv) > 1 else "3000"
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    paginas = carregar(arg)
+    mb = sum(len(p) for p in paginas) / 1e6
+    print(f"{len(paginas)} páginas ({mb:.0f} MB), {os.cpu_count()} CPUs")
+
+    base = medir(paginas, 0)
+    print(f"em linha     {base:8.0f} páginas/s")
+
+    workers = 1
+    while workers <= max_workers:
+        taxa = medir(paginas, workers)
+        print(f"{workers:2d} processos {taxa:8.0f} páginas/s ({taxa / base:.2f}x)")
+        workers *= 2
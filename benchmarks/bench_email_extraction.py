@@ -0,0 +1,105 @@
+# ======================================================
+# BENCHMARK DE EXTRAÇÃO DE EMAILS (MB/S E PRECISÃO)
+#
+# Compara a regex original (sobre o HTML bruto) com o extrator
+# pré-compilado de services/email_extractor.py.
+#
+# Sem argumentos, gera um corpus sintético com gabarito (emails
+# reais, ofuscados e falsos positivos típicos de WordPress).
+# Com um diretório, usa as páginas .html salvas (só throughput).
+#
+# Uso: python benchmarks/bench_email_extraction.py [dir_html] [n_paginas]
+# ======================================================
+
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.email_extractor import extract_emails
+
+
+def extrair_legado(html):
+    return list(set(re.findall(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", html)))
+
+
+# ======================================================
+# CORPUS SINTÉTICO COM GABARITO
+# ======================================================
+
+def _cfemail(email, key):
+    return f"{key:02x}" + "".join(f"{ord(c) ^ key:02x}" for c in email)
+
+
+def gerar_pagina(i, rnd):
+    dominio = f"empresa{i}.com.br"
+    reais = {f"contato@{dominio}", f"joao.silva{i}@{dominio}"}
+    ofuscado = f"financeiro@{dominio}"
+    entidade = f"vendas@{dominio}"
+    reais |= {ofuscado, entidade}
+
+    entidade_html = "".join(f"&#{ord(c)};" for c in entidade)
+    lixo_js = "".join(
+        f'var cfg{n}={{"sentry":"k{n}@o{n}.ingest.sentry.io","img":"hero@{n}x.webp"}};'
+        for n in range(rnd.randint(50, 200))
+    )
+    base64_img = "data:image/png;base64," + "A" * rnd.randint(1_000, 4_000)
+
+    html = f"""<!doctype html><html><head>
+<style>.logo{{background:url(logo@2x.png)}}</style>
+<script>{lixo_js}</script>
+</head><body>
+<img src="{base64_img}"><img srcset="banner@2x.jpg 2x">
+<p>Fale conosco: <a href="mailto:contato@{dominio}">contato@{dominio}</a></p>
+<p>Responsável: joao.silva{i}@{dominio}</p>
+<a href="/cdn-cgi/l/email-protection" class="__cf_email__" data-cfemail="{_cfemail(ofuscado, rnd.randint(1, 255))}">[email&#160;protected]</a>
+<p>{entidade_html}</p>
+{"<p>" + "Lorem ipsum dolor sit amet. " * rnd.randint(200, 2000) + "</p>"}
+</body></html>"""
+    return html, reais
+
+
+def medir(nome, func, paginas):
+    total_bytes = sum(len(html.encode("utf-8")) for html, _ in paginas)
+
+    start = time.perf_counter()
+    resultados = [func(html) for html, _ in paginas]
+    elapsed = time.perf_counter() - start
+
+    linha = f"{nome:<8} {total_bytes / elapsed / 1e6:7.1f} MB/s"
+
+    if paginas[0][1] is not None:
+        verdadeiros = encontrados = corretos = 0
+        for (_, gabarito), achados in zip(paginas, resultados):
+            achados = {e.lower() for e in achados}
+            verdadeiros += len(gabarito)
+            encontrados += len(achados)
+            corretos += len(achados & gabarito)
+
+        precisao = corretos / encontrados if encontrados else 0.0
+        recall = corretos / verdadeiros if verdadeiros else 0.0
+        linha += f" | precisão {precisao:.1%} | recall {recall:.1%}"
+
+    print(linha)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    if args and os.path.isdir(args[0]):
+        paginas = []
+        for nome in sorted(os.listdir(args[0])):
+            if nome.endswith((".html", ".htm")):
+                with open(os.path.join(args[0], nome), encoding="utf-8", errors="replace") as f:
+                    paginas.append((f.read(), None))
+    else:
+        n = int(args[0]) if args else 300
+        rnd = random.Random(42)
+        paginas = [gerar_pagina(i, rnd) for i in range(n)]
+
+    print(f"{len(paginas)} páginas")
+    medir("legado", extrair_legado, paginas)
+    medir("atual", extract_emails, paginas)
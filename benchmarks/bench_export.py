@@ -0,0 +1,93 @@
+# ======================================================
+# BENCHMARK DE EXPORTAÇÃO CSV (LEADS/S)
+#
+# Compara o padrão antigo (abrir o arquivo e escrever uma linha
+# por lead) com o CsvExporter (um handle bufferizado por status).
+#
+# Uso: python benchmarks/bench_export.py [n_leads]
+# ======================================================
+
+import os
+import sys
+import time
+import tempfile
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import csv_export
+from services.csv_export import CsvExporter, CSV_HEADER
+
+STATUS = ["qualificado", "sem_email", "descartado"]
+
+
+def gerar_leads(n):
+    for i in range(n):
+        yield {
+            "nome": f'Empresa "{i}", Ltda',
+            "site": f"https://empresa{i}.com.br",
+            "email_corporativo": f"contato@empresa{i}.com.br",
+            "telefone": "(41) 3333-0000",
+            "cidade": "Curitiba",
+            "bairro": "Batel",
+            "nicho": "dedetizadora",
+            "score_valor": 80,
+            "status": STATUS[i % 3]
+        }
+
+
+# ======================================================
+# PADRÃO ANTIGO (OPEN/APPEND POR LINHA)
+# ======================================================
+
+def exportar_legado(paths, leads):
+    def sanitize(value):
+        if value is None:
+            return ""
+        return str(value).replace('"', '').replace("\n", " ").strip()
+
+    for lead in leads:
+        path = paths[lead["status"]]
+        exists = os.path.isfile(path)
+
+        with open(path, "a", encoding="utf-8") as f:
+            if not exists:
+                f.write(",".join(CSV_HEADER) + "\n")
+
+            row = CsvExporter._row(lead)
+            f.write(",".join(f'"{sanitize(v)}"' for v in row) + "\n")
+
+
+def exportar_atual(paths, leads):
+    with mock.patch.dict(csv_export.OUTPUT_POR_STATUS, paths):
+        exporter = CsvExporter(columnar=False)
+        for lead in leads:
+            exporter.write(lead)
+        exporter.close()
+
+
+def medir(nome, func, n):
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {status: os.path.join(tmp, f"{status}.csv") for status in STATUS}
+        leads = list(gerar_leads(n))
+
+        start = time.perf_counter()
+        func(paths, leads)
+        elapsed = time.perf_counter() - start
+
+        size = sum(os.path.getsize(p) for p in paths.values())
+
+    print(
+        f"{nome:<8} {n} leads em {elapsed:.2f}s -> {n / elapsed:,.0f} leads/s "
+        f"({size / elapsed / 1e6:.1f} MB/s)"
+    )
+    return n / elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    antes = medir("legado", exportar_legado, n)
+    depois = medir("atual", exportar_atual, n)
+
+    print(f"speedup: {depois / antes:.1f}x")
@@ -0,0 +1,89 @@
+# ======================================================
+# BENCHMARK DE PARSING HTML (CPU POR PÁGINA E PICO DE RSS)
+#
+# Compara o caminho antigo (response.text inteiro + árvore
+# BeautifulSoup/lxml + find_all("a")) com o PageScanner
+# (chunks, limite de bytes, parser lxml sem árvore).
+#
+# Cada modo roda em um subprocesso para medir o RSS isolado.
+#
+# Uso: python benchmarks/bench_html_parsing.py [n_paginas] [mb_por_pagina]
+# ======================================================
+
+import os
+import sys
+import time
+import random
+import resource
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CHUNK = 64 * 1024
+
+
+def gerar_pagina(i, mb):
+    # homepage "WordPress inchada": menus, blocos e scripts repetidos
+    rnd = random.Random(i)
+    bloco = (
+        '<div class="wp-block"><p>Serviços de dedetização e desentupimento em Curitiba. '
+        + "Lorem ipsum dolor sit amet " * 20
+        + f'</p><a href="/servico-{rnd.randint(0, 999)}">Saiba mais</a></div>\n'
+    )
+    script = "<script>" + "var a=1;" * 500 + "</script>\n"
+    corpo = (bloco * 10 + script) * max(1, int(mb * 1024 * 1024 / (len(bloco) * 10 + len(script))))
+    return (
+        f'<html><head><title>Empresa {i}</title></head><body>'
+        f'<nav><a href="/contato">Contato</a><a href="/sobre">Sobre</a></nav>'
+        f'{corpo}<footer>contato@empresa{i}.com.br</footer></body></html>'
+    ).encode("utf-8")
+
+
+def modo_legado(paginas):
+    from bs4 import BeautifulSoup
+    from services.email_extractor import extract_emails
+
+    for raw in paginas:
+        html = raw.decode("utf-8")
+        soup = BeautifulSoup(html, "lxml")
+        [a["href"] for a in soup.find_all("a", href=True)]
+        extract_emails(html)
+
+
+def modo_streaming(paginas):
+    from services.html_scan import PageScanner
+    from services.email_extractor import extract_emails
+
+    for raw in paginas:
+        scanner = PageScanner(encoding="utf-8")
+        for start in range(0, len(raw), CHUNK):
+            if not scanner.feed(raw[start:start + CHUNK]):
+                break
+        html, _ = scanner.close()
+        extract_emails(html)
+
+
+def executar(modo, n, mb):
+    paginas = [gerar_pagina(i, mb) for i in range(n)]
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    cpu = time.process_time()
+    {"legado": modo_legado, "streaming": modo_streaming}[modo](paginas)
+    cpu = time.process_time() - cpu
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss
+    print(f"{modo:<10} {cpu / n * 1000:8.1f} ms CPU/página | +{pico / 1024:7.1f} MB RSS")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--modo":
+        executar(sys.argv[2], int(sys.argv[3]), float(sys.argv[4]))
+        sys.exit(0)
+
+    n = sys.argv[1] if len(sys.argv) > 1 else "20"
+    mb = sys.argv[2] if len(sys.argv) > 2 else "4"
+
+    print(f"{n} páginas de ~{mb} MB")
+    for modo in ("legado", "streaming"):
+        subprocess.run([sys.executable, __file__, "--modo", modo, n, mb], check=True)
@@ -0,0 +1,54 @@
+# ======================================================
+# BENCHMARK DA INSTRUMENTAÇÃO (CUSTO POR MEDIÇÃO)
+#
+# Mede o custo de METRICS.timer / METRICS.inc por chamada,
+# com as métricas ligadas e desligadas, em 1 e N threads.
+#
+# Uso: python benchmarks/bench_metrics.py [n_chamadas] [threads]
+# ======================================================
+
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.metrics import Metrics
+
+
+def rodar(metrics, n):
+    for i in range(n):
+        with metrics.timer("places_api", endpoint="text_search"):
+            pass
+        metrics.inc("places_api_chamadas", endpoint="text_search")
+
+
+def medir(enabled, n, threads):
+    metrics = Metrics(enabled=enabled)
+    workers = [
+        threading.Thread(target=rodar, args=(metrics, n // threads))
+        for _ in range(threads)
+    ]
+
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    return elapsed / n * 1e9
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    for t in sorted({1, threads}):
+        desligado = medir(False, n, t)
+        ligado = medir(True, n, t)
+        print(
+            f"{t:2d} threads: desligado {desligado:7.0f} ns | "
+            f"ligado {ligado:7.0f} ns por timer+inc"
+        )
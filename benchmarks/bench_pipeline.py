@@ -0,0 +1,220 @@
+# ======================================================
+# BENCHMARK OFFLINE DO PIPELINE COMPLETO (SEM API E SEM SITES REAIS)
+#
+# Sobe um Google Places falso e uma fazenda de sites locais
+# (benchmarks/fake_servers.py), roda main.main() contra eles e
+# reporta leads/s, chamadas de API por lead e p50/p99 por estágio.
+#
+# Cada resultado é salvo em benchmarks/results/ e comparado com o
+# anterior do mesmo cenário (regressões entre versões).
+#
+# Uso: python benchmarks/bench_pipeline.py [cenario] [n_nichos] [CHAVE=VALOR ...]
+#      cenários: rapido | realista | throttling | geo
+#      CHAVE=VALOR sobrescreve o .env do pipeline (ex.: CRAWL_MODE=sync)
+# ======================================================
+
+import os
+import sys
+import io
+import json
+import time
+import shutil
+import platform
+import tempfile
+import subprocess
+import contextlib
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_servers import FakePlaces, FakePlacesGeo, SiteFarm
+
+RESULTS_DIR = os.path.join(RAIZ, "benchmarks", "results")
+
+# latências em segundos; qps = limite do Places falso (0 = sem limite)
+CENARIOS = {
+    "rapido": {
+        "servidor": {"latencia": 0.0, "token_delay": 0.0, "qps": 0, "site_latencia": 0.0},
+        "env": {"PLACES_QPS": "0", "CRAWL_HOST_DELAY": "0"}
+    },
+    "realista": {
+        "servidor": {"latencia": 0.12, "token_delay": 1.5, "qps": 0, "site_latencia": 0.15},
+        "env": {"PLACES_QPS": "10", "CRAWL_HOST_DELAY": "0.2"}
+    },
+    "throttling": {
+        "servidor": {"latencia": 0.05, "token_delay": 0.5, "qps": 4, "site_latencia": 0.05},
+        "env": {"PLACES_QPS": "10", "CRAWL_HOST_DELAY": "0.1"}
+    },
+    # Places falso com coordenadas (FakePlacesGeo): quadtree de SEARCH_MODE=geo
+    "geo": {
+        "servidor": {"latencia": 0.0, "token_delay": 0.0, "qps": 0, "site_latencia": 0.0, "geo": True},
+        "env": {"PLACES_QPS": "0", "CRAWL_HOST_DELAY": "0", "SEARCH_MODE": "geo"}
+    }
+}
+
+
+def git_revisao():
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        sujo = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        return f"{sha}-dirty" if sujo else sha
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def rodar(cenario, n_nichos, overrides):
+    config_cenario = CENARIOS[cenario]
+    servidor = config_cenario["servidor"]
+
+    farm = SiteFarm(latencia=servidor["site_latencia"])
+    places = (FakePlacesGeo if servidor.get("geo") else FakePlaces)(
+        latencia=servidor["latencia"],
+        token_delay=servidor["token_delay"],
+        qps=servidor["qps"],
+        site_base=farm.start()
+    )
+    places.start()
+
+    tmp = tempfile.mkdtemp(prefix="bench_pipeline_")
+    report_path = os.path.join(tmp, "run_metrics.json")
+
+    env = {
+        "GOOGLE_MAPS_API_KEY": "bench",
+        "USER_AGENT": "lead-scraper-bench",
+        "SQLITE_DB_PATH": os.path.join(tmp, "bench.db"),
+        "HTTP_CACHE_PATH": os.path.join(tmp, "http_cache.db"),
+        "PLACES_TEXT_SEARCH_URL": places.text_search_url,
+        "PLACES_DETAILS_URL": places.details_url,
+        "PAGE_TOKEN_DELAY": str(servidor["token_delay"]),
+        "METRICS_ENABLED": "true",
+        "METRICS_REPORT_PATH": report_path,
+        "PIPELINE_REPORT_INTERVAL": "3600"
+    }
+    env.update(config_cenario["env"])
+    env.update(overrides)
+    os.environ.update(env)
+
+    # CSVs em outputs/ relativo ao diretório temporário
+    cwd = os.getcwd()
+    os.chdir(tmp)
+
+    try:
+        import main
+
+        main.NICHOS_ALTO_TICKET = main.NICHOS_ALTO_TICKET[:n_nichos]
+
+        log = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(log):
+            main.main()
+        elapsed = time.perf_counter() - start
+
+        with open(report_path, encoding="utf-8") as f:
+            relatorio = json.load(f)
+    finally:
+        os.chdir(cwd)
+        places.stop()
+        farm.stop()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    leads = relatorio["totais"]["processados"]
+    chamadas = places.calls["text_search"] + places.calls["place_details"]
+
+    estagios = {
+        h["stage"]: {"p50_ms": h["p50_ms"], "p99_ms": h["p99_ms"], "itens": h["count"]}
+        for h in relatorio["latencias"].get("estagio", [])
+    }
+
+    return {
+        "cenario": cenario,
+        "nichos": n_nichos,
+        "overrides": overrides,
+        "revisao": git_revisao(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "segundos": round(elapsed, 2),
+        "leads": leads,
+        "leads_por_segundo": round(leads / elapsed, 2) if elapsed else 0.0,
+        "chamadas_api": dict(places.calls),
+        "chamadas_por_lead": round(chamadas / leads, 3) if leads else None,
+        "custo_api_usd": relatorio["custo_api"]["total_usd"],
+        "status": {k: v for k, v in relatorio["totais"].items() if k != "processados"},
+        "estagios": estagios
+    }
+
+
+def anterior(cenario, nichos):
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+
+    candidatos = sorted(
+        nome for nome in os.listdir(RESULTS_DIR)
+        if nome.startswith(f"pipeline_{cenario}_{nichos}n_") and nome.endswith(".json")
+    )
+    if not candidatos:
+        return None
+
+    with open(os.path.join(RESULTS_DIR, candidatos[-1]), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def salvar(resultado):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    carimbo = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(
+        RESULTS_DIR,
+        f"pipeline_{resultado['cenario']}_{resultado['nichos']}n_{carimbo}.json"
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def delta(atual, antes):
+    if not antes:
+        return ""
+    variacao = (atual - antes) / antes * 100
+    return f"  ({variacao:+.1f}% vs {antes})"
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    overrides = dict(a.split("=", 1) for a in args if "=" in a)
+    posicionais = [a for a in args if "=" not in a]
+
+    cenario = posicionais[0] if posicionais else "rapido"
+    n_nichos = int(posicionais[1]) if len(posicionais) > 1 else 3
+
+    if cenario not in CENARIOS:
+        raise SystemExit(f"cenário desconhecido: {cenario} ({', '.join(CENARIOS)})")
+
+    base = anterior(cenario, n_nichos)
+    resultado = rodar(cenario, n_nichos, overrides)
+    path = salvar(resultado)
+
+    print(f"cenário {cenario}, {n_nichos} nichos, revisão {resultado['revisao']}")
+    if base:
+        print(f"comparado com {base['revisao']} ({base['data']})")
+
+    print(f"{resultado['leads']} leads em {resultado['segundos']}s{delta(resultado['segundos'], base and base['segundos'])}")
+    print(f"leads/s          {resultado['leads_por_segundo']:8}{delta(resultado['leads_por_segundo'], base and base['leads_por_segundo'])}")
+    print(f"chamadas/lead    {resultado['chamadas_por_lead']:8}{delta(resultado['chamadas_por_lead'], base and base['chamadas_por_lead'])}")
+    print(f"chamadas API     {resultado['chamadas_api']}")
+
+    for stage, stats in resultado["estagios"].items():
+        antes = base and base["estagios"].get(stage, {}).get("p99_ms")
+        print(
+            f"{stage:15s} p50 {stats['p50_ms']:9.2f} ms  "
+            f"p99 {stats['p99_ms']:9.2f} ms{delta(stats['p99_ms'], antes)}"
+        )
+
+    print(f"resultado salvo em {os.path.relpath(path, RAIZ)}")
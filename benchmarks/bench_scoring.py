@@ -0,0 +1,57 @@
+# ======================================================
+# BENCHMARK DE SCORING (POR LEAD x EM LOTE COM PANDAS)
+#
+# Compara LeadScorer.calcular_score (um dict por vez) com
+# LeadScorer.score_batch (DataFrame) e confere que os dois
+# produzem o mesmo score, motivos e status.
+#
+# Uso: python benchmarks/bench_scoring.py [n_leads]
+# ======================================================
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from config import BAIRROS_CURITIBA
+from services.scoring import LeadScorer
+
+
+def gerar_lead(rnd):
+    return {
+        "site": rnd.choice(["https://empresa.com.br", None]),
+        "nicho": rnd.choice(["dentista", "advocacia", None]),
+        "concorrencia": rnd.choice([0, 5, 12, 60]),
+        "email_corporativo": rnd.choice(["contato@empresa.com.br", None]),
+        "endereco": f"Rua {rnd.randint(1, 999)}, {rnd.choice(BAIRROS_CURITIBA + ['Pinheirinho', 'CIC'])}, Curitiba - PR"
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    rnd = random.Random(42)
+    leads = [gerar_lead(rnd) for _ in range(n)]
+    scorer = LeadScorer()
+
+    start = time.perf_counter()
+    por_lead = [scorer.calcular_score(dict(lead)) for lead in leads]
+    t_lead = time.perf_counter() - start
+
+    df = pd.DataFrame(leads)
+    start = time.perf_counter()
+    lote = scorer.score_batch(df)
+    t_lote = time.perf_counter() - start
+
+    iguais = (
+        lote["score_valor"].tolist() == [l["score_valor"] for l in por_lead]
+        and lote["score_motivos"].tolist() == [l["score_motivos"] for l in por_lead]
+        and lote["status"].tolist() == [l["status"] for l in por_lead]
+    )
+
+    print(f"{n} leads")
+    print(f"por lead {t_lead:6.2f}s")
+    print(f"em lote  {t_lote:6.2f}s ({t_lead / t_lote:.1f}x) | resultados idênticos: {iguais}")
@@ -0,0 +1,102 @@
+# ======================================================
+# MICRO-BENCHMARK DE PERSISTÊNCIA (LEADS/S NO SQLITE)
+#
+# Compara o padrão antigo (uma conexão + commit por operação)
+# com o Storage atual (conexão única, WAL e escritas em lote).
+#
+# Uso: python benchmarks/bench_storage.py [n_leads]
+# ======================================================
+
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.storage import Storage
+
+
+def gerar_leads(n):
+    for i in range(n):
+        yield {
+            "place_id": f"place_{i}",
+            "nome": f"Empresa {i}",
+            "site": f"https://empresa{i}.com.br",
+            "email_corporativo": f"contato@empresa{i}.com.br",
+            "status": "qualificado",
+            "score_valor": 80,
+            "nicho": "dedetizadora",
+            "cidade": "Curitiba",
+            "bairro": "Batel"
+        }
+
+
+# ======================================================
+# PADRÃO ANTIGO (CONEXÃO + COMMIT POR OPERAÇÃO)
+# ======================================================
+
+def rodar_legado(db_path, leads):
+    storage = Storage(db_path)  # apenas cria o schema
+    storage.close()
+
+    for lead in leads:
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("SELECT 1 FROM leads WHERE place_id = ? LIMIT 1", (lead["place_id"],)).fetchone()
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO leads (
+                    place_id, nome, site, email, status, score, nicho, cidade, bairro, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    lead["place_id"], lead["nome"], lead["site"], lead["email_corporativo"],
+                    lead["status"], lead["score_valor"], lead["nicho"], lead["cidade"],
+                    lead["bairro"], datetime.utcnow().isoformat()
+                )
+            )
+            conn.commit()
+
+
+# ======================================================
+# STORAGE ATUAL
+# ======================================================
+
+def rodar_atual(db_path, leads):
+    storage = Storage(db_path)
+
+    for lead in leads:
+        storage.lead_exists(lead["place_id"])
+        storage.save_lead(lead)
+
+    storage.close()
+
+
+def medir(nome, func, n):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        leads = list(gerar_leads(n))
+
+        start = time.perf_counter()
+        func(db_path, leads)
+        elapsed = time.perf_counter() - start
+
+        with sqlite3.connect(db_path) as conn:
+            total = conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+
+    print(f"{nome:<8} {n} leads em {elapsed:.2f}s -> {n / elapsed:,.0f} leads/s (gravados: {total})")
+    return n / elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    antes = medir("legado", rodar_legado, n)
+    depois = medir("atual", rodar_atual, n)
+
+    print(f"speedup: {depois / antes:.1f}x")
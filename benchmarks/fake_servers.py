@@ -0,0 +1,443 @@
+# ======================================================
+# STUBS LOCAIS PARA O BENCHMARK OFFLINE
+#
+# FakePlaces: Text Search / Place Details determinísticos
+# (latência, paginação, ativação do next_page_token e
+# throttling configuráveis).
+# FakePlacesGeo: lugares com coordenadas e densidade
+# concentrada em polos; respeita location + radius.
+# SiteFarm: sites sintéticos com home + página de contato
+# (opcionalmente, parte deles em latin-1 sem charset).
+#
+# Mesma entrada -> mesma resposta: os resultados são derivados
+# de hashes da query / place_id, nunca de estado aleatório.
+# ======================================================
+
+import json
+import math
+import time
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, unquote
+
+BAIRROS_ENDERECO = ["Batel", "Água Verde", "Centro", "Cajuru", "Boqueirão", "Xaxim"]
+
+# centro aproximado dos bairros de config.BAIRROS_CURITIBA (FakePlacesGeo)
+BAIRROS_COORDENADAS = {
+    "Centro": (-25.4284, -49.2733),
+    "Batel": (-25.4419, -49.2897),
+    "Água Verde": (-25.4520, -49.2830),
+    "Bigorrilho": (-25.4330, -49.2960),
+    "Cabral": (-25.4060, -49.2560),
+    "Ahú": (-25.4030, -49.2640),
+    "Juvevê": (-25.4150, -49.2590),
+    "Alto da Glória": (-25.4200, -49.2620),
+    "Rebouças": (-25.4450, -49.2660),
+    "Portão": (-25.4750, -49.2950),
+    "Santa Felicidade": (-25.4040, -49.3310),
+    "Boa Vista": (-25.3870, -49.2450),
+    "Hauer": (-25.4810, -49.2510),
+    "Xaxim": (-25.5030, -49.2620),
+    "Cajuru": (-25.4480, -49.2150),
+    "Boqueirão": (-25.5000, -49.2380),
+    "Uberaba": (-25.4880, -49.2250),
+    "Pinheirinho": (-25.5160, -49.2960),
+    "Tatuquara": (-25.5670, -49.3250),
+    "Cidade Industrial": (-25.4940, -49.3430)
+}
+
+
+def _seed(*partes) -> int:
+    return int(hashlib.md5("|".join(map(str, partes)).encode("utf-8")).hexdigest()[:12], 16)
+
+
+class _Servidor:
+    def __init__(self, latencia: float):
+        self.latencia = latencia
+        self._server = None
+
+    def _handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            # headers e corpo saem em writes separados: sem Nagle, sem atraso de ACK
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if servidor.latencia:
+                    time.sleep(servidor.latencia)
+                status, headers, body = servidor.responder(self)
+                self.send_response(status)
+                for nome, valor in headers.items():
+                    self.send_header(nome, valor)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self) -> str:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+# ======================================================
+# GOOGLE PLACES FALSO
+# ======================================================
+
+class FakePlaces(_Servidor):
+    def __init__(
+        self,
+        latencia: float = 0.0,
+        token_delay: float = 0.0,
+        qps: float = 0.0,
+        pool: int = 400,
+        site_ratio: float = 0.7,
+        sites: int = 150,
+        site_base: str = ""
+    ):
+        super().__init__(latencia)
+
+        # token só é aceito token_delay segundos depois de emitido
+        self.token_delay = token_delay
+
+        # acima deste QPS responde OVER_QUERY_LIMIT (0 = sem limite)
+        self.qps = qps
+
+        # place_ids possíveis por nicho: bairros diferentes se sobrepõem
+        self.pool = pool
+        self.site_ratio = site_ratio
+        self.sites = sites
+        self.site_base = site_base
+
+        self.calls = {"text_search": 0, "place_details": 0, "throttled": 0, "token_invalido": 0}
+        self._tokens = {}
+        self._janela = []
+        self._lock = threading.Lock()
+
+    def _throttled(self) -> bool:
+        if not self.qps:
+            return False
+        agora = time.monotonic()
+        with self._lock:
+            self._janela = [t for t in self._janela if agora - t < 1.0]
+            if len(self._janela) >= self.qps:
+                self.calls["throttled"] += 1
+                return True
+            self._janela.append(agora)
+            return False
+
+    def _resultados(self, q):
+        query = q.get("query", "")
+        nicho = query.split(" ")[0]
+        seed = _seed(query)
+        total = 20 + seed % 41
+        escolhidos = dict.fromkeys(
+            _seed(query, i) % self.pool for i in range(total * 2)
+        )
+        return [f"{nicho}-{n}" for n in list(escolhidos)[:total]]
+
+    def _item(self, place_id: str):
+        seed = _seed(place_id)
+        return {
+            "place_id": place_id,
+            "name": f"Empresa {place_id}",
+            "types": ["point_of_interest", "establishment"],
+            "formatted_address": f"Rua {seed % 900}, {BAIRROS_ENDERECO[seed % len(BAIRROS_ENDERECO)]}, Curitiba - PR",
+            "rating": 3 + (seed % 20) / 10,
+            "user_ratings_total": seed % 300,
+            "geometry": {"location": {
+                "lat": -25.645 + (seed % 3000) / 10000,
+                "lng": -49.389 + (seed // 3000 % 2040) / 10000
+            }}
+        }
+
+    def _text_search(self, q):
+        with self._lock:
+            self.calls["text_search"] += 1
+
+        if "pagetoken" in q:
+            with self._lock:
+                emitido = self._tokens.get(q["pagetoken"])
+            if emitido is None or time.monotonic() < emitido[0]:
+                with self._lock:
+                    self.calls["token_invalido"] += 1
+                return {"status": "INVALID_REQUEST", "results": []}
+            consulta, pagina = emitido[1], emitido[2]
+        else:
+            consulta, pagina = q, 0
+
+        ids = self._resultados(consulta)
+        body = {
+            "status": "OK" if ids else "ZERO_RESULTS",
+            "results": [self._item(pid) for pid in ids[pagina * 20:(pagina + 1) * 20]]
+        }
+
+        if (pagina + 1) * 20 < len(ids) and pagina < 2:
+            # location/radius entram no token: tiles diferentes, mesma query
+            token = f"{_seed(consulta.get('query', ''), consulta.get('location'), consulta.get('radius'), pagina):x}"
+            with self._lock:
+                self._tokens[token] = (time.monotonic() + self.token_delay, consulta, pagina + 1)
+            body["next_page_token"] = token
+
+        return body
+
+    def _details(self, q):
+        with self._lock:
+            self.calls["place_details"] += 1
+
+        place_id = q.get("place_id", "")
+        seed = _seed("details", place_id)
+        result = dict(self._item(place_id))
+        result.update({
+            "formatted_phone_number": f"(41) 9{seed % 10000:04d}-{seed % 9999:04d}",
+            "address_components": [],
+            "website": (
+                f"{self.site_base}/s{seed % self.sites}/"
+                if self.site_base and (seed % 100) < self.site_ratio * 100 else None
+            )
+        })
+        return {"status": "OK", "result": result}
+
+    def responder(self, request):
+        parts = urlsplit(request.path)
+        q = {k: v[0] for k, v in parse_qs(parts.query).items()}
+
+        if self._throttled():
+            body = {"status": "OVER_QUERY_LIMIT", "results": []}
+        elif parts.path.startswith("/textsearch"):
+            body = self._text_search(q)
+        else:
+            body = self._details(q)
+
+        return 200, {"Content-Type": "application/json"}, json.dumps(body).encode("utf-8")
+
+    @property
+    def text_search_url(self) -> str:
+        return f"{self.base}/textsearch/json"
+
+    @property
+    def details_url(self) -> str:
+        return f"{self.base}/details/json"
+
+    def start(self) -> str:
+        self.base = super().start()
+        return self.base
+
+# ======================================================
+# FAZENDA DE SITES SINTÉTICOS
+# ======================================================
+
+# página de contato dos sites legados (URL acentuada, relativa à home)
+CONTATO_LEGADO = "contato-e-localização"
+
+
+class SiteFarm(_Servidor):
+    def __init__(
+        self,
+        latencia: float = 0.0,
+        blocos: int = 40,
+        legados: bool = False,
+        etag: bool = True
+    ):
+        super().__init__(latencia)
+
+        # tamanho da home (blocos de texto/links), para dar trabalho ao parser
+        self.blocos = blocos
+
+        # 1 em cada 5 sites servido em latin-1 sem charset no Content-Type
+        self.legados = legados
+
+        # ETag + 304 no GET condicional; sem ETag, toda resposta é um 200 completo
+        self.etag = etag
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def legado(self, site: str) -> bool:
+        return self.legados and _seed(site) % 5 == 0
+
+    def _pagina(self, site: str, pagina: str) -> str:
+        seed = _seed(site)
+        dominio = f"empresa{site}.com.br"
+
+        if self.legado(site):
+            if pagina == "":
+                return (
+                    f'<html><body><p>Atenção: orçamento sem compromisso.</p>'
+                    f'<a href="{CONTATO_LEGADO}">Localização e contato</a></body></html>'
+                )
+            if pagina == CONTATO_LEGADO:
+                return f'<html><body><a href="mailto:atendimento@{dominio}">atendimento</a></body></html>'
+            return "<html><body><p>Página não encontrada</p></body></html>"
+
+        if pagina == "":
+            conteudo = "".join(
+                f'<div><p>{"Atendimento 24h em Curitiba. " * (3 + n % 5)}</p>'
+                f'<a href="/{site}/servico-{n}">Serviço {n}</a></div>'
+                for n in range(self.blocos)
+            )
+            email = f"info@{dominio}" if seed % 3 else f"{site}@gmail.com"
+            return (
+                f'<html><body><a href="/{site}/contato">Contato</a>{conteudo}'
+                f"<footer>{email}</footer></body></html>"
+            )
+
+        if pagina == "contato":
+            # parte dos sites só tem email genérico (lead sem email corporativo)
+            if seed % 4 == 0:
+                return f'<html><body><a href="mailto:{site}@hotmail.com">email</a></body></html>'
+            return (
+                f'<html><body><a href="mailto:contato@{dominio}">contato</a> '
+                f"comercial@{dominio}</body></html>"
+            )
+
+        return "<html><body><p>Página sem contato</p></body></html>"
+
+    def responder(self, request):
+        with self._lock:
+            self.hits += 1
+
+        partes = unquote(urlsplit(request.path).path).strip("/").split("/")
+        site, pagina = partes[0], partes[1] if len(partes) > 1 else ""
+
+        etag = f'"{_seed(site, pagina):x}"'
+        if self.etag and request.headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+
+        if self.legado(site):
+            body = self._pagina(site, pagina).encode("iso-8859-1")
+            headers = {"Content-Type": "text/html"}
+        else:
+            body = self._pagina(site, pagina).encode("utf-8")
+            headers = {"Content-Type": "text/html; charset=utf-8"}
+
+        if self.etag:
+            headers["ETag"] = etag
+        return 200, headers, body
+
+# ======================================================
+# GOOGLE PLACES FALSO COM GEOGRAFIA (MODO GEO)
+# ======================================================
+
+class FakePlacesGeo(FakePlaces):
+    def __init__(
+        self,
+        bbox=(-25.645, -49.389, -25.345, -49.185),
+        lugares: int = 4000,
+        polos: int = 4,
+        fracao_polos: float = 0.7,
+        espalhamento: float = 0.015,
+        metros_por_ponto: float = 10,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+
+        # (sul, oeste, norte, leste) da cidade principal; fora dela vale o FakePlaces
+        self.bbox = bbox
+        self.lugares = lugares
+        self.polos = polos
+
+        # parte dos lugares concentrada em torno dos polos (espalhamento em graus)
+        self.fracao_polos = fracao_polos
+        self.espalhamento = espalhamento
+
+        # busca por texto de um bairro: cada ponto de relevância (0-999) vale
+        # metros_por_ponto metros de distância do centro do bairro
+        self.metros_por_ponto = metros_por_ponto
+
+        self._mapa = {}
+
+    def _ponto(self, *partes):
+        sul, oeste, norte, leste = self.bbox
+        seed = _seed(*partes)
+        return (
+            sul + (seed % 10007) / 10007 * (norte - sul),
+            oeste + (seed // 10007 % 10009) / 10009 * (leste - oeste)
+        )
+
+    def _lugares_do_nicho(self, nicho: str):
+        # {place_id: (lat, lng, relevância)}, fixo por nicho
+        with self._lock:
+            if nicho in self._mapa:
+                return self._mapa[nicho]
+
+        # polos comerciais nos bairros centrais
+        sul, oeste, norte, leste = self.bbox
+        centros = list(BAIRROS_COORDENADAS.values())[:self.polos]
+        lugares = {}
+
+        for i in range(self.lugares):
+            seed = _seed(nicho, "geo", i)
+            if seed % 1000 < self.fracao_polos * 1000:
+                # soma de uniformes: concentração perto do centro do polo
+                lat0, lng0 = centros[seed % self.polos]
+                dlat = sum((_seed(seed, "lat", j) % 1000) / 1000 - 0.5 for j in range(3))
+                dlng = sum((_seed(seed, "lng", j) % 1000) / 1000 - 0.5 for j in range(3))
+                lat = min(norte, max(sul, lat0 + dlat * self.espalhamento))
+                lng = min(leste, max(oeste, lng0 + dlng * self.espalhamento))
+            else:
+                lat, lng = self._ponto(nicho, "disperso", i)
+            lugares[f"{nicho}-geo-{i}"] = (lat, lng, _seed(seed, "relevancia") % 1000)
+
+        with self._lock:
+            self._mapa[nicho] = lugares
+        return lugares
+
+    @staticmethod
+    def _distancia(a, b) -> float:
+        dy = math.radians(a[0] - b[0]) * 6_371_000
+        dx = math.radians(a[1] - b[1]) * 6_371_000 * math.cos(math.radians((a[0] + b[0]) / 2))
+        return math.hypot(dx, dy)
+
+    def _resultados(self, q):
+        query = q.get("query", "")
+        nicho = query.split(" ")[0]
+
+        lugares = self._lugares_do_nicho(nicho)
+
+        if q.get("location"):
+            # location + radius: só o que está no círculo, mais relevantes primeiro
+            lat, lng = (float(v) for v in q["location"].split(","))
+            raio = float(q.get("radius") or 0)
+            ranking = [
+                (relevancia, place_id)
+                for place_id, (plat, plng, relevancia) in lugares.items()
+                if self._distancia((lat, lng), (plat, plng)) <= raio
+            ]
+        elif ", Curitiba" in query:
+            # bairro no texto é só viés: lugares relevantes da cidade toda competem
+            # (bairros vizinhos devolvem quase os mesmos resultados)
+            bairro = query[len(nicho) + 1:query.index(", Curitiba")]
+            centro = BAIRROS_COORDENADAS.get(bairro) or self._ponto("bairro", bairro)
+            ranking = [
+                (relevancia - self._distancia(centro, (plat, plng)) / self.metros_por_ponto, place_id)
+                for place_id, (plat, plng, relevancia) in lugares.items()
+            ]
+        else:
+            # região metropolitana: sem geografia, como no FakePlaces
+            return super()._resultados(q)
+
+        # teto de 60 resultados, como a API
+        return [place_id for _, place_id in sorted(ranking, reverse=True)[:60]]
+
+    def _item(self, place_id: str):
+        item = super()._item(place_id)
+        nicho = place_id.split("-")[0]
+
+        if "-geo-" in place_id:
+            lat, lng, relevancia = self._lugares_do_nicho(nicho)[place_id]
+            item["geometry"] = {"location": {"lat": lat, "lng": lng}}
+            item["user_ratings_total"] = relevancia
+        return item
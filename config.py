@@ -1,3 +1,5 @@
+import os
+
 # =========================================
 # CONFIGURAÇÕES GERAIS DO PROJETO
 # =========================================
@@ -62,12 +64,26 @@ BAIRROS_CURITIBA = [
     "Cidade Industrial"
 ]
 
+# =========================================
+# MODO GEO (QUADTREE SOBRE O MUNICÍPIO)
+# Caixa envolvente de Curitiba: (sul, oeste, norte, leste)
+# =========================================
+
+BBOX_CURITIBA = (-25.645, -49.389, -25.345, -49.185)
+
 # =========================================
 # GOOGLE PLACES – TEXT SEARCH
 # =========================================
 
-PLACES_TEXT_SEARCH_URL = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-PLACES_DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
+# sobrescrevíveis pelo ambiente do processo (stub local do benchmark offline)
+PLACES_TEXT_SEARCH_URL = os.getenv(
+    "PLACES_TEXT_SEARCH_URL",
+    "https://maps.googleapis.com/maps/api/place/textsearch/json"
+)
+PLACES_DETAILS_URL = os.getenv(
+    "PLACES_DETAILS_URL",
+    "https://maps.googleapis.com/maps/api/place/details/json"
+)
 
 # Campos solicitados no Place Details (economia de custo)
 PLACES_DETAILS_FIELDS = [
@@ -80,6 +96,12 @@ PLACES_DETAILS_FIELDS = [
     "geometry"
 ]
 
+# Custo estimado por chamada (USD), usado nas estimativas do planejador e das métricas
+TEXT_SEARCH_COST = float(os.getenv("TEXT_SEARCH_COST", 0.032))
+
+# Place Details com os campos de PLACES_DETAILS_FIELDS (Basic + Contact Data)
+PLACE_DETAILS_COST = float(os.getenv("PLACE_DETAILS_COST", 0.020))
+
 # =========================================
 # FILTROS DE QUALIDADE
 # =========================================
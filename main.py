@@ -1,16 +1,34 @@
 import os
+import threading
+from typing import Optional
 from dotenv import load_dotenv
 
 from config import (
     NICHOS_ALTO_TICKET,
     CIDADE_PRINCIPAL,
-    CIDADES_ADICIONAIS
+    ESTADO
 )
 
-from services.places_client import GooglePlacesClient
+from services.places_client import GooglePlacesClient, PLACES_QPS, deduplicar_por_place_id
+from services.async_places_client import coletar_por_nicho_async
+from services.http_cache import ResponseCache
+from services.checkpoint import RunCheckpoint
+from services.query_planner import QueryPlanner
+from services.geo_search import GeoSearch
+from services.rate_limiter import AdaptiveRateLimiter
 from services.site_crawler import SiteCrawler
+from services.async_site_crawler import AsyncCrawlerBridge
+from services.page_analysis import AnalysisPool
+from services.crawl_cache import CrawlCache
+from services.site_canonical import canonicalize_site
 from services.scoring import LeadScorer
 from services.storage import Storage
+from services.csv_export import CsvExporter
+from services.pipeline import Pipeline
+from services.metrics import METRICS, METRICS_REPORT_PATH, METRICS_PROMETHEUS_PATH
+from services.traffic_archive import traffic_from_env, DRY_RUN_OUTPUT_DIR
+from services.work_queue import WorkerSession
+from services.lead_refresh import RefreshScheduler, REFRESH_ENABLED
 
 # ======================================================
 # BOOTSTRAP
@@ -20,6 +38,11 @@ load_dotenv()
 
 USER_AGENT = os.getenv("USER_AGENT")
 SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH")
+COLLECT_MODE = os.getenv("COLLECT_MODE", "sync").lower()
+SEARCH_MODE = os.getenv("SEARCH_MODE", "bairros").lower()
+CRAWL_MODE = os.getenv("CRAWL_MODE", "sync").lower()
+ENRICH_WORKERS = int(os.getenv("ENRICH_WORKERS", 4))
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", 8))
 
 if not USER_AGENT:
     raise RuntimeError("USER_AGENT não definido no .env")
@@ -31,87 +54,415 @@ if not SQLITE_DB_PATH:
 # MAIN PIPELINE
 # ======================================================
 
-def main():
+def main(fila: Optional[WorkerSession] = None):
+    # fila: worker da execução distribuída (shards.py); unidades em vez de nichos
     print("▶ Iniciando Lead Scraper Maps (Grupo 3)")
 
-    places_client = GooglePlacesClient()
-    crawler = SiteCrawler(user_agent=USER_AGENT)
+    # TRAFFIC_RECORD grava Places + sites; DRY_RUN reproduz a gravação sem rede
+    traffic = traffic_from_env()
+    replay = bool(traffic and traffic.replaying)
+
+    if replay:
+        print(f"DRY_RUN: reproduzindo {traffic.path} (sem rede, sem QPS, leads e caches em memória)")
+
+    # estado persistente fica de fora do replay: o resultado depende só da gravação
+    state_db = ":memory:" if replay else SQLITE_DB_PATH
+
+    # limitador único de QPS compartilhado por coleta e enriquecimento
+    # (AIMD: reduz o ritmo em OVER_QUERY_LIMIT/429 e volta a subir até PLACES_QPS)
+    # workers da execução distribuída dividem a cota entre si
+    qps = PLACES_QPS / fila.workers if fila else PLACES_QPS
+    rate_limiter = AdaptiveRateLimiter(0 if replay else qps)
+
+    # cache persistente de Text Search / Place Details
+    http_cache = ResponseCache(":memory:") if replay else ResponseCache()
+
+    # progresso por consulta: execução interrompida retoma de onde parou
+    # (na execução distribuída, o lease de cada unidade faz esse papel)
+    checkpoint = None if fila else RunCheckpoint(db_path=state_db)
+
+    # rendimento por nicho/local: pula consultas que só repetem place_ids
+    planner = QueryPlanner(db_path=state_db)
+
+    places_client = GooglePlacesClient(
+        rate_limiter=rate_limiter,
+        cache=http_cache,
+        checkpoint=checkpoint,
+        planner=planner,
+        traffic=traffic
+    )
+
+    # modo geo: quadtree de buscas location+radius sobre a cidade principal
+    geo_search = GeoSearch(places_client) if SEARCH_MODE == "geo" else None
+
     scorer = LeadScorer()
-    storage = Storage(db_path=SQLITE_DB_PATH)
 
-    total_processados = 0
-    total_qualificados = 0
-    total_sem_email = 0
-    total_descartados = 0
+    # DRY_RUN: leads em memória e CSVs em diretório próprio (reprodução repetível)
+    storage = Storage(
+        db_path=state_db,
+        exporter=CsvExporter(truncate=True, output_dir=DRY_RUN_OUTPUT_DIR) if replay else None
+    )
+
+    # parsing/regex dos sites em processos separados (fora do GIL)
+    analysis = AnalysisPool()
+
+    # emails por página já crawleada; vencido o TTL, revalida com GET condicional
+    crawl_cache = CrawlCache(db_path=state_db)
+
+    # gravação: sem cache de crawling, toda página é baixada (e gravada) inteira
+    crawler_cache = None if traffic and traffic.recording else crawl_cache
+
+    if CRAWL_MODE == "async":
+        crawler = AsyncCrawlerBridge(
+            user_agent=USER_AGENT, analysis=analysis, cache=crawler_cache, traffic=traffic
+        )
+    else:
+        crawler = SiteCrawler(
+            user_agent=USER_AGENT, analysis=analysis, cache=crawler_cache, traffic=traffic
+        )
+
+    totais = {
+        "processados": 0,
+        "qualificado": 0,
+        "sem_email": 0,
+        "descartado": 0
+    }
+
+    # place_ids já despachados / resultado de crawling por domínio nesta execução
+    vistos = set()
+    sites_crawleados = {}
+    sites_locks = {}
+    sites_lock = threading.Lock()
+
+    # leads com site / URLs distintas informadas pelo Maps
+    sites_totais = {"leads": 0, "urls": set()}
 
-    for nicho in NICHOS_ALTO_TICKET:
+    # revisão dos leads já conhecidos cujo enriquecimento venceu o TTL
+    # (workers e DRY_RUN ficam de fora: um só processo revisa, com dados reais)
+    refresh = RefreshScheduler(storage) if REFRESH_ENABLED and not fila and not replay else None
+
+    # --------------------------------------------------
+    # ESTÁGIOS
+    # --------------------------------------------------
+    def coletar_unidade(unidade):
+        local = f"{unidade['bairro']} / {unidade['cidade']}" if unidade["bairro"] else unidade["cidade"]
+        print(f"\n=== Unidade {unidade['id']}: {unidade['nicho'].upper()} em {local} - {unidade['estado']} ===")
+
+        consulta = places_client.coletar_unidade(
+            unidade["nicho"], unidade["cidade"], unidade["bairro"], unidade["estado"]
+        )
+        leads_maps = deduplicar_por_place_id(consulta.resultados)
+        print(f"Encontrados {len(leads_maps)} registros únicos no Maps")
+
+        novos = set(storage.filter_new_place_ids(
+            lead.get("place_id") for lead in leads_maps
+        ))
+        leads_novos = [lead for lead in leads_maps if lead.get("place_id") in novos]
+
+        # a unidade só conclui quando o último desses leads sair do pipeline
+        place_ids = [lead.get("place_id") for lead in leads_maps]
+        if fila.abrir(unidade, place_ids, consulta.page_count, len(leads_novos)):
+            fila.concluir(unidade["id"])
+
+        for lead in leads_novos:
+            lead.update({
+                "nicho": unidade["nicho"],
+                "estado": unidade["estado"],
+                "cidade": unidade["cidade"],
+                "concorrencia": len(leads_maps),
+                "unidade": unidade["id"]
+            })
+            yield lead
+
+    def liberar(lead):
+        # último lead da unidade: grava o lote pendente antes de marcá-la concluída
+        if fila and fila.item_concluido(lead["unidade"]):
+            storage.flush()
+            fila.concluir(lead["unidade"])
+
+    def coletar(nicho):
         print(f"\n=== Nicho: {nicho.upper()} ===")
 
-        leads_maps = places_client.coletar_por_nicho(nicho)
+        if geo_search:
+            # a quadtree decide os próximos tiles pelo resultado dos anteriores (sync)
+            leads_maps = geo_search.coletar_por_nicho(nicho)
+        elif COLLECT_MODE == "async":
+            leads_maps = coletar_por_nicho_async(
+                nicho,
+                rate_limiter=rate_limiter,
+                cache=http_cache,
+                checkpoint=checkpoint,
+                planner=planner,
+                traffic=traffic
+            )
+        else:
+            leads_maps = places_client.coletar_por_nicho(nicho)
         print(f"Encontrados {len(leads_maps)} registros únicos no Maps")
 
         # proxy simples de concorrência
         concorrencia_nicho = len(leads_maps)
 
-        for lead in leads_maps:
-            place_id = lead.get("place_id")
+        # descarta já processados com uma única verificação em lote
+        novos = set(storage.filter_new_place_ids(
+            lead.get("place_id") for lead in leads_maps
+        ))
 
-            if storage.lead_exists(place_id):
+        for lead in leads_maps:
+            if lead.get("place_id") not in novos:
                 continue
 
-            # enriquecer com details
-            lead = places_client.enriquecer_lead(lead)
-
             lead.update({
                 "nicho": nicho,
+                "estado": ESTADO,
                 "cidade": CIDADE_PRINCIPAL,
                 "concorrencia": concorrencia_nicho
             })
+            yield lead
+
+    def deduplicar(lead):
+        place_id = lead.get("place_id")
+
+        if place_id in vistos or storage.lead_exists(place_id):
+            liberar(lead)
+            return None
 
-            site = lead.get("site")
+        # outro worker já reivindicou o mesmo lugar (bairros vizinhos)
+        if fila and not fila.reivindicar(place_id, lead["unidade"]):
+            liberar(lead)
+            return None
 
-            # crawling do site (se existir e ainda não foi crawleado)
-            email_corporativo = None
+        vistos.add(place_id)
+        return lead
 
-            if site and not storage.site_crawled(site):
-                crawl_result = crawler.crawl_site(site)
+    def enriquecer(lead):
+        return places_client.enriquecer_lead(lead)
 
-                emails_corp = crawl_result.get("emails_corporativos", [])
-                if emails_corp:
-                    email_corporativo = emails_corp[0]
+    def crawlear(lead):
+        # www, http/https, parâmetros de rastreio e filiais -> mesmo domínio
+        canonico = canonicalize_site(lead.get("site"))
 
-                storage.mark_site_crawled(site)
+        # crawling do site (leads do mesmo domínio reaproveitam o resultado)
+        email_corporativo = None
 
-            lead["email_corporativo"] = email_corporativo
+        if canonico:
+            chave, url = canonico
 
-            # scoring
-            lead = scorer.calcular_score(lead)
+            with sites_lock:
+                site_lock = sites_locks.setdefault(chave, threading.Lock())
+                sites_totais["leads"] += 1
+                sites_totais["urls"].add(lead["site"])
 
-            # persistência
-            storage.save_lead(lead)
+            # um worker por domínio; os demais esperam e reaproveitam o resultado
+            with site_lock:
+                if chave not in sites_crawleados:
+                    sites_crawleados[chave] = crawler.crawl_site(url)
+                crawl_result = sites_crawleados[chave]
+
+            emails_corp = crawl_result.get("emails_corporativos", [])
+            if emails_corp:
+                email_corporativo = emails_corp[0]
+
+        lead["email_corporativo"] = email_corporativo
+        return lead
+
+    def pontuar(lead):
+        return scorer.calcular_score(lead)
+
+    def revisar_details(lead):
+        # sem o cache de Place Details: o ponto é ver o dado atual
+        return places_client.enriquecer_lead(lead, usar_cache=False)
+
+    def revisar(lead):
+        # atualiza a linha no SQLite; os CSVs são só de append e não recebem o lead de novo
+        refresh.registrar(lead)
+        return lead
+
+    def persistir(lead):
+        storage.save_lead(lead)
+
+        # workers não disputam os CSVs: o coordenador exporta do SQLite ao final
+        if not fila:
             storage.export_csv(lead)
 
-            # métricas
-            total_processados += 1
+        # métricas
+        totais["processados"] += 1
+        status = lead["status"]
+        totais[status if status in totais else "descartado"] += 1
+        METRICS.inc("leads", nicho=lead.get("nicho"), status=status)
+
+        liberar(lead)
+        return lead
+
+    # coleta → dedupe → enriquecimento → crawling → score → persistência
+    pipeline = (
+        Pipeline()
+        .add_stage(
+            "coleta",
+            coletar_unidade if fila else coletar,
+            # unidades são independentes: várias coletadas ao mesmo tempo (esperas de token)
+            workers=fila.em_voo if fila else 1,
+            expand=True
+        )
+        .add_stage("dedupe", deduplicar, workers=1)
+        .add_stage("enriquecimento", enriquecer, workers=ENRICH_WORKERS)
+        .add_stage("crawling", crawlear, workers=CRAWL_WORKERS)
+        .add_stage("score", pontuar, workers=1)
+        .add_stage("persistencia", persistir, workers=1)
+    )
+
+    erro = True
+    try:
+        pipeline.run(fila.unidades(pipeline.parado) if fila else NICHOS_ALTO_TICKET)
+
+        # leads conhecidos: details → crawling → score → diferenças (maior score primeiro)
+        if refresh:
+            print("\n=== Revisão de leads conhecidos ===")
+            revisao = (
+                Pipeline()
+                .add_stage("revisao_details", revisar_details, workers=ENRICH_WORKERS)
+                .add_stage("revisao_crawling", crawlear, workers=CRAWL_WORKERS)
+                .add_stage("revisao_score", pontuar, workers=1)
+                .add_stage("revisao", revisar, workers=1)
+            )
+            revisao.run(refresh.pendentes(ignorar=vistos))
+
+        erro = False
+
+        # execução completa: a próxima começa do zero
+        if checkpoint:
+            checkpoint.reset()
+    finally:
+        # worker com erro devolve as unidades abertas sem esperar o lease
+        if fila:
+            fila.close(erro=erro)
+
+        if CRAWL_MODE == "async":
+            crawler.close()
+
+        analysis.close()
+
+        # garante o flush das escritas em lote
+        storage.close()
 
-            if lead["status"] == "qualificado":
-                total_qualificados += 1
-            elif lead["status"] == "sem_email":
-                total_sem_email += 1
-            else:
-                total_descartados += 1
+        # gravação só substitui o arquivo anterior ao final de uma execução completa
+        if traffic:
+            traffic.close(ok=not erro)
 
     # ==================================================
     # RESUMO FINAL
     # ==================================================
     print("\n====== RESUMO DA EXECUÇÃO ======")
-    print(f"Leads processados: {total_processados}")
-    print(f"Qualificados: {total_qualificados}")
-    print(f"Sem email corporativo: {total_sem_email}")
-    print(f"Descartados: {total_descartados}")
-    print("Arquivos CSV gerados em /outputs")
+    print(f"Leads processados: {totais['processados']}")
+    print(f"Qualificados: {totais['qualificado']}")
+    print(f"Sem email corporativo: {totais['sem_email']}")
+    print(f"Descartados: {totais['descartado']}")
+
+    planner_stats = planner.summary()
+    print(
+        f"Planner: {planner_stats['consultas_puladas']} consultas puladas, "
+        f"~{planner_stats['chamadas_evitadas']} chamadas evitadas "
+        f"(~US$ {planner_stats['custo_evitado']})"
+    )
+
+    if geo_search:
+        geo_stats = geo_search.summary()
+        print(
+            f"Geo: {geo_stats['tiles']} tiles, {geo_stats['subdivididos']} subdivididos, "
+            f"{geo_stats['vazios']} vazios, {geo_stats['no_limite']} no limite de profundidade/raio"
+        )
+
+    limiter_stats = rate_limiter.stats()
+    print(
+        f"Places API: {limiter_stats['rate']} QPS ao final, {limiter_stats['throttles']} throttles, "
+        f"{limiter_stats['backoffs']} backoffs ({limiter_stats['backoff_segundos']}s)"
+    )
+
+    for endpoint, stats in http_cache.summary().items():
+        print(f"Cache {endpoint}: {stats['hits']} hits / {stats['misses']} misses")
+
+    print(
+        f"Sites: {len(sites_crawleados)} domínios crawleados para {sites_totais['leads']} leads "
+        f"({len(sites_totais['urls'])} URLs distintas), "
+        f"{sites_totais['leads'] - len(sites_crawleados)} crawls evitados"
+    )
+
+    crawl_stats = crawl_cache.summary()
+    print(
+        f"Cache de crawling: {crawl_stats['frescos']} frescas, "
+        f"{crawl_stats['revalidados']} revalidadas (304), "
+        f"{crawl_stats['inalterados']} inalteradas, {crawl_stats['baixados']} baixadas"
+    )
+
+    for stats in pipeline.stats():
+        print(
+            f"Estágio {stats['stage']}: {stats['recebidos']} itens, "
+            f"{stats['itens_por_segundo']}/s, fila máx. {stats['fila_maxima']}"
+        )
+
+    if fila:
+        fila_stats = fila.summary()
+        print(
+            f"Worker {fila_stats['worker']}: {fila_stats['unidades']} unidades "
+            f"({fila_stats['retomadas']} retomadas de workers que caíram), "
+            f"{fila_stats['candidatos']} leads candidatos antes da reivindicação"
+        )
+
+    if refresh:
+        refresh_stats = refresh.summary()
+        campos = ", ".join(f"{campo}: {total}" for campo, total in refresh_stats["campos"].items())
+        print(
+            f"Revisão: {refresh_stats['revisados']}/{refresh_stats['agendados']} leads revisados, "
+            f"{refresh_stats['alterados']} alterados ({campos or 'sem mudanças'}), "
+            f"~US$ {refresh_stats['custo_usd']} em Place Details"
+        )
+
+    if traffic:
+        traffic_stats = traffic.summary()
+        print(
+            f"Tráfego ({traffic.mode}): {traffic_stats['gravados']} gravados, "
+            f"{traffic_stats['reproduzidos']} reproduzidos, {traffic_stats['ausentes']} ausentes"
+        )
+
+    if METRICS.enabled:
+        custo = METRICS.custo_api()
+        chamadas = ", ".join(f"{sku}: {d['chamadas']}" for sku, d in custo["por_sku"].items())
+        print(f"Custo estimado da API: US$ {custo['total_usd']} ({chamadas} chamadas)")
+
+        # relatório da execução: métricas + resumos já impressos acima
+        METRICS.write_report(METRICS_REPORT_PATH, {
+            "totais": totais,
+            "pipeline": pipeline.stats(),
+            "rate_limiter": limiter_stats,
+            "http_cache": http_cache.summary(),
+            "crawl_cache": crawl_stats,
+            "planner": planner_stats,
+            "geo": geo_search.summary() if geo_search else None,
+            "trafego": {"modo": traffic.mode, **traffic.summary()} if traffic else None,
+            "worker": fila.summary() if fila else None,
+            "revisao": refresh.summary() if refresh else None,
+            "sites": {
+                "dominios": len(sites_crawleados),
+                "leads": sites_totais["leads"],
+                "urls": len(sites_totais["urls"])
+            }
+        })
+        print(f"Métricas da execução em {METRICS_REPORT_PATH}")
+
+        if METRICS_PROMETHEUS_PATH:
+            METRICS.write_prometheus(METRICS_PROMETHEUS_PATH)
+
+    if replay:
+        print(f"Arquivos CSV do DRY_RUN gerados em {DRY_RUN_OUTPUT_DIR}")
+    elif not fila:
+        print("Arquivos CSV gerados em /outputs")
     print("Execução finalizada.")
 
+    http_cache.close()
+    crawl_cache.close()
+    planner.close()
+    if checkpoint:
+        checkpoint.close()
+
 # ======================================================
 # ENTRYPOINT
 # ======================================================
@@ -0,0 +1,85 @@
+import os
+import pandas as pd
+from dotenv import load_dotenv
+
+from services.scoring import LeadScorer
+from services.storage import Storage
+from services.csv_export import CsvExporter
+
+# ======================================================
+# BOOTSTRAP
+# ======================================================
+
+load_dotenv()
+
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH")
+RESCORE_CHUNK_SIZE = int(os.getenv("RESCORE_CHUNK_SIZE", 50_000))
+
+if not SQLITE_DB_PATH:
+    raise RuntimeError("SQLITE_DB_PATH não definido no .env")
+
+# ======================================================
+# RESCORE OFFLINE (SEM REDE)
+# ======================================================
+
+def rescore():
+    print("▶ Recalculando score dos leads salvos")
+
+    scorer = LeadScorer()
+    storage = Storage(db_path=SQLITE_DB_PATH)
+
+    # os três CSVs são regenerados a partir da tabela leads
+    exporter = CsvExporter(truncate=True)
+
+    totais = {
+        "processados": 0,
+        "alterados": 0,
+        "preservados": 0,
+        "qualificado": 0,
+        "sem_email": 0,
+        "descartado": 0
+    }
+
+    try:
+        for chunk in storage.iter_lead_chunks(RESCORE_CHUNK_SIZE):
+            # gravados antes da migração (concorrencia NULL): sem os dados do scorer,
+            # mantêm score e status em vez de perder pontos que não dá para avaliar
+            legado = chunk["concorrencia"].isna()
+            preservados = chunk[legado]
+
+            avaliados = scorer.score_batch(chunk[~legado])
+            storage.update_scores(avaliados)
+
+            totais["preservados"] += len(preservados)
+            totais["alterados"] += int((avaliados["status"] != chunk.loc[~legado, "status"]).sum())
+            chunk = pd.concat([df for df in (avaliados, preservados) if not df.empty]).sort_index()
+
+            # NaN do pandas -> None (campo vazio no CSV, como no pipeline)
+            for lead in chunk.astype(object).where(chunk.notna(), None).to_dict("records"):
+                exporter.write(lead)
+
+            totais["processados"] += len(chunk)
+            for status, total in chunk["status"].value_counts().items():
+                totais[status] += int(total)
+    finally:
+        exporter.close()
+        storage.close()
+
+    # ==================================================
+    # RESUMO FINAL
+    # ==================================================
+    print("\n====== RESUMO DO RESCORE ======")
+    print(f"Leads reprocessados: {totais['processados']}")
+    print(f"Status alterados: {totais['alterados']}")
+    print(f"Sem dados para reavaliar (score mantido): {totais['preservados']}")
+    print(f"Qualificados: {totais['qualificado']}")
+    print(f"Sem email corporativo: {totais['sem_email']}")
+    print(f"Descartados: {totais['descartado']}")
+    print("Arquivos CSV regenerados em /outputs")
+
+# ======================================================
+# ENTRYPOINT
+# ======================================================
+
+if __name__ == "__main__":
+    rescore()
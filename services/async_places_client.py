@@ -0,0 +1,211 @@
+import os
+import time
+import asyncio
+import aiohttp
+from typing import List, Dict, Optional, Tuple
+
+from config import (
+    PLACES_TEXT_SEARCH_URL
+)
+
+from services.places_client import (
+    API_KEY,
+    HEADERS,
+    PLACES_QPS,
+    text_search_params,
+    places_retry,
+    verificar_resposta,
+    PlacesApiError,
+    gravar_resposta,
+    deduplicar_por_place_id,
+    planejar_locais,
+    registrar_rendimento,
+    ConsultaPaginada
+)
+from services.rate_limiter import AdaptiveRateLimiter, TokenBucket
+from services.http_cache import ResponseCache
+from services.checkpoint import RunCheckpoint
+from services.query_planner import QueryPlanner
+from services.metrics import METRICS
+from services.traffic_archive import TrafficArchive
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+PLACES_CONCURRENCY = int(os.getenv("PLACES_CONCURRENCY", 8))
+
+# ======================================================
+# ASYNC CLIENT (FAN-OUT DE TEXT SEARCH)
+# ======================================================
+
+class AsyncGooglePlacesClient:
+    def __init__(
+        self,
+        rate_limiter: Optional[TokenBucket] = None,
+        concurrency: int = PLACES_CONCURRENCY,
+        cache: Optional[ResponseCache] = None,
+        checkpoint: Optional[RunCheckpoint] = None,
+        planner: Optional[QueryPlanner] = None,
+        traffic: Optional[TrafficArchive] = None
+    ):
+        if not API_KEY:
+            raise RuntimeError("GOOGLE_MAPS_API_KEY não encontrada no .env")
+
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(PLACES_QPS)
+        self.concurrency = concurrency
+        self.cache = cache
+        self.checkpoint = checkpoint
+        self.planner = planner
+        self.traffic = traffic
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self):
+        # uma única conexão em pool para todas as consultas
+        self.session = aiohttp.ClientSession(
+            headers=HEADERS,
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(total=15)
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+        self.session = None
+
+    def _replaying(self) -> bool:
+        return bool(self.traffic and self.traffic.replaying)
+
+    async def _request(self, params: Dict) -> Tuple[int, Optional[Dict]]:
+        # DRY_RUN: resposta do arquivo gravado, sem rede
+        if self._replaying():
+            return self.traffic.replay_api("text_search", params)
+
+        async with self.session.get(PLACES_TEXT_SEARCH_URL, params=params) as response:
+            http_status = response.status
+            try:
+                data = await response.json(content_type=None) if response.ok else None
+            except ValueError:
+                # página de erro de proxy (HTML com 200): transitório, tenta de novo
+                raise PlacesApiError(f"resposta não JSON (HTTP {http_status})", retryable=True)
+
+        gravar_resposta(self.traffic, "text_search", params, http_status, data)
+        return http_status, data
+
+    # --------------------------------------------------
+    # TEXT SEARCH (bairro + nicho)
+    # --------------------------------------------------
+    @places_retry(aiohttp.ClientError, asyncio.TimeoutError)
+    async def text_search(
+        self,
+        query: str,
+        page_token: Optional[str] = None,
+        location: Optional[Tuple[float, float]] = None,
+        radius: Optional[int] = None
+    ) -> Dict:
+        params = text_search_params(query, page_token, location, radius)
+
+        if self.cache:
+            cached = self.cache.get_pagina("text_search", params)
+            if cached is not None:
+                METRICS.inc("places_cache_hits", endpoint="text_search")
+                gravar_resposta(self.traffic, "text_search", params, 200, cached)
+                return cached
+
+        await self.rate_limiter.acquire_async()
+
+        with METRICS.timer("places_api", endpoint="text_search"):
+            data = verificar_resposta(self.rate_limiter, *await self._request(params))
+        if not self._replaying():
+            METRICS.inc("places_api_chamadas", endpoint="text_search")
+
+        if self.cache:
+            self.cache.set("text_search", params, data)
+
+        return data
+
+    # --------------------------------------------------
+    # BUSCA COMPLETA POR NICHO + LOCAL
+    # (a espera do next_page_token não ocupa vaga de request:
+    # as outras consultas seguem enquanto o token ativa)
+    # --------------------------------------------------
+    async def _paginar(self, consulta: ConsultaPaginada, semaphore: asyncio.Semaphore):
+        while not consulta.concluida:
+            espera = consulta.pronta_em - time.monotonic()
+            em_cache = self._replaying() or (
+                self.cache and self.cache.contains(
+                    "text_search", text_search_params(**consulta.params())
+                )
+            )
+            if espera > 0 and not em_cache:
+                await asyncio.sleep(espera)
+
+            async with semaphore:
+                with METRICS.timer("consulta", nicho=consulta.nicho, local=consulta.local):
+                    data = await self.text_search(**consulta.params())
+
+            consulta.registrar(data)
+
+    async def search_by_nicho_and_local(
+        self,
+        nicho: str,
+        cidade: str,
+        bairro: Optional[str] = None
+    ) -> List[Dict]:
+        consulta = ConsultaPaginada(self.checkpoint, nicho, cidade, bairro)
+        await self._paginar(consulta, asyncio.Semaphore(1))
+        return consulta.resultados
+
+    # --------------------------------------------------
+    # PIPELINE PRINCIPAL DE COLETA (CONCORRENTE)
+    # --------------------------------------------------
+    async def coletar_por_nicho(self, nicho: str) -> List[Dict]:
+        # limita requests simultâneos, não consultas abertas
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        # locais com rendimento histórico baixo ficam de fora (planner)
+        consultas = [
+            ConsultaPaginada(self.checkpoint, nicho, cidade, bairro)
+            for cidade, bairro in planejar_locais(self.planner, nicho)
+        ]
+
+        async def buscar(consulta: ConsultaPaginada):
+            print(f"[Maps] Buscando '{nicho}' em {consulta.descricao}")
+            await self._paginar(consulta, semaphore)
+
+        await asyncio.gather(*(buscar(consulta) for consulta in consultas))
+
+        registrar_rendimento(self.planner, nicho, consultas)
+
+        # concatena na ordem dos locais -> mesma deduplicação do modo sync
+        leads = []
+        for consulta in consultas:
+            leads.extend(consulta.resultados)
+
+        # Deduplicação por place_id
+        return deduplicar_por_place_id(leads)
+
+
+# ======================================================
+# ATALHO SÍNCRONO (USADO PELO MAIN)
+# ======================================================
+
+def coletar_por_nicho_async(
+    nicho: str,
+    rate_limiter: Optional[TokenBucket] = None,
+    cache: Optional[ResponseCache] = None,
+    checkpoint: Optional[RunCheckpoint] = None,
+    planner: Optional[QueryPlanner] = None,
+    traffic: Optional[TrafficArchive] = None
+) -> List[Dict]:
+    async def _run():
+        async with AsyncGooglePlacesClient(
+            rate_limiter=rate_limiter,
+            cache=cache,
+            checkpoint=checkpoint,
+            planner=planner,
+            traffic=traffic
+        ) as client:
+            return await client.coletar_por_nicho(nicho)
+
+    return asyncio.run(_run())
@@ -0,0 +1,236 @@
+import os
+import time
+import asyncio
+import aiohttp
+import threading
+from requests.utils import get_encoding_from_headers
+from urllib.parse import urlparse
+from typing import Dict, Mapping, Optional, Tuple
+from tenacity import retry, wait_fixed, stop_after_attempt
+
+from services.site_crawler import SiteCrawler, HEADERS, TIMEOUT, CRAWL_DELAY, PAGINA_VAZIA
+from services.html_scan import CRAWL_CHUNK_BYTES, CRAWL_MAX_BYTES, is_html
+from services.page_analysis import AnalysisPool
+from services.crawl_cache import CrawlCache, conditional_headers, content_hash
+from services.metrics import METRICS
+from services.traffic_archive import TrafficArchive
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", 16))
+CRAWL_MAX_PER_HOST = int(os.getenv("CRAWL_MAX_PER_HOST", 1))
+CRAWL_HOST_DELAY = float(os.getenv("CRAWL_HOST_DELAY", CRAWL_DELAY))
+
+# ======================================================
+# POLIDEZ POR HOST
+# ======================================================
+
+class _HostSlot:
+    def __init__(self, max_in_flight: int):
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.lock = asyncio.Lock()
+        self.next_allowed = 0.0
+
+    async def wait_turn(self, delay: float):
+        # espaçamento mínimo entre inícios de requests no mesmo host
+        async with self.lock:
+            wait = self.next_allowed - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.next_allowed = time.monotonic() + delay
+
+# ======================================================
+# ASYNC SITE CRAWLER
+# ======================================================
+
+class AsyncSiteCrawler(SiteCrawler):
+    def __init__(
+        self,
+        user_agent: str,
+        concurrency: int = CRAWL_CONCURRENCY,
+        max_per_host: int = CRAWL_MAX_PER_HOST,
+        host_delay: float = CRAWL_HOST_DELAY,
+        analysis: Optional[AnalysisPool] = None,
+        cache: Optional[CrawlCache] = None,
+        traffic: Optional[TrafficArchive] = None
+    ):
+        super().__init__(user_agent=user_agent, analysis=analysis, cache=cache, traffic=traffic)
+
+        self.concurrency = concurrency
+        self.max_per_host = max_per_host
+        self.host_delay = host_delay
+
+        self.aio_session = None
+        self._global = None
+        self._hosts: Dict[str, _HostSlot] = {}
+
+    async def __aenter__(self):
+        # um único pool de conexões para todos os sites
+        self.aio_session = aiohttp.ClientSession(
+            headers=dict(HEADERS),
+            connector=aiohttp.TCPConnector(
+                limit=self.concurrency,
+                limit_per_host=self.max_per_host
+            ),
+            timeout=aiohttp.ClientTimeout(total=TIMEOUT)
+        )
+        self._global = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aio_session.close()
+        self.aio_session = None
+
+    def _slot(self, url: str) -> _HostSlot:
+        host = (urlparse(url).hostname or "").lower()
+        if host not in self._hosts:
+            self._hosts[host] = _HostSlot(self.max_per_host)
+        return self._hosts[host]
+
+    # --------------------------------------------------
+    # REQUEST COM RETRY (POLIDEZ + LIMITE GLOBAL)
+    # --------------------------------------------------
+    @retry(wait=wait_fixed(2), stop=stop_after_attempt(3))
+    async def _fetch_async(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Mapping, Optional[Tuple[bytes, Optional[str]]]]:
+        slot = self._slot(url)
+
+        async with slot.semaphore:
+            await slot.wait_turn(self.host_delay)
+
+            async with self._global:
+                # latência até os headers (mesma medida do crawler síncrono)
+                with METRICS.timer("crawl_http", host=urlparse(url).hostname or ""):
+                    response = await self.aio_session.get(url, headers=headers, allow_redirects=True)
+
+                async with response:
+                    response.raise_for_status()
+
+                    if response.status == 304 or not is_html(response.headers.get("Content-Type")):
+                        return response.status, response.headers, None
+
+                    # streaming com limite de bytes; o parsing fica na camada de CPU
+                    body = bytearray()
+                    async for chunk in response.content.iter_chunked(CRAWL_CHUNK_BYTES):
+                        body.extend(chunk)
+                        if len(body) >= CRAWL_MAX_BYTES:
+                            del body[CRAWL_MAX_BYTES:]
+                            break
+
+                    # mesmo fallback do crawler síncrono (requests): text/* sem charset = ISO-8859-1
+                    encoding = get_encoding_from_headers(response.headers)
+                    return response.status, response.headers, (bytes(body), encoding)
+
+    async def _request_async(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Mapping, Optional[Tuple[bytes, Optional[str]]]]:
+        # DRY_RUN: página gravada, sem polidez por host (não há host)
+        if self._replaying():
+            status, gravados, body, encoding = self.traffic.replay_page(url)
+            return status, gravados, (body, encoding) if body is not None else None
+
+        status, response_headers, raw = await self._fetch_async(url, headers)
+
+        if self.traffic:
+            body, encoding = raw if raw else (None, None)
+            self.traffic.record_page(url, status, response_headers, body, encoding)
+
+        return status, response_headers, raw
+
+    # --------------------------------------------------
+    # PÁGINA ANALISADA (CACHE -> GET CONDICIONAL -> DOWNLOAD)
+    # --------------------------------------------------
+    async def _analisar_url_async(self, url: str, site_url: str) -> Dict:
+        entry = self._cached_page(url)
+
+        if entry and entry["fresh"]:
+            self.cache.hit()
+            return entry
+
+        try:
+            status, headers, raw = await self._request_async(url, conditional_headers(entry))
+        except Exception:
+            # site fora do ar: usa o último resultado conhecido
+            if entry:
+                return entry
+            raise
+
+        if entry and status == 304:
+            self.cache.revalidate(url)
+            return entry
+
+        digest = content_hash(raw[0] if raw else None)
+
+        if self._reuse_page(url, entry, digest):
+            return entry
+
+        analise = await self.analysis.analisar_async(*raw, site_url) if raw else PAGINA_VAZIA
+        self._store_page(url, site_url, analise, headers, digest)
+        return analise
+
+    # --------------------------------------------------
+    # CRAWL SITE COMPLETO (LEVE)
+    # --------------------------------------------------
+    async def crawl_site_async(self, site_url: str) -> Dict:
+        if not site_url:
+            return self._build_result({})
+
+        site_url = self._normalize_url(site_url)
+
+        try:
+            # emails da home + links de contato (pool de processos ou cache)
+            analise = await self._analisar_url_async(site_url, site_url)
+        except Exception:
+            return self._build_result({})
+
+        emails = dict(analise["emails"])
+
+        # páginas de contato (mesmo host -> serializadas pela polidez)
+        async def fetch(link: str) -> Dict[str, str]:
+            try:
+                return (await self._analisar_url_async(link, site_url))["emails"]
+            except Exception:
+                return {}
+
+        for found in await asyncio.gather(*(fetch(link) for link in analise["contact_links"])):
+            emails.update(found)
+
+        return self._build_result(emails)
+
+
+# ======================================================
+# PONTE SÍNCRONA (LOOP DEDICADO, USADA PELO PIPELINE)
+# ======================================================
+
+class AsyncCrawlerBridge:
+    def __init__(self, user_agent: str, **kwargs):
+        # um único loop/pool compartilhado por todos os workers de crawling
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="crawl-loop",
+            daemon=True
+        )
+        self._thread.start()
+
+        self.crawler = AsyncSiteCrawler(user_agent=user_agent, **kwargs)
+        self._call(self.crawler.__aenter__())
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def crawl_site(self, site_url: str) -> Dict:
+        return self._call(self.crawler.crawl_site_async(site_url))
+
+    def close(self):
+        self._call(self.crawler.__aexit__(None, None, None))
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
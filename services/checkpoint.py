@@ -0,0 +1,168 @@
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# ======================================================
+# CHECKPOINT DE EXECUÇÃO (NICHO / CIDADE / BAIRRO / PÁGINA)
+# ======================================================
+
+class RunCheckpoint:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._init_db()
+
+    # --------------------------------------------------
+    # INIT DB
+    # --------------------------------------------------
+    def _init_db(self):
+        dirname = os.path.dirname(self.db_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+
+        # uma linha por página concluída de cada consulta
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS query_pages (
+                nicho TEXT,
+                cidade TEXT,
+                bairro TEXT,
+                page_index INTEGER,
+                page_token TEXT,
+                next_page_token TEXT,
+                resultados TEXT,
+                completed_at TEXT,
+                PRIMARY KEY (nicho, cidade, bairro, page_index)
+            )
+        """)
+
+        # consultas totalmente concluídas (paginação encerrada)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS query_runs (
+                nicho TEXT,
+                cidade TEXT,
+                bairro TEXT,
+                total_resultados INTEGER,
+                completed_at TEXT,
+                PRIMARY KEY (nicho, cidade, bairro)
+            )
+        """)
+        self.conn.commit()
+
+    # --------------------------------------------------
+    # CONSULTA CONCLUÍDA -> RESULTADOS SALVOS
+    # --------------------------------------------------
+    def consulta_concluida(self, nicho: str, cidade: str, bairro: Optional[str]) -> bool:
+        with self._lock:
+            row = self.conn.execute(
+                """
+                SELECT 1 FROM query_runs
+                WHERE nicho = ? AND cidade = ? AND bairro = ?
+                """,
+                (nicho, cidade, bairro or "")
+            ).fetchone()
+        return row is not None
+
+    # --------------------------------------------------
+    # RETOMADA: (resultados, próximo token, páginas feitas, última página em)
+    # --------------------------------------------------
+    def retomar(
+        self,
+        nicho: str,
+        cidade: str,
+        bairro: Optional[str]
+    ) -> Tuple[List[Dict], Optional[str], int, Optional[str]]:
+        with self._lock:
+            rows = self.conn.execute(
+                """
+                SELECT page_index, next_page_token, resultados, completed_at FROM query_pages
+                WHERE nicho = ? AND cidade = ? AND bairro = ?
+                ORDER BY page_index
+                """,
+                (nicho, cidade, bairro or "")
+            ).fetchall()
+
+        resultados = []
+        next_token = None
+        salvo_em = None
+
+        for _, token, pagina, completed_at in rows:
+            resultados.extend(json.loads(pagina))
+            next_token = token
+            salvo_em = completed_at
+
+        return resultados, next_token, len(rows), salvo_em
+
+    def salvar_pagina(
+        self,
+        nicho: str,
+        cidade: str,
+        bairro: Optional[str],
+        page_index: int,
+        page_token: Optional[str],
+        resultados: List[Dict],
+        next_page_token: Optional[str]
+    ):
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO query_pages (
+                    nicho, cidade, bairro, page_index,
+                    page_token, next_page_token, resultados, completed_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    nicho, cidade, bairro or "", page_index,
+                    page_token, next_page_token,
+                    json.dumps(resultados, ensure_ascii=False),
+                    datetime.utcnow().isoformat()
+                )
+            )
+            self.conn.commit()
+
+    def concluir_consulta(
+        self,
+        nicho: str,
+        cidade: str,
+        bairro: Optional[str],
+        total_resultados: int
+    ):
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO query_runs (
+                    nicho, cidade, bairro, total_resultados, completed_at
+                )
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (nicho, cidade, bairro or "", total_resultados, datetime.utcnow().isoformat())
+            )
+            self.conn.commit()
+
+    def descartar_consulta(self, nicho: str, cidade: str, bairro: Optional[str]):
+        # token expirado: a consulta recomeça da primeira página
+        with self._lock:
+            self.conn.execute(
+                "DELETE FROM query_pages WHERE nicho = ? AND cidade = ? AND bairro = ?",
+                (nicho, cidade, bairro or "")
+            )
+            self.conn.commit()
+
+    # --------------------------------------------------
+    # FIM DE EXECUÇÃO COMPLETA
+    # --------------------------------------------------
+    def reset(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM query_pages")
+            self.conn.execute("DELETE FROM query_runs")
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
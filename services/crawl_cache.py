@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Mapping, Optional
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+# dentro do TTL a página é reaproveitada sem request; depois, GET condicional
+CRAWL_CACHE_TTL = int(os.getenv("CRAWL_CACHE_TTL", 7 * 24 * 3600))
+
+# ======================================================
+# HELPERS
+# ======================================================
+
+def content_hash(body: Optional[bytes]) -> Optional[str]:
+    if body is None:
+        return None
+    return hashlib.sha256(body).hexdigest()
+
+
+def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+    headers = {}
+
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    return headers
+
+# ======================================================
+# CACHE DE CRAWLING (RESULTADO POR PÁGINA)
+# ======================================================
+
+class CrawlCache:
+    def __init__(self, db_path: str, ttl: int = CRAWL_CACHE_TTL):
+        self.db_path = db_path
+        self.ttl = ttl
+
+        # frescos: sem request | revalidados: 304 | inalterados: 200 com mesmo hash
+        self.stats = {
+            "frescos": 0,
+            "revalidados": 0,
+            "inalterados": 0,
+            "baixados": 0
+        }
+
+        self._lock = threading.Lock()
+        self._init_db()
+
+    # --------------------------------------------------
+    # INIT DB
+    # --------------------------------------------------
+    def _init_db(self):
+        dirname = os.path.dirname(self.db_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+
+        # uma linha por URL (home ou página de contato) já analisada
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_pages (
+                url TEXT PRIMARY KEY,
+                site TEXT,
+                emails TEXT,
+                contact_links TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                fetched_at REAL,
+                validated_at REAL
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_crawl_pages_site
+            ON crawl_pages (site)
+        """)
+        self.conn.commit()
+
+    # --------------------------------------------------
+    # GET: ENTRADA + FLAG DE FRESCOR (SEM CONTAR ESTATÍSTICA)
+    # --------------------------------------------------
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute(
+                """
+                SELECT emails, contact_links, etag, last_modified, content_hash, validated_at
+                FROM crawl_pages WHERE url = ?
+                """,
+                (url,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            "emails": json.loads(row[0]),
+            "contact_links": json.loads(row[1]),
+            "etag": row[2],
+            "last_modified": row[3],
+            "content_hash": row[4],
+            "fresh": time.time() - row[5] <= self.ttl
+        }
+
+    # --------------------------------------------------
+    # SET: PÁGINA BAIXADA E ANALISADA
+    # --------------------------------------------------
+    def set(
+        self,
+        url: str,
+        site: str,
+        analise: Dict,
+        response_headers: Mapping,
+        digest: Optional[str]
+    ):
+        now = time.time()
+
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO crawl_pages (
+                    url, site, emails, contact_links, etag,
+                    last_modified, content_hash, fetched_at, validated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    url,
+                    site,
+                    json.dumps(analise["emails"], ensure_ascii=False),
+                    json.dumps(analise["contact_links"], ensure_ascii=False),
+                    response_headers.get("ETag"),
+                    response_headers.get("Last-Modified"),
+                    digest,
+                    now,
+                    now
+                )
+            )
+            self.conn.commit()
+            self.stats["baixados"] += 1
+
+    # --------------------------------------------------
+    # REVALIDAÇÃO: CONTEÚDO NÃO MUDOU, RENOVA O TTL
+    # --------------------------------------------------
+    def revalidate(self, url: str, motivo: str = "revalidados"):
+        with self._lock:
+            self.conn.execute(
+                "UPDATE crawl_pages SET validated_at = ? WHERE url = ?",
+                (time.time(), url)
+            )
+            self.conn.commit()
+            self.stats[motivo] += 1
+
+    def hit(self):
+        with self._lock:
+            self.stats["frescos"] += 1
+
+    # --------------------------------------------------
+    # RESUMO
+    # --------------------------------------------------
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,191 @@
+import os
+import csv
+import atexit
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config import (
+    OUTPUT_LEADS_QUALIFICADOS,
+    OUTPUT_LEADS_SEM_EMAIL,
+    OUTPUT_LEADS_DESCARTADOS
+)
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+EXPORT_FLUSH_EVERY = int(os.getenv("EXPORT_FLUSH_EVERY", 500))
+EXPORT_BUFFER_BYTES = int(os.getenv("EXPORT_BUFFER_BYTES", 1024 * 1024))
+EXPORT_COLUMNAR = os.getenv("EXPORT_COLUMNAR", "false").lower() in ("1", "true", "yes")
+
+OUTPUT_POR_STATUS = {
+    "qualificado": OUTPUT_LEADS_QUALIFICADOS,
+    "sem_email": OUTPUT_LEADS_SEM_EMAIL,
+    "descartado": OUTPUT_LEADS_DESCARTADOS
+}
+
+CSV_HEADER = [
+    "nome",
+    "site",
+    "email",
+    "telefone",
+    "cidade",
+    "bairro",
+    "nicho",
+    "score_valor",
+    "status"
+]
+
+# ======================================================
+# EXPORTADOR (UM HANDLE BUFFERIZADO POR STATUS)
+# ======================================================
+
+class CsvExporter:
+    def __init__(
+        self,
+        flush_every: int = EXPORT_FLUSH_EVERY,
+        buffer_bytes: int = EXPORT_BUFFER_BYTES,
+        columnar: bool = EXPORT_COLUMNAR,
+        truncate: bool = False,
+        output_dir: Optional[str] = None
+    ):
+        self.flush_every = flush_every
+        self.buffer_bytes = buffer_bytes
+        self.columnar = columnar
+
+        # output_dir: mesmos nomes de arquivo em outro diretório (DRY_RUN)
+        self.paths = {
+            status: os.path.join(output_dir, os.path.basename(path)) if output_dir else path
+            for status, path in OUTPUT_POR_STATUS.items()
+        }
+
+        # truncate: regenera os arquivos do zero em vez de acrescentar
+        self.truncate = truncate
+
+        self._files = {}
+        self._writers = {}
+        self._since_flush = 0
+        self._closed = False
+
+        # linhas da execução para a variante colunar
+        self._rows: Dict[str, List[List[str]]] = {}
+        self._run_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    # --------------------------------------------------
+    # ARQUIVO POR STATUS (ABERTO UMA VEZ POR EXECUÇÃO)
+    # --------------------------------------------------
+    def _writer(self, path: str):
+        writer = self._writers.get(path)
+        if writer is not None:
+            return writer
+
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        mode = "w" if self.truncate else "a"
+        f = open(path, mode, encoding="utf-8", newline="", buffering=self.buffer_bytes)
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+
+        if f.tell() == 0:
+            writer.writerow(CSV_HEADER)
+
+        self._files[path] = f
+        self._writers[path] = writer
+        return writer
+
+    @staticmethod
+    def _row(lead: Dict) -> List[str]:
+        def clean(value) -> str:
+            if value is None:
+                return ""
+            return str(value).replace("\r", " ").replace("\n", " ").strip()
+
+        return [
+            clean(lead.get("nome")),
+            clean(lead.get("site")),
+            clean(lead.get("email_corporativo")),
+            clean(lead.get("telefone")),
+            clean(lead.get("cidade")),
+            clean(lead.get("bairro")),
+            clean(lead.get("nicho")),
+            clean(lead.get("score_valor")),
+            clean(lead.get("status"))
+        ]
+
+    # --------------------------------------------------
+    # ESCRITA
+    # --------------------------------------------------
+    def write(self, lead: Dict):
+        path = self.paths.get(lead.get("status"), self.paths["descartado"])
+        row = self._row(lead)
+
+        with self._lock:
+            # depois do close, um handle novo nunca seria fechado (nem o header regenerado)
+            if self._closed:
+                raise RuntimeError("CsvExporter já foi fechado")
+
+            self._writer(path).writerow(row)
+
+            if self.columnar:
+                self._rows.setdefault(path, []).append(row)
+
+            self._since_flush += 1
+            if self._since_flush >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        for f in self._files.values():
+            f.flush()
+        self._since_flush = 0
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    # --------------------------------------------------
+    # VARIANTE COLUNAR (PARQUET, OU CSV.GZ SEM PYARROW)
+    # --------------------------------------------------
+    def _write_columnar(self):
+        if not self._rows:
+            return
+
+        import pandas as pd
+
+        for path, rows in self._rows.items():
+            df = pd.DataFrame(rows, columns=CSV_HEADER)
+            base = f"{os.path.splitext(path)[0]}_{self._run_id}"
+
+            try:
+                df.to_parquet(f"{base}.parquet", index=False)
+            except ImportError:
+                df.to_csv(f"{base}.csv.gz", index=False, compression="gzip")
+
+        self._rows = {}
+
+    # --------------------------------------------------
+    # SHUTDOWN
+    # --------------------------------------------------
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+            # regeneração: status sem nenhum lead também ficam só com o header
+            if self.truncate:
+                for path in self.paths.values():
+                    self._writer(path)
+
+            for f in self._files.values():
+                f.close()
+
+            self._files = {}
+            self._writers = {}
+
+            if self.columnar:
+                self._write_columnar()
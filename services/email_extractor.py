@@ -0,0 +1,136 @@
+import re
+import html as html_lib
+from urllib.parse import unquote
+from typing import List
+
+from config import (
+    EMAIL_DOMINIOS_GENERICOS,
+    EMAIL_FUNCIONAL_KEYWORDS
+)
+
+# ======================================================
+# PADRÕES PRÉ-COMPILADOS
+# ======================================================
+
+# blocos que não contêm emails de contato (JSON-LD é preservado)
+_RUIDO_RE = re.compile(
+    r"<script(?![^>]*application/ld\+json)[^>]*>.*?</script>"
+    r"|<style[^>]*>.*?</style>"
+    r"|<!--.*?-->"
+    r"|data:[a-z]+/[\w.+-]+;base64,[a-z0-9+/=]+",
+    re.IGNORECASE | re.DOTALL
+)
+
+# varredura única: Cloudflare, mailto (url-encoded) e emails em texto
+_EMAIL_SCAN_RE = re.compile(
+    r'data-cfemail="(?P<cf>[0-9a-f]+)"'
+    r"|email-protection#(?P<cfhash>[0-9a-f]+)"
+    r"|mailto:(?P<mailto>[^\"'<>\s?,;]+)"
+    # lookbehind: só inicia no começo de um token (evita O(n²) em blobs longos)
+    r"|(?<![a-z0-9._%+-])(?P<email>[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,})",
+    re.IGNORECASE
+)
+
+_EMAIL_VALIDO_RE = re.compile(r"^[a-z0-9._%+-]+@(?:[a-z0-9-]+\.)+[a-z]{2,24}$")
+
+# "logo@2x.png", "bg@3x.webp", "app.min@1.2.js"...
+_ASSET_TLDS = frozenset({
+    "png", "jpg", "jpeg", "gif", "svg", "webp", "avif", "ico", "bmp",
+    "tif", "tiff", "css", "js", "map", "json", "mp4", "webm", "mp3",
+    "woff", "woff2", "ttf", "eot", "otf"
+})
+
+# placeholders e serviços de terceiros embutidos em templates
+_DOMINIOS_IGNORADOS = frozenset({
+    "example.com",
+    "example.org",
+    "domain.com",
+    "dominio.com.br",
+    "seudominio.com.br",
+    "email.com",
+    "sentry.io",
+    "wixpress.com"
+})
+
+# ======================================================
+# CLASSIFICAÇÃO (SET + AUTÔMATO DE KEYWORDS)
+# ======================================================
+
+_DOMINIOS_GENERICOS = frozenset(d.lower() for d in EMAIL_DOMINIOS_GENERICOS)
+
+# alternância compilada: uma passada por email, independente do nº de keywords
+_KEYWORDS_RE = re.compile(
+    "|".join(re.escape(k.lower()) for k in sorted(EMAIL_FUNCIONAL_KEYWORDS, key=len, reverse=True))
+)
+
+
+def classify_email(email: str) -> str:
+    email = email.lower()
+    domain = email.rpartition("@")[2]
+
+    if domain in _DOMINIOS_GENERICOS:
+        return "generico"
+
+    if _KEYWORDS_RE.search(email):
+        return "funcional"
+
+    return "corporativo"
+
+# ======================================================
+# EXTRAÇÃO
+# ======================================================
+
+def decode_cfemail(encoded: str) -> str:
+    # Cloudflare Email Obfuscation: 1º byte é a chave XOR
+    try:
+        key = int(encoded[:2], 16)
+        return "".join(
+            chr(int(encoded[i:i + 2], 16) ^ key)
+            for i in range(2, len(encoded) - 1, 2)
+        )
+    except ValueError:
+        return ""
+
+
+def _normalizar(email: str) -> str:
+    return email.strip().strip(".").lower()
+
+
+def is_email_valido(email: str) -> bool:
+    if not _EMAIL_VALIDO_RE.match(email):
+        return False
+
+    domain = email.rpartition("@")[2]
+    if domain.rpartition(".")[2] in _ASSET_TLDS:
+        return False
+
+    # domínio ignorado ou subdomínio dele (o1.ingest.sentry.io)
+    partes = domain.split(".")
+    return not any(
+        ".".join(partes[i:]) in _DOMINIOS_IGNORADOS
+        for i in range(len(partes) - 1)
+    )
+
+
+def extract_emails(html: str) -> List[str]:
+    if not html:
+        return []
+
+    # remove scripts/estilos/imagens inline e decodifica entidades (&#64; etc.)
+    texto = html_lib.unescape(_RUIDO_RE.sub(" ", html))
+
+    emails = set()
+
+    for match in _EMAIL_SCAN_RE.finditer(texto):
+        if match.group("email"):
+            candidato = match.group("email")
+        elif match.group("mailto"):
+            candidato = unquote(match.group("mailto"))
+        else:
+            candidato = decode_cfemail(match.group("cf") or match.group("cfhash"))
+
+        candidato = _normalizar(candidato)
+        if is_email_valido(candidato):
+            emails.add(candidato)
+
+    return list(emails)
@@ -0,0 +1,179 @@
+import os
+import math
+from typing import Dict, List, Optional, Tuple
+
+from config import (
+    CIDADE_PRINCIPAL,
+    CIDADES_ADICIONAIS,
+    BBOX_CURITIBA
+)
+
+from services.places_client import (
+    ConsultaPaginada,
+    GooglePlacesClient,
+    deduplicar_por_place_id
+)
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+# páginas por tile (a API entrega no máximo 3 páginas / 60 resultados)
+GEO_MAX_PAGES = int(os.getenv("GEO_MAX_PAGES", 3))
+
+# tiles com raio abaixo disso não são mais subdivididos (metros)
+GEO_MIN_RADIUS = int(os.getenv("GEO_MIN_RADIUS", 250))
+
+# profundidade máxima da quadtree
+GEO_MAX_DEPTH = int(os.getenv("GEO_MAX_DEPTH", 6))
+
+# caixa envolvente alternativa: "sul,oeste,norte,leste"
+GEO_BBOX = os.getenv("GEO_BBOX")
+
+_RAIO_TERRA = 6_371_000
+
+# (sul, oeste, norte, leste) em graus
+Tile = Tuple[float, float, float, float]
+
+# ======================================================
+# HELPERS DE GEOMETRIA
+# ======================================================
+
+def parse_bbox(valor: Optional[str]) -> Tile:
+    if not valor:
+        return BBOX_CURITIBA
+
+    sul, oeste, norte, leste = (float(v) for v in valor.split(","))
+    if sul >= norte or oeste >= leste:
+        raise ValueError(f"GEO_BBOX inválido: {valor}")
+    return sul, oeste, norte, leste
+
+
+def centro(tile: Tile) -> Tuple[float, float]:
+    sul, oeste, norte, leste = tile
+    return (sul + norte) / 2, (oeste + leste) / 2
+
+
+def raio_metros(tile: Tile) -> int:
+    # meia diagonal: o círculo da busca cobre o tile inteiro
+    sul, oeste, norte, leste = tile
+    lat = math.radians((sul + norte) / 2)
+    dy = math.radians(norte - sul) * _RAIO_TERRA
+    dx = math.radians(leste - oeste) * _RAIO_TERRA * math.cos(lat)
+    return math.ceil(math.hypot(dx, dy) / 2)
+
+
+def subdividir(tile: Tile) -> List[Tile]:
+    sul, oeste, norte, leste = tile
+    lat, lng = centro(tile)
+    return [
+        (sul, oeste, lat, lng),
+        (sul, lng, lat, leste),
+        (lat, oeste, norte, lng),
+        (lat, lng, norte, leste)
+    ]
+
+
+def dentro_do_tile(tile: Tile, lead: Dict) -> bool:
+    sul, oeste, norte, leste = tile
+    lat, lng = lead.get("lat"), lead.get("lng")
+    if lat is None or lng is None:
+        return False
+    return sul <= lat <= norte and oeste <= lng <= leste
+
+# ======================================================
+# CONSULTA DE UM TILE (BUSCA COM location + radius)
+# ======================================================
+
+class ConsultaTile(ConsultaPaginada):
+    def __init__(self, nicho: str, cidade: str, tile: Tile, profundidade: int):
+        # tiles mudam a cada execução: sem checkpoint
+        super().__init__(None, nicho, cidade)
+
+        self.tile = tile
+        self.profundidade = profundidade
+        self.location = centro(tile)
+        self.radius = raio_metros(tile)
+        self.max_pages = GEO_MAX_PAGES
+        self.descricao = (
+            f"tile {self.location[0]:.4f},{self.location[1]:.4f} "
+            f"(r={self.radius} m, nível {profundidade})"
+        )
+        self.local = f"{cidade} (geo nível {profundidade})"
+
+    def resultados_no_tile(self) -> List[Dict]:
+        return [lead for lead in self.resultados if dentro_do_tile(self.tile, lead)]
+
+# ======================================================
+# BUSCA GEOGRÁFICA (QUADTREE)
+# ======================================================
+
+class GeoSearch:
+    def __init__(
+        self,
+        client: GooglePlacesClient,
+        bbox: Optional[Tile] = None,
+        cidade: str = CIDADE_PRINCIPAL,
+        max_depth: int = GEO_MAX_DEPTH,
+        min_radius: int = GEO_MIN_RADIUS
+    ):
+        self.client = client
+        self.bbox = bbox or parse_bbox(GEO_BBOX)
+        self.cidade = cidade
+        self.max_depth = max_depth
+        self.min_radius = min_radius
+
+        self.stats = {
+            "tiles": 0,
+            "subdivididos": 0,
+            "vazios": 0,
+            "no_limite": 0
+        }
+
+    # --------------------------------------------------
+    # QUADTREE: TILE SATURADO VIRA 4, TILE VAZIO PARA
+    # --------------------------------------------------
+    def _expandir(self, consulta: ConsultaPaginada) -> List[ConsultaPaginada]:
+        if not isinstance(consulta, ConsultaTile):
+            return []
+
+        self.stats["tiles"] += 1
+
+        if not consulta.resultados_no_tile():
+            self.stats["vazios"] += 1
+            return []
+
+        if not consulta.saturada:
+            return []
+
+        # ainda há resultados além do teto da API, mas o tile já é pequeno
+        if consulta.profundidade >= self.max_depth or consulta.radius / 2 < self.min_radius:
+            self.stats["no_limite"] += 1
+            return []
+
+        self.stats["subdivididos"] += 1
+        return [
+            ConsultaTile(consulta.nicho, consulta.cidade, tile, consulta.profundidade + 1)
+            for tile in subdividir(consulta.tile)
+        ]
+
+    # --------------------------------------------------
+    # COLETA: QUADTREE NA CIDADE PRINCIPAL + TEXTO NAS DEMAIS
+    # --------------------------------------------------
+    def coletar_por_nicho(self, nicho: str) -> List[Dict]:
+        consultas = [ConsultaTile(nicho, self.cidade, self.bbox, 0)] + [
+            ConsultaPaginada(self.client.checkpoint, nicho, cidade)
+            for cidade in CIDADES_ADICIONAIS
+        ]
+
+        consultas = self.client.executar_consultas(consultas, nicho, expandir=self._expandir)
+
+        leads = []
+        for consulta in consultas:
+            leads.extend(consulta.resultados)
+
+        # Deduplicação por place_id
+        return deduplicar_por_place_id(leads)
+
+    def summary(self) -> Dict[str, int]:
+        return dict(self.stats)
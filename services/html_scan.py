@@ -0,0 +1,126 @@
+import os
+import codecs
+from lxml import etree
+from typing import List, Optional, Tuple
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+CRAWL_MAX_BYTES = int(os.getenv("CRAWL_MAX_BYTES", 1_500_000))
+CRAWL_CHUNK_BYTES = 64 * 1024
+
+CONTACT_KEYWORDS = ["contato", "contact", "fale", "about"]
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# ======================================================
+# HELPERS
+# ======================================================
+
+def is_html(content_type: Optional[str]) -> bool:
+    # sem header: tenta como HTML (comportamento antigo)
+    if not content_type:
+        return True
+    return content_type.split(";")[0].strip().lower() in HTML_CONTENT_TYPES
+
+
+def _decoder(encoding: Optional[str]) -> codecs.IncrementalDecoder:
+    # charset desconhecido no Content-Type ("utf8mb4", "x-user-defined"...): lê como utf-8
+    try:
+        return codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+def filter_contact_links(hrefs: List[str], base_url: str) -> List[str]:
+    links = set()
+
+    for href in hrefs:
+        href = href.lower()
+
+        if any(k in href for k in CONTACT_KEYWORDS):
+            if href.startswith("http"):
+                links.add(href)
+            else:
+                links.add(f"{base_url}/{href.lstrip('/')}")
+
+    return list(links)
+
+# ======================================================
+# PARSER INCREMENTAL (SEM ÁRVORE: SÓ COLETA <a href>)
+# ======================================================
+
+class _AnchorCollector:
+    def __init__(self):
+        self.hrefs = []
+
+    def start(self, tag, attrib):
+        if tag == "a":
+            href = attrib.get("href")
+            if href:
+                self.hrefs.append(href)
+
+    def end(self, tag):
+        pass
+
+    def data(self, data):
+        pass
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return self.hrefs
+
+
+class PageScanner:
+    def __init__(self, encoding: Optional[str] = None, max_bytes: int = CRAWL_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.truncated = False
+
+        self._decoder = _decoder(encoding)
+        self._collector = _AnchorCollector()
+        self._parser = etree.HTMLParser(target=self._collector)
+        self._parts: List[str] = []
+
+    # --------------------------------------------------
+    # ALIMENTA UM CHUNK; RETORNA False AO ATINGIR O LIMITE
+    # --------------------------------------------------
+    def feed(self, chunk: bytes) -> bool:
+        restante = self.max_bytes - self.bytes_read
+        if restante <= 0:
+            self.truncated = True
+            return False
+
+        if len(chunk) > restante:
+            chunk = chunk[:restante]
+            self.truncated = True
+
+        self.bytes_read += len(chunk)
+
+        text = self._decoder.decode(chunk)
+        if text:
+            self._parts.append(text)
+            self._parser.feed(text)
+
+        return not self.truncated
+
+    # --------------------------------------------------
+    # FINALIZA: (texto limitado, hrefs encontrados)
+    # --------------------------------------------------
+    def close(self) -> Tuple[str, List[str]]:
+        tail = self._decoder.decode(b"", final=True)
+        if tail:
+            self._parts.append(tail)
+            self._parser.feed(tail)
+
+        try:
+            hrefs = self._parser.close()
+        except etree.XMLSyntaxError:
+            # documento vazio / truncado: mantém o que já foi coletado
+            hrefs = self._collector.hrefs
+
+        return "".join(self._parts), hrefs or []
+
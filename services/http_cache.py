@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Optional
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", "data/http_cache.db")
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", 50000))
+
+# TTL por endpoint (segundos)
+HTTP_CACHE_TTLS = {
+    "text_search": int(os.getenv("HTTP_CACHE_TTL_TEXT_SEARCH", 7 * 24 * 3600)),
+    "place_details": int(os.getenv("HTTP_CACHE_TTL_DETAILS", 30 * 24 * 3600))
+}
+
+# parâmetros que não fazem parte da identidade da resposta
+IGNORED_PARAMS = {"key"}
+
+# ======================================================
+# CACHE DE RESPOSTAS (SQLITE, ENDEREÇADO POR CONTEÚDO)
+# ======================================================
+
+class ResponseCache:
+    def __init__(
+        self,
+        db_path: str = HTTP_CACHE_PATH,
+        ttls: Optional[Dict[str, int]] = None,
+        max_entries: int = HTTP_CACHE_MAX_ENTRIES
+    ):
+        self.db_path = db_path
+        self.ttls = ttls or HTTP_CACHE_TTLS
+        self.max_entries = max_entries
+
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+        self._lock = threading.Lock()
+        self._init_db()
+
+    # --------------------------------------------------
+    # INIT DB
+    # --------------------------------------------------
+    def _init_db(self):
+        dirname = os.path.dirname(self.db_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                cache_key TEXT PRIMARY KEY,
+                endpoint TEXT,
+                response TEXT,
+                created_at REAL,
+                last_access REAL
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_http_cache_last_access
+            ON http_cache (last_access)
+        """)
+        self.conn.commit()
+
+        self._entries = self.conn.execute(
+            "SELECT COUNT(*) FROM http_cache"
+        ).fetchone()[0]
+
+    # --------------------------------------------------
+    # CHAVE NORMALIZADA (SEM API KEY)
+    # --------------------------------------------------
+    @staticmethod
+    def make_key(endpoint: str, params: Dict) -> str:
+        normalized = {
+            k: str(v).strip()
+            for k, v in params.items()
+            if k not in IGNORED_PARAMS and v is not None
+        }
+        payload = json.dumps([endpoint, normalized], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # --------------------------------------------------
+    # GET / SET
+    # --------------------------------------------------
+    def get(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        ttl = self.ttls.get(endpoint, 0)
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT response, created_at FROM http_cache WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > ttl:
+                self.misses[endpoint] = self.misses.get(endpoint, 0) + 1
+                return None
+
+            self.conn.execute(
+                "UPDATE http_cache SET last_access = ? WHERE cache_key = ?",
+                (now, key)
+            )
+            self.conn.commit()
+            self.hits[endpoint] = self.hits.get(endpoint, 0) + 1
+
+        return json.loads(row[0])
+
+    def contains(self, endpoint: str, params: Dict) -> bool:
+        # consulta sem contar hit/miss nem tocar last_access
+        key = self.make_key(endpoint, params)
+        ttl = self.ttls.get(endpoint, 0)
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT created_at FROM http_cache WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+
+        return row is not None and time.time() - row[0] <= ttl
+
+    def _peek(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        key = self.make_key(endpoint, params)
+        ttl = self.ttls.get(endpoint, 0)
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT response, created_at FROM http_cache WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+
+        if row is None or time.time() - row[1] > ttl:
+            return None
+        return json.loads(row[0])
+
+    # --------------------------------------------------
+    # CONSULTA PAGINADA (AS PÁGINAS VALEM JUNTAS)
+    # --------------------------------------------------
+    def get_pagina(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        if params.get("pagetoken"):
+            return self.get(endpoint, params)
+
+        # o next_page_token guardado na 1ª página expira em minutos: se uma
+        # página seguinte saiu do cache (TTL / LRU), a consulta é refeita do início
+        seguinte = dict(params)
+        pagina = self._peek(endpoint, seguinte)
+        while pagina is not None and pagina.get("next_page_token"):
+            seguinte["pagetoken"] = pagina["next_page_token"]
+            pagina = self._peek(endpoint, seguinte)
+
+        if pagina is None:
+            with self._lock:
+                self.misses[endpoint] = self.misses.get(endpoint, 0) + 1
+            return None
+
+        return self.get(endpoint, params)
+
+    def set(self, endpoint: str, params: Dict, data: Dict):
+        # só respostas válidas entram no cache
+        if data.get("status", "OK") not in ("OK", "ZERO_RESULTS"):
+            return
+
+        key = self.make_key(endpoint, params)
+        now = time.time()
+
+        with self._lock:
+            exists = self.conn.execute(
+                "SELECT 1 FROM http_cache WHERE cache_key = ?",
+                (key,)
+            ).fetchone() is not None
+
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO http_cache (
+                    cache_key, endpoint, response, created_at, last_access
+                )
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, endpoint, json.dumps(data, ensure_ascii=False), now, now)
+            )
+            if not exists:
+                self._entries += 1
+
+            self._evict()
+            self.conn.commit()
+
+    # --------------------------------------------------
+    # EVICÇÃO LRU POR TAMANHO
+    # --------------------------------------------------
+    def _evict(self):
+        excess = self._entries - self.max_entries
+        if excess <= 0:
+            return
+
+        self.conn.execute(
+            """
+            DELETE FROM http_cache WHERE cache_key IN (
+                SELECT cache_key FROM http_cache
+                ORDER BY last_access ASC
+                LIMIT ?
+            )
+            """,
+            (excess,)
+        )
+        self._entries -= excess
+
+    # --------------------------------------------------
+    # RESUMO
+    # --------------------------------------------------
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        endpoints = set(self.hits) | set(self.misses)
+        return {
+            endpoint: {
+                "hits": self.hits.get(endpoint, 0),
+                "misses": self.misses.get(endpoint, 0)
+            }
+            for endpoint in sorted(endpoints)
+        }
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
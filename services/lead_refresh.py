@@ -0,0 +1,105 @@
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import PLACE_DETAILS_COST
+
+from services.storage import Storage, CAMPOS_RASTREADOS, lead_hash
+from services.metrics import METRICS
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+# revisa leads já gravados ao final de cada execução
+REFRESH_ENABLED = os.getenv("REFRESH_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# idade do último enriquecimento a partir da qual o lead é revisado (dias)
+REFRESH_TTL_DAYS = float(os.getenv("REFRESH_TTL_DAYS", 30))
+
+# teto de leads revisados por execução (maior score primeiro)
+REFRESH_MAX_LEADS = int(os.getenv("REFRESH_MAX_LEADS", 500))
+
+# além dos dados do lugar, a mudança de status entra no histórico
+CAMPOS_HISTORICO = CAMPOS_RASTREADOS + ("status",)
+
+# ======================================================
+# REVISÃO INCREMENTAL DE LEADS CONHECIDOS
+# ======================================================
+
+class RefreshScheduler:
+    def __init__(
+        self,
+        storage: Storage,
+        ttl_days: float = REFRESH_TTL_DAYS,
+        max_leads: int = REFRESH_MAX_LEADS
+    ):
+        self.storage = storage
+        self.ttl_days = ttl_days
+        self.max_leads = max_leads
+
+        self.stats = {"agendados": 0, "revisados": 0, "alterados": 0}
+        self.campos = Counter()
+
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------
+    # LEADS VENCIDOS (SNAPSHOT ANTERIOR VAI JUNTO)
+    # --------------------------------------------------
+    def pendentes(self, ignorar: Optional[set] = None) -> Iterator[Dict]:
+        # ignorar: place_ids já enriquecidos nesta execução
+        antes_de = (datetime.utcnow() - timedelta(days=self.ttl_days)).isoformat()
+
+        for lead in self.storage.leads_para_revisar(antes_de, self.max_leads):
+            if ignorar and lead["place_id"] in ignorar:
+                continue
+
+            lead["anterior"] = {campo: lead.get(campo) for campo in CAMPOS_HISTORICO}
+
+            with self._lock:
+                self.stats["agendados"] += 1
+            yield lead
+
+    # --------------------------------------------------
+    # DIFERENÇAS CAMPO A CAMPO
+    # --------------------------------------------------
+    @staticmethod
+    def diferencas(anterior: Dict, lead: Dict) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        return [
+            (campo, anterior.get(campo), lead.get(campo))
+            for campo in CAMPOS_HISTORICO
+            if (anterior.get(campo) or None) != (lead.get(campo) or None)
+        ]
+
+    def registrar(self, lead: Dict) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        anterior = lead.pop("anterior")
+
+        # hash igual e mesmo status: só os timestamps mudam
+        if lead_hash(lead) == lead.get("change_hash") and anterior["status"] == lead.get("status"):
+            diferencas = []
+        else:
+            diferencas = self.diferencas(anterior, lead)
+
+        self.storage.registrar_revisao(lead, diferencas)
+
+        with self._lock:
+            self.stats["revisados"] += 1
+            if diferencas:
+                self.stats["alterados"] += 1
+                self.campos.update(campo for campo, _, _ in diferencas)
+
+        METRICS.inc("leads_revisados", alterado=str(bool(diferencas)).lower())
+        return diferencas
+
+    # --------------------------------------------------
+    # RESUMO
+    # --------------------------------------------------
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                **self.stats,
+                "campos": dict(self.campos),
+                "custo_usd": round(self.stats["revisados"] * PLACE_DETAILS_COST, 2)
+            }
@@ -0,0 +1,262 @@
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from config import TEXT_SEARCH_COST, PLACE_DETAILS_COST
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# relatório JSON da execução
+METRICS_REPORT_PATH = os.getenv("METRICS_REPORT_PATH", "outputs/run_metrics.json")
+
+# textfile para o node_exporter (opcional)
+METRICS_PROMETHEUS_PATH = os.getenv("METRICS_PROMETHEUS_PATH")
+
+SKU_COSTS = {
+    "text_search": TEXT_SEARCH_COST,
+    "place_details": PLACE_DETAILS_COST
+}
+
+# limites superiores dos buckets de latência (segundos)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROMETHEUS_PREFIXO = "lead_scraper"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# ======================================================
+# HISTOGRAMA DE BUCKETS FIXOS
+# ======================================================
+
+class Histogram:
+    __slots__ = ("counts", "total", "soma", "maximo")
+
+    def __init__(self):
+        # último bucket: acima de BUCKETS[-1]
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.total += 1
+        self.soma += value
+        if value > self.maximo:
+            self.maximo = value
+
+    def quantile(self, q: float) -> float:
+        # limite superior do bucket que contém o quantil (nunca acima do máximo visto)
+        alvo = q * self.total
+        acumulado = 0
+        for i, count in enumerate(self.counts):
+            acumulado += count
+            if acumulado >= alvo and i < len(BUCKETS):
+                return min(BUCKETS[i], self.maximo)
+        return self.maximo
+
+    def as_dict(self) -> Dict:
+        return {
+            "count": self.total,
+            "soma_segundos": round(self.soma, 4),
+            "media_ms": round(self.soma / self.total * 1000, 2) if self.total else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 2),
+            "p95_ms": round(self.quantile(0.95) * 1000, 2),
+            "p99_ms": round(self.quantile(0.99) * 1000, 2),
+            "max_ms": round(self.maximo * 1000, 2)
+        }
+
+# ======================================================
+# CRONÔMETRO (CONTEXT MANAGER; resultado=ok|erro)
+# ======================================================
+
+class _Timer:
+    __slots__ = ("metrics", "nome", "labels", "start")
+
+    def __init__(self, metrics: "Metrics", nome: str, labels: Dict):
+        self.metrics = metrics
+        self.nome = nome
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(
+            self.nome,
+            time.perf_counter() - self.start,
+            resultado="erro" if exc_type else "ok",
+            **self.labels
+        )
+
+
+_SEM_MEDICAO = nullcontext()
+
+# ======================================================
+# REGISTRO DE MÉTRICAS DA EXECUÇÃO
+# ======================================================
+
+class Metrics:
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self.inicio = time.time()
+
+        self._histogramas: Dict[Tuple[str, Labels], Histogram] = {}
+        self._contadores: Dict[Tuple[str, Labels], float] = {}
+
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------
+    # REGISTRO
+    # --------------------------------------------------
+    def observe(self, nome: str, segundos: float, **labels):
+        if not self.enabled:
+            return
+
+        chave = (nome, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._histogramas.get(chave)
+            if hist is None:
+                hist = self._histogramas[chave] = Histogram()
+            hist.observe(segundos)
+
+    def inc(self, nome: str, valor: float = 1, **labels):
+        if not self.enabled:
+            return
+
+        chave = (nome, tuple(sorted(labels.items())))
+        with self._lock:
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def timer(self, nome: str, **labels):
+        # desligado: context manager vazio compartilhado (sem relógio nem lock)
+        if not self.enabled:
+            return _SEM_MEDICAO
+        return _Timer(self, nome, labels)
+
+    # --------------------------------------------------
+    # CUSTO ESTIMADO POR SKU (CHAMADAS COBRADAS)
+    # --------------------------------------------------
+    def custo_api(self) -> Dict:
+        with self._lock:
+            chamadas = {sku: 0 for sku in SKU_COSTS}
+            for (nome, labels), valor in self._contadores.items():
+                if nome == "places_api_chamadas":
+                    sku = dict(labels)["endpoint"]
+                    chamadas[sku] = chamadas.get(sku, 0) + int(valor)
+
+        por_sku = {
+            sku: {
+                "chamadas": total,
+                "custo_usd": round(total * SKU_COSTS.get(sku, 0.0), 4)
+            }
+            for sku, total in chamadas.items()
+        }
+        return {
+            "por_sku": por_sku,
+            "total_usd": round(sum(s["custo_usd"] for s in por_sku.values()), 4)
+        }
+
+    # --------------------------------------------------
+    # SNAPSHOT / RELATÓRIOS
+    # --------------------------------------------------
+    def snapshot(self) -> Dict:
+        with self._lock:
+            latencias: Dict[str, List[Dict]] = {}
+            for (nome, labels), hist in sorted(self._histogramas.items()):
+                latencias.setdefault(nome, []).append({**dict(labels), **hist.as_dict()})
+
+            contadores: Dict[str, List[Dict]] = {}
+            for (nome, labels), valor in sorted(self._contadores.items()):
+                contadores.setdefault(nome, []).append({**dict(labels), "valor": valor})
+
+        return {
+            "inicio": datetime.fromtimestamp(self.inicio).isoformat(timespec="seconds"),
+            "duracao_segundos": round(time.time() - self.inicio, 2),
+            "latencias": latencias,
+            "contadores": contadores,
+            "custo_api": self.custo_api()
+        }
+
+    def write_report(self, path: str, extra: Optional[Dict] = None):
+        relatorio = self.snapshot()
+        relatorio.update(extra or {})
+        _write_atomic(path, json.dumps(relatorio, ensure_ascii=False, indent=2, default=str))
+
+    def write_prometheus(self, path: str):
+        linhas = []
+
+        with self._lock:
+            histogramas = sorted(self._histogramas.items())
+            contadores = sorted(self._contadores.items())
+
+        tipos_emitidos = set()
+
+        for (nome, labels), hist in histogramas:
+            metrica = f"{PROMETHEUS_PREFIXO}_{nome}_seconds"
+            if metrica not in tipos_emitidos:
+                linhas.append(f"# TYPE {metrica} histogram")
+                tipos_emitidos.add(metrica)
+
+            acumulado = 0
+            for limite, count in zip(BUCKETS, hist.counts):
+                acumulado += count
+                linhas.append(f"{metrica}_bucket{_labels(labels, le=limite)} {acumulado}")
+            linhas.append(f"{metrica}_bucket{_labels(labels, le='+Inf')} {hist.total}")
+            linhas.append(f"{metrica}_sum{_labels(labels)} {hist.soma:.6f}")
+            linhas.append(f"{metrica}_count{_labels(labels)} {hist.total}")
+
+        for (nome, labels), valor in contadores:
+            metrica = f"{PROMETHEUS_PREFIXO}_{nome}_total"
+            if metrica not in tipos_emitidos:
+                linhas.append(f"# TYPE {metrica} counter")
+                tipos_emitidos.add(metrica)
+            linhas.append(f"{metrica}{_labels(labels)} {valor}")
+
+        metrica = f"{PROMETHEUS_PREFIXO}_api_custo_usd"
+        linhas.append(f"# TYPE {metrica} gauge")
+        for sku, dados in self.custo_api()["por_sku"].items():
+            linhas.append(f"{metrica}{_labels((('sku', sku),))} {dados['custo_usd']}")
+
+        _write_atomic(path, "\n".join(linhas) + "\n")
+
+# ======================================================
+# HELPERS
+# ======================================================
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Labels, **extra) -> str:
+    pares = list(labels) + list(extra.items())
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pares) + "}"
+
+
+def _write_atomic(path: str, conteudo: str):
+    # o leitor (node_exporter / dashboards) nunca vê um arquivo pela metade
+    dirname = os.path.dirname(path)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(conteudo)
+    os.replace(tmp, path)
+
+# ======================================================
+# INSTÂNCIA DA EXECUÇÃO (COMPARTILHADA PELOS MÓDULOS)
+# ======================================================
+
+METRICS = Metrics()
@@ -0,0 +1,81 @@
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from services.email_extractor import extract_emails, classify_email
+from services.html_scan import CRAWL_CHUNK_BYTES, PageScanner, filter_contact_links
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+# 0 = análise no próprio processo (sem pool)
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", os.cpu_count() or 1))
+
+# ======================================================
+# ANÁLISE DE PÁGINA (CPU-BOUND, EXECUTÁVEL EM OUTRO PROCESSO)
+# ======================================================
+
+def analisar_pagina(body: bytes, encoding: Optional[str], base_url: str) -> Dict:
+    # entrada: bytes crus; saída compacta: {email: tipo} + links de contato
+    scanner = PageScanner(encoding=encoding, max_bytes=len(body))
+
+    for start in range(0, len(body), CRAWL_CHUNK_BYTES):
+        scanner.feed(body[start:start + CRAWL_CHUNK_BYTES])
+
+    html, hrefs = scanner.close()
+
+    return {
+        "emails": {email: classify_email(email) for email in extract_emails(html)},
+        "contact_links": filter_contact_links(hrefs, base_url)
+    }
+
+# ======================================================
+# POOL DE ANÁLISE
+# ======================================================
+
+class AnalysisPool:
+    def __init__(self, workers: int = ANALYSIS_WORKERS):
+        self.workers = workers
+        self._executor = None
+
+        if workers > 0:
+            # spawn: seguro com as threads do pipeline já rodando
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+    def submit(self, body: bytes, encoding: Optional[str], base_url: str) -> Future:
+        if self._executor is None:
+            future = Future()
+            try:
+                future.set_result(analisar_pagina(body, encoding, base_url))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+
+        return self._executor.submit(analisar_pagina, body, encoding, base_url)
+
+    def analisar(self, body: bytes, encoding: Optional[str], base_url: str) -> Dict:
+        return self.submit(body, encoding, base_url).result()
+
+    async def analisar_async(self, body: bytes, encoding: Optional[str], base_url: str) -> Dict:
+        if self._executor is None:
+            return analisar_pagina(body, encoding, base_url)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, analisar_pagina, body, encoding, base_url
+        )
+
+    def map(self, paginas: List[tuple]) -> List[Dict]:
+        futures = [self.submit(*pagina) for pagina in paginas]
+        return [f.result() for f in futures]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
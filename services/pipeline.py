@@ -0,0 +1,250 @@
+import os
+import time
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from services.metrics import METRICS
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", 100))
+PIPELINE_REPORT_INTERVAL = float(os.getenv("PIPELINE_REPORT_INTERVAL", 30))
+
+# marcador de fim de fluxo entre estágios
+_FIM = object()
+
+# ======================================================
+# MÉTRICAS POR ESTÁGIO
+# ======================================================
+
+class StageStats:
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.recebidos = 0
+        self.emitidos = 0
+        self.busy_seconds = 0.0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def registrar(self, emitidos: int, elapsed: float):
+        with self._lock:
+            self.recebidos += 1
+            self.emitidos += emitidos
+            self.busy_seconds += elapsed
+
+    def amostrar_fila(self, depth: int):
+        self.queue_depth = depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def as_dict(self) -> Dict:
+        end = self.finished_at or time.monotonic()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "recebidos": self.recebidos,
+            "emitidos": self.emitidos,
+            "itens_por_segundo": round(self.recebidos / elapsed, 2) if elapsed else 0.0,
+            "busy_seconds": round(self.busy_seconds, 2),
+            "fila_atual": self.queue_depth,
+            "fila_maxima": self.max_queue_depth
+        }
+
+# ======================================================
+# ESTÁGIO (N WORKERS LENDO DE UMA FILA LIMITADA)
+# ======================================================
+
+class Stage:
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        workers: int = 1,
+        expand: bool = False
+    ):
+        # func retorna None (descarta), um item, ou um iterável se expand=True
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.expand = expand
+        self.stats = StageStats(name, self.workers)
+
+        self.inbox: Optional[queue.Queue] = None
+        self.outbox: Optional[queue.Queue] = None
+
+        self._ativos = self.workers
+        self._lock = threading.Lock()
+
+# ======================================================
+# PIPELINE
+# ======================================================
+
+class Pipeline:
+    def __init__(
+        self,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        report_interval: float = PIPELINE_REPORT_INTERVAL
+    ):
+        self.queue_size = queue_size
+        self.report_interval = report_interval
+        self.stages: List[Stage] = []
+
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def add_stage(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        workers: int = 1,
+        expand: bool = False
+    ) -> "Pipeline":
+        self.stages.append(Stage(name, func, workers=workers, expand=expand))
+        return self
+
+    # --------------------------------------------------
+    # FILAS COM ABORTO COOPERATIVO
+    # --------------------------------------------------
+    def _put(self, q: queue.Queue, item: Any):
+        # put bloqueante = backpressure do estágio seguinte
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue) -> Any:
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return _FIM
+
+    # --------------------------------------------------
+    # WORKER
+    # --------------------------------------------------
+    def _worker(self, stage: Stage):
+        try:
+            while True:
+                item = self._get(stage.inbox)
+
+                if item is _FIM:
+                    # devolve o marcador para os demais workers do estágio
+                    self._put(stage.inbox, _FIM)
+                    break
+
+                start = time.monotonic()
+                result = stage.func(item)
+
+                outputs = 0
+                bloqueado = 0.0
+                if result is not None:
+                    for out in (result if stage.expand else (result,)):
+                        outputs += 1
+                        if stage.outbox is not None:
+                            put_start = time.monotonic()
+                            self._put(stage.outbox, out)
+                            bloqueado += time.monotonic() - put_start
+
+                elapsed = time.monotonic() - start
+                stage.stats.registrar(outputs, elapsed)
+
+                # latência do próprio estágio (sem a espera por vaga na fila seguinte)
+                METRICS.observe("estagio", elapsed - bloqueado, stage=stage.name)
+
+        except BaseException as exc:
+            if self._error is None:
+                self._error = exc
+            self._stop.set()
+
+        finally:
+            with stage._lock:
+                stage._ativos -= 1
+                ultimo = stage._ativos == 0
+
+            if ultimo:
+                stage.stats.finished_at = time.monotonic()
+                if stage.outbox is not None:
+                    self._put(stage.outbox, _FIM)
+
+    # --------------------------------------------------
+    # MONITOR DE FILAS
+    # --------------------------------------------------
+    def _monitor(self, done: threading.Event):
+        last_report = time.monotonic()
+
+        while not done.wait(0.2):
+            for stage in self.stages:
+                stage.stats.amostrar_fila(stage.inbox.qsize())
+
+            if self.report_interval and time.monotonic() - last_report >= self.report_interval:
+                last_report = time.monotonic()
+                print("[Pipeline] " + " | ".join(
+                    f"{s.name}: {s.stats.recebidos} ok, fila {s.stats.queue_depth}"
+                    for s in self.stages
+                ))
+
+    # --------------------------------------------------
+    # EXECUÇÃO
+    # --------------------------------------------------
+    def run(self, source: Iterable[Any]):
+        if not self.stages:
+            return
+
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        for i, stage in enumerate(self.stages):
+            stage.inbox = queues[i]
+            stage.outbox = queues[i + 1] if i + 1 < len(queues) else None
+
+        threads = []
+        for stage in self.stages:
+            stage.stats.started_at = time.monotonic()
+            for n in range(stage.workers):
+                t = threading.Thread(
+                    target=self._worker,
+                    args=(stage,),
+                    name=f"{stage.name}-{n}",
+                    daemon=True
+                )
+                t.start()
+                threads.append(t)
+
+        done = threading.Event()
+        monitor = threading.Thread(target=self._monitor, args=(done,), daemon=True)
+        monitor.start()
+
+        try:
+            for item in source:
+                if self._stop.is_set():
+                    break
+                self._put(self.stages[0].inbox, item)
+
+            self._put(self.stages[0].inbox, _FIM)
+
+            for t in threads:
+                t.join()
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            done.set()
+            monitor.join()
+
+        if self._error is not None:
+            raise self._error
+
+    def parado(self) -> bool:
+        # erro em algum estágio: fontes longas (ex.: fila de unidades) encerram cedo
+        return self._stop.is_set()
+
+    def stats(self) -> List[Dict]:
+        return [stage.stats.as_dict() for stage in self.stages]
@@ -1,9 +1,16 @@
 import os
 import time
+import heapq
 import requests
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import Callable, List, Dict, Optional, Tuple
 from dotenv import load_dotenv
-from tenacity import retry, wait_fixed, stop_after_attempt
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential
+)
 
 from config import (
     PLACES_TEXT_SEARCH_URL,
@@ -15,6 +22,13 @@ from config import (
     CIDADES_ADICIONAIS
 )
 
+from services.rate_limiter import TokenBucket
+from services.http_cache import ResponseCache
+from services.checkpoint import RunCheckpoint
+from services.query_planner import QueryPlanner
+from services.metrics import METRICS
+from services.traffic_archive import TrafficArchive
+
 # ======================================================
 # ENV / CONFIG
 # ======================================================
@@ -24,71 +38,496 @@ load_dotenv()
 API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
 REQUEST_DELAY = float(os.getenv("REQUEST_DELAY", 1.2))
 MAX_PAGES = int(os.getenv("MAX_PAGES_PER_QUERY", 2))
+PLACES_QPS = float(os.getenv("PLACES_QPS", 5))
+
+# tamanho fixo de página do Text Search
+RESULTADOS_POR_PAGINA = 20
+
+# next_page_token: espera inicial e novas tentativas enquanto não ativa
+PAGE_TOKEN_DELAY = float(os.getenv("PAGE_TOKEN_DELAY", 1.5))
+PAGE_TOKEN_RETRY_DELAY = float(os.getenv("PAGE_TOKEN_RETRY_DELAY", 0.5))
+PAGE_TOKEN_MAX_TENTATIVAS = int(os.getenv("PAGE_TOKEN_MAX_TENTATIVAS", 6))
+
+# backoff exponencial com jitter (OVER_QUERY_LIMIT / 429 / 5xx / rede)
+PLACES_MAX_RETRIES = int(os.getenv("PLACES_MAX_RETRIES", 5))
+PLACES_BACKOFF_MAX = float(os.getenv("PLACES_BACKOFF_MAX", 30))
 
 HEADERS = {
     "Accept": "application/json"
 }
 
+# status do JSON (HTTP 200) que indicam limite de taxa / falha transitória
+THROTTLE_STATUSES = {"OVER_QUERY_LIMIT"}
+RETRY_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+
+# ======================================================
+# ERROS / POLÍTICA DE RETRY
+# ======================================================
+
+class PlacesApiError(Exception):
+    def __init__(self, status: str, retryable: bool):
+        super().__init__(status)
+        self.status = status
+        self.retryable = retryable
+
+
+def verificar_resposta(
+    rate_limiter: Optional[TokenBucket],
+    http_status: int,
+    data: Optional[Dict]
+) -> Dict:
+    api_status = (data or {}).get("status")
+
+    # throttling: corta o ritmo do limitador e tenta de novo
+    if http_status == 429 or api_status in THROTTLE_STATUSES:
+        if rate_limiter:
+            rate_limiter.record_throttle()
+        raise PlacesApiError(api_status or f"HTTP {http_status}", retryable=True)
+
+    if http_status >= 500:
+        raise PlacesApiError(f"HTTP {http_status}", retryable=True)
+
+    if http_status >= 400:
+        raise PlacesApiError(f"HTTP {http_status}", retryable=False)
+
+    if api_status in RETRY_STATUSES:
+        raise PlacesApiError(api_status, retryable=True)
+
+    # OK / ZERO_RESULTS / INVALID_REQUEST / REQUEST_DENIED seguem para o chamador
+    if rate_limiter:
+        rate_limiter.record_success()
+
+    return data
+
+
+def _registrar_backoff(retry_state):
+    client = retry_state.args[0]
+    espera = retry_state.next_action.sleep
+    erro = retry_state.outcome.exception()
+
+    if client.rate_limiter:
+        client.rate_limiter.record_backoff(espera)
+
+    print(f"[Maps] {erro or 'erro'}: nova tentativa em {espera:.1f}s")
+
+
+def places_retry(*network_errors):
+    # erros de rede do cliente HTTP usado (requests / aiohttp) também são retentados
+    def retentavel(exc: BaseException) -> bool:
+        if isinstance(exc, PlacesApiError):
+            return exc.retryable
+        return isinstance(exc, network_errors)
+
+    return retry(
+        retry=retry_if_exception(retentavel),
+        wait=wait_random_exponential(multiplier=1, max=PLACES_BACKOFF_MAX),
+        stop=stop_after_attempt(PLACES_MAX_RETRIES),
+        before_sleep=_registrar_backoff,
+        reraise=True
+    )
+
+# ======================================================
+# HELPERS COMPARTILHADOS (SYNC / ASYNC)
+# ======================================================
+
+def montar_query(
+    nicho: str,
+    cidade: str,
+    bairro: Optional[str] = None,
+    estado: str = ESTADO
+) -> str:
+    if bairro:
+        return f"{nicho} {bairro}, {cidade} {estado}"
+    return f"{nicho} {cidade} {estado}"
+
+
+def listar_locais() -> List[Tuple[str, Optional[str]]]:
+    # Curitiba por bairros + região metropolitana (sem bairro)
+    locais = [(CIDADE_PRINCIPAL, bairro) for bairro in BAIRROS_CURITIBA]
+    locais.extend((cidade, None) for cidade in CIDADES_ADICIONAIS)
+    return locais
+
+
+def text_search_params(
+    query: str,
+    page_token: Optional[str] = None,
+    location: Optional[Tuple[float, float]] = None,
+    radius: Optional[int] = None
+) -> Dict:
+    params = {
+        "query": query,
+        "language": "pt-BR",
+        "region": "br",
+        "key": API_KEY
+    }
+
+    if page_token:
+        params["pagetoken"] = page_token
+
+    # viés geográfico (modo geo)
+    if location:
+        params["location"] = f"{location[0]:.6f},{location[1]:.6f}"
+        params["radius"] = radius
+
+    return params
+
+
+def place_details_params(place_id: str) -> Dict:
+    return {
+        "place_id": place_id,
+        "fields": ",".join(PLACES_DETAILS_FIELDS),
+        "language": "pt-BR",
+        "key": API_KEY
+    }
+
+
+def parse_resultado(item: Dict, query: str) -> Dict:
+    location = (item.get("geometry") or {}).get("location") or {}
+    return {
+        "place_id": item.get("place_id"),
+        "nome": item.get("name"),
+        "categorias": item.get("types", []),
+        "endereco": item.get("formatted_address"),
+        "rating": item.get("rating"),
+        "user_ratings_total": item.get("user_ratings_total", 0),
+        "lat": location.get("lat"),
+        "lng": location.get("lng"),
+        "query_origem": query
+    }
+
+
+def retomar_consulta(
+    checkpoint: Optional[RunCheckpoint],
+    nicho: str,
+    cidade: str,
+    bairro: Optional[str]
+) -> Tuple[List[Dict], Optional[str], int, Optional[str]]:
+    # (resultados já coletados, próximo page_token, páginas feitas, última página em)
+    if not checkpoint:
+        return [], None, 0, None
+    return checkpoint.retomar(nicho, cidade, bairro)
+
+
+def consulta_finalizada(
+    checkpoint: Optional[RunCheckpoint],
+    nicho: str,
+    cidade: str,
+    bairro: Optional[str],
+    resultados: List[Dict],
+    page_token: Optional[str],
+    page_count: int
+) -> bool:
+    if not checkpoint:
+        return False
+
+    if checkpoint.consulta_concluida(nicho, cidade, bairro):
+        return True
+
+    # última página salva, mas a consulta não chegou a ser marcada
+    if page_count and (not page_token or page_count >= MAX_PAGES):
+        checkpoint.concluir_consulta(nicho, cidade, bairro, len(resultados))
+        return True
+
+    return False
+
+# ======================================================
+# PAGINAÇÃO DE UMA CONSULTA (ESTADO COMPARTILHADO SYNC / ASYNC)
+# ======================================================
+
+class ConsultaPaginada:
+    def __init__(
+        self,
+        checkpoint: Optional[RunCheckpoint],
+        nicho: str,
+        cidade: str,
+        bairro: Optional[str] = None,
+        estado: str = ESTADO
+    ):
+        self.checkpoint = checkpoint
+        self.nicho = nicho
+        self.cidade = cidade
+        self.bairro = bairro
+        self.estado = estado
+        self.query = montar_query(nicho, cidade, bairro, estado)
+        self.descricao = f"{bairro} / {cidade}" if bairro else cidade
+
+        # rótulo das métricas por nicho/local (estável entre execuções)
+        self.local = self.descricao
+
+        # viés geográfico e limite de páginas (sobrescritos no modo geo)
+        self.location: Optional[Tuple[float, float]] = None
+        self.radius: Optional[int] = None
+        self.max_pages = MAX_PAGES
+
+        # terminou no teto de páginas/resultados (provavelmente há mais)
+        self.saturada = False
+
+        self.resultados, self.page_token, self.page_count, salvo_em = retomar_consulta(
+            checkpoint, nicho, cidade, bairro
+        )
+        self.retomado = self.page_count > 0
+        self.tentativas = 0
+
+        # instante (monotonic) a partir do qual o próximo request faz sentido
+        self.pronta_em = 0.0
+
+        # retomada logo após a interrupção: o token salvo pode ainda não ter ativado
+        # (INVALID_REQUEST nele seria tomado por expirado e a consulta recomeçaria)
+        if self.page_token and salvo_em:
+            idade = (datetime.utcnow() - datetime.fromisoformat(salvo_em)).total_seconds()
+            self.pronta_em = time.monotonic() + max(0.0, PAGE_TOKEN_DELAY - idade)
+
+        self.concluida = consulta_finalizada(
+            checkpoint, nicho, cidade, bairro,
+            self.resultados, self.page_token, self.page_count
+        )
+
+    def params(self) -> Dict:
+        # argumentos de text_search para a próxima página
+        return {
+            "query": self.query,
+            "page_token": self.page_token,
+            "location": self.location,
+            "radius": self.radius
+        }
+
+    def _concluir(self):
+        self.concluida = True
+        if self.checkpoint:
+            self.checkpoint.concluir_consulta(
+                self.nicho, self.cidade, self.bairro, len(self.resultados)
+            )
+
+    # --------------------------------------------------
+    # PROCESSA UMA RESPOSTA E AGENDA O PRÓXIMO PASSO
+    # --------------------------------------------------
+    def registrar(self, data: Dict):
+        if self.page_token and data.get("status") == "INVALID_REQUEST":
+            if self.retomado:
+                # token salvo expirou: recomeça a consulta do zero
+                self.checkpoint.descartar_consulta(self.nicho, self.cidade, self.bairro)
+                self.resultados, self.page_token, self.page_count = [], None, 0
+                self.retomado = False
+                self.pronta_em = 0.0
+                return
+
+            # token novo ainda não ativou: tenta de novo com backoff curto
+            self.tentativas += 1
+            if self.tentativas < PAGE_TOKEN_MAX_TENTATIVAS:
+                self.pronta_em = time.monotonic() + PAGE_TOKEN_RETRY_DELAY * 2 ** (self.tentativas - 1)
+                return
+
+            # nunca ativou: encerra com as páginas já obtidas
+            self._concluir()
+            return
+
+        self.retomado = False
+        self.tentativas = 0
+
+        pagina = [parse_resultado(item, self.query) for item in data.get("results", [])]
+        self.resultados.extend(pagina)
+        METRICS.inc("consulta_resultados", len(pagina), nicho=self.nicho, local=self.local)
+
+        next_page_token = data.get("next_page_token")
+
+        if self.checkpoint:
+            self.checkpoint.salvar_pagina(
+                self.nicho, self.cidade, self.bairro, self.page_count,
+                self.page_token, pagina, next_page_token
+            )
+
+        self.page_token = next_page_token
+        self.page_count += 1
+
+        if not self.page_token or self.page_count >= self.max_pages:
+            # a API não emite token depois da 3ª página: página cheia no limite = teto atingido
+            self.saturada = self.page_count >= self.max_pages and (
+                bool(self.page_token) or len(pagina) >= RESULTADOS_POR_PAGINA
+            )
+            self._concluir()
+            return
+
+        # token recém-emitido leva alguns instantes para ativar
+        self.pronta_em = time.monotonic() + PAGE_TOKEN_DELAY
+
+
+def planejar_locais(planner: Optional[QueryPlanner], nicho: str) -> List[Tuple[str, Optional[str]]]:
+    locais = listar_locais()
+    if not planner:
+        return locais
+    return planner.planejar(nicho, locais)
+
+
+def registrar_rendimento(planner: Optional[QueryPlanner], nicho: str, consultas: List["ConsultaPaginada"]):
+    if planner:
+        planner.registrar(nicho, [
+            (c.cidade, c.bairro, [r.get("place_id") for r in c.resultados], c.page_count)
+            for c in consultas
+        ])
+
+
+def gravar_resposta(
+    traffic: Optional[TrafficArchive],
+    endpoint: str,
+    params: Dict,
+    http_status: int,
+    data: Optional[Dict]
+):
+    # throttling / erros transitórios ficam fora: o replay não espera backoff
+    if not traffic or not traffic.recording:
+        return
+    if http_status >= 400 or (data or {}).get("status") in RETRY_STATUSES:
+        return
+    traffic.record_api(endpoint, params, http_status, data)
+
+
+def deduplicar_por_place_id(leads: List[Dict]) -> List[Dict]:
+    unique = {}
+    for lead in leads:
+        pid = lead.get("place_id")
+        if pid and pid not in unique:
+            unique[pid] = lead
+
+    return list(unique.values())
+
 # ======================================================
 # CORE CLIENT
 # ======================================================
 
 class GooglePlacesClient:
-    def __init__(self):
+    def __init__(
+        self,
+        rate_limiter: Optional[TokenBucket] = None,
+        cache: Optional[ResponseCache] = None,
+        checkpoint: Optional[RunCheckpoint] = None,
+        planner: Optional[QueryPlanner] = None,
+        traffic: Optional[TrafficArchive] = None
+    ):
         if not API_KEY:
             raise RuntimeError("GOOGLE_MAPS_API_KEY não encontrada no .env")
 
+        # com limitador compartilhado, o ritmo vem do QPS e não de sleeps fixos
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.checkpoint = checkpoint
+        self.planner = planner
+
+        # gravação (TRAFFIC_RECORD) ou reprodução (DRY_RUN) das respostas
+        self.traffic = traffic
+
         self.session = requests.Session()
         self.session.headers.update(HEADERS)
 
+    def _throttle(self):
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
+    def _replaying(self) -> bool:
+        return bool(self.traffic and self.traffic.replaying)
+
+    def _request(self, url: str, endpoint: str, params: Dict) -> Tuple[int, Optional[Dict]]:
+        # DRY_RUN: resposta do arquivo gravado, sem rede
+        if self._replaying():
+            return self.traffic.replay_api(endpoint, params)
+
+        response = self.session.get(url, params=params, timeout=15)
+        http_status = response.status_code
+        try:
+            data = response.json() if response.ok else None
+        except ValueError:
+            # página de erro de proxy (HTML com 200): transitório, tenta de novo
+            raise PlacesApiError(f"resposta não JSON (HTTP {http_status})", retryable=True)
+
+        gravar_resposta(self.traffic, endpoint, params, http_status, data)
+        return http_status, data
+
     # --------------------------------------------------
     # TEXT SEARCH (bairro + nicho)
     # --------------------------------------------------
-    @retry(wait=wait_fixed(2), stop=stop_after_attempt(3))
+    @places_retry(requests.RequestException)
     def text_search(
         self,
         query: str,
-        page_token: Optional[str] = None
+        page_token: Optional[str] = None,
+        location: Optional[Tuple[float, float]] = None,
+        radius: Optional[int] = None
     ) -> Dict:
-        params = {
-            "query": query,
-            "language": "pt-BR",
-            "region": "br",
-            "key": API_KEY
-        }
+        params = text_search_params(query, page_token, location, radius)
 
-        if page_token:
-            params["pagetoken"] = page_token
-            # token precisa de tempo para ativar
-            time.sleep(2)
+        if self.cache:
+            cached = self.cache.get_pagina("text_search", params)
+            if cached is not None:
+                METRICS.inc("places_cache_hits", endpoint="text_search")
+                gravar_resposta(self.traffic, "text_search", params, 200, cached)
+                return cached
 
-        response = self.session.get(
-            PLACES_TEXT_SEARCH_URL,
-            params=params,
-            timeout=15
-        )
-        response.raise_for_status()
-        return response.json()
+        self._throttle()
+
+        with METRICS.timer("places_api", endpoint="text_search"):
+            data = verificar_resposta(
+                self.rate_limiter,
+                *self._request(PLACES_TEXT_SEARCH_URL, "text_search", params)
+            )
+        if not self._replaying():
+            METRICS.inc("places_api_chamadas", endpoint="text_search")
+
+        if self.cache:
+            self.cache.set("text_search", params, data)
+
+        return data
 
     # --------------------------------------------------
     # PLACE DETAILS (campos mínimos)
     # --------------------------------------------------
-    @retry(wait=wait_fixed(2), stop=stop_after_attempt(3))
-    def place_details(self, place_id: str) -> Dict:
-        params = {
-            "place_id": place_id,
-            "fields": ",".join(PLACES_DETAILS_FIELDS),
-            "language": "pt-BR",
-            "key": API_KEY
-        }
+    @places_retry(requests.RequestException)
+    def place_details(self, place_id: str, usar_cache: bool = True) -> Dict:
+        params = place_details_params(place_id)
 
-        response = self.session.get(
-            PLACES_DETAILS_URL,
-            params=params,
-            timeout=15
-        )
-        response.raise_for_status()
-        return response.json()
+        # revisão de leads conhecidos (usar_cache=False) precisa do dado atual
+        if self.cache and usar_cache:
+            cached = self.cache.get("place_details", params)
+            if cached is not None:
+                METRICS.inc("places_cache_hits", endpoint="place_details")
+                gravar_resposta(self.traffic, "place_details", params, 200, cached)
+                return cached
+
+        self._throttle()
+
+        with METRICS.timer("places_api", endpoint="place_details"):
+            data = verificar_resposta(
+                self.rate_limiter,
+                *self._request(PLACES_DETAILS_URL, "place_details", params)
+            )
+        if not self._replaying():
+            METRICS.inc("places_api_chamadas", endpoint="place_details")
+
+        if self.cache:
+            self.cache.set("place_details", params, data)
+
+        return data
+
+    # --------------------------------------------------
+    # PÁGINA EM CACHE (NÃO PRECISA ESPERAR O TOKEN)
+    # --------------------------------------------------
+    def _pagina_em_cache(self, consulta: ConsultaPaginada) -> bool:
+        # DRY_RUN: a página vem do arquivo gravado, não há token a esperar
+        if self._replaying():
+            return True
+        if not self.cache:
+            return False
+        return self.cache.contains("text_search", text_search_params(**consulta.params()))
+
+    def _proxima_pagina(self, consulta: ConsultaPaginada):
+        espera = consulta.pronta_em - time.monotonic()
+        if espera > 0 and not self._pagina_em_cache(consulta):
+            time.sleep(espera)
+
+        with METRICS.timer("consulta", nicho=consulta.nicho, local=consulta.local):
+            data = self.text_search(**consulta.params())
+        consulta.registrar(data)
+
+        if not self.rate_limiter:
+            time.sleep(REQUEST_DELAY)
 
     # --------------------------------------------------
     # BUSCA COMPLETA POR NICHO + LOCAL
@@ -99,91 +538,110 @@ class GooglePlacesClient:
         cidade: str,
         bairro: Optional[str] = None
     ) -> List[Dict]:
-        resultados = []
-        page_token = None
-        page_count = 0
-
-        if bairro:
-            query = f"{nicho} {bairro}, {cidade} {ESTADO}"
-        else:
-            query = f"{nicho} {cidade} {ESTADO}"
-
-        while page_count < MAX_PAGES:
-            data = self.text_search(query=query, page_token=page_token)
-
-            for item in data.get("results", []):
-                resultados.append({
-                    "place_id": item.get("place_id"),
-                    "nome": item.get("name"),
-                    "categorias": item.get("types", []),
-                    "endereco": item.get("formatted_address"),
-                    "rating": item.get("rating"),
-                    "user_ratings_total": item.get("user_ratings_total", 0),
-                    "query_origem": query
-                })
-
-            page_token = data.get("next_page_token")
-            page_count += 1
-
-            if not page_token:
-                break
+        consulta = ConsultaPaginada(self.checkpoint, nicho, cidade, bairro)
 
-            time.sleep(REQUEST_DELAY)
+        while not consulta.concluida:
+            self._proxima_pagina(consulta)
+
+        return consulta.resultados
+
+    # --------------------------------------------------
+    # AGENDA DE CONSULTAS INTERCALADAS
+    # (a espera do token de uma consulta é usada pelas
+    # páginas das outras; expandir pode gerar novas consultas)
+    # --------------------------------------------------
+    def executar_consultas(
+        self,
+        consultas: List[ConsultaPaginada],
+        nicho: str,
+        expandir: Optional[Callable[[ConsultaPaginada], List[ConsultaPaginada]]] = None
+    ) -> List[ConsultaPaginada]:
+        consultas = list(consultas)
+
+        # fila por instante de prontidão (empate: ordem de criação)
+        agenda = [(0.0, i) for i, consulta in enumerate(consultas) if not consulta.concluida]
+        heapq.heapify(agenda)
+
+        while agenda:
+            _, i = heapq.heappop(agenda)
+            consulta = consultas[i]
 
-        return resultados
+            if consulta.page_count == 0 and consulta.tentativas == 0:
+                print(f"[Maps] Buscando '{nicho}' em {consulta.descricao}")
+
+            self._proxima_pagina(consulta)
+
+            if not consulta.concluida:
+                heapq.heappush(agenda, (consulta.pronta_em, i))
+                continue
+
+            for nova in (expandir(consulta) if expandir else []):
+                consultas.append(nova)
+                heapq.heappush(agenda, (0.0, len(consultas) - 1))
+
+        return consultas
 
     # --------------------------------------------------
     # PIPELINE PRINCIPAL DE COLETA
     # --------------------------------------------------
     def coletar_por_nicho(self, nicho: str) -> List[Dict]:
-        leads = []
+        # locais com rendimento histórico baixo ficam de fora (planner)
+        consultas = self.executar_consultas(
+            [
+                ConsultaPaginada(self.checkpoint, nicho, cidade, bairro)
+                for cidade, bairro in planejar_locais(self.planner, nicho)
+            ],
+            nicho
+        )
 
-        # Curitiba por bairros
-        for bairro in BAIRROS_CURITIBA:
-            print(f"[Maps] Buscando '{nicho}' em {bairro} / {CIDADE_PRINCIPAL}")
-            leads.extend(
-                self.search_by_nicho_and_local(
-                    nicho=nicho,
-                    cidade=CIDADE_PRINCIPAL,
-                    bairro=bairro
-                )
-            )
+        registrar_rendimento(self.planner, nicho, consultas)
 
-        # Região metropolitana (sem bairro)
-        for cidade in CIDADES_ADICIONAIS:
-            print(f"[Maps] Buscando '{nicho}' em {cidade}")
-            leads.extend(
-                self.search_by_nicho_and_local(
-                    nicho=nicho,
-                    cidade=cidade
-                )
-            )
+        leads = []
+        for consulta in consultas:
+            leads.extend(consulta.resultados)
 
         # Deduplicação por place_id
-        unique = {}
-        for lead in leads:
-            pid = lead.get("place_id")
-            if pid and pid not in unique:
-                unique[pid] = lead
+        return deduplicar_por_place_id(leads)
 
-        return list(unique.values())
+    # --------------------------------------------------
+    # UNIDADE DE TRABALHO (EXECUÇÃO DISTRIBUÍDA)
+    # --------------------------------------------------
+    def coletar_unidade(
+        self,
+        nicho: str,
+        cidade: str,
+        bairro: Optional[str] = None,
+        estado: str = ESTADO
+    ) -> ConsultaPaginada:
+        # sem checkpoint: o lease da unidade cobre a retomada (refaz no máximo MAX_PAGES)
+        consulta = ConsultaPaginada(None, nicho, cidade, bairro, estado=estado)
+        self.executar_consultas([consulta], nicho)
+        return consulta
 
     # --------------------------------------------------
     # ENRIQUECIMENTO COM DETAILS
     # --------------------------------------------------
-    def enriquecer_lead(self, lead: Dict) -> Dict:
+    def enriquecer_lead(self, lead: Dict, usar_cache: bool = True) -> Dict:
         place_id = lead.get("place_id")
         if not place_id:
             return lead
 
-        details = self.place_details(place_id).get("result", {})
+        details = self.place_details(place_id, usar_cache=usar_cache).get("result", {})
+
+        # NOT_FOUND (lugar removido/fechado): mantém os dados que o lead já tem
+        if not details:
+            return lead
 
         lead.update({
+            "nome": details.get("name") or lead.get("nome"),
+            "endereco": details.get("formatted_address") or lead.get("endereco"),
             "telefone": details.get("formatted_phone_number"),
             "site": details.get("website"),
             "geometry": details.get("geometry"),
             "address_components": details.get("address_components", [])
         })
 
-        time.sleep(REQUEST_DELAY)
+        if not self.rate_limiter:
+            time.sleep(REQUEST_DELAY)
+
         return lead
\ No newline at end of file
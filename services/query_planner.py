@@ -0,0 +1,214 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import TEXT_SEARCH_COST
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+# novos place_ids por chamada abaixo disso = consulta redundante
+QUERY_MIN_YIELD = float(os.getenv("QUERY_MIN_YIELD", 1.0))
+
+# execuções observadas antes de uma consulta poder ser pulada
+QUERY_MIN_RUNS = int(os.getenv("QUERY_MIN_RUNS", 2))
+
+# a cada N execuções do nicho, varre todos os locais de novo
+QUERY_FULL_SWEEP_EVERY = int(os.getenv("QUERY_FULL_SWEEP_EVERY", 5))
+
+# força varredura completa nesta execução
+QUERY_FORCE_FULL_SWEEP = os.getenv("QUERY_FORCE_FULL_SWEEP", "false").lower() in ("1", "true", "yes")
+
+# peso da execução mais recente na média de rendimento
+_EMA_ALPHA = 0.5
+
+# ======================================================
+# PLANEJADOR DE CONSULTAS (RENDIMENTO POR NICHO / LOCAL)
+# ======================================================
+
+class QueryPlanner:
+    def __init__(
+        self,
+        db_path: str,
+        min_yield: float = QUERY_MIN_YIELD,
+        min_runs: int = QUERY_MIN_RUNS,
+        full_sweep_every: int = QUERY_FULL_SWEEP_EVERY,
+        force_full_sweep: bool = QUERY_FORCE_FULL_SWEEP
+    ):
+        self.db_path = db_path
+        self.min_yield = min_yield
+        self.min_runs = min_runs
+        self.full_sweep_every = full_sweep_every
+        self.force_full_sweep = force_full_sweep
+
+        # varredura completa decidida em planejar(), usada em registrar()
+        self._varredura_completa: Dict[str, bool] = {}
+
+        self.consultas_puladas = 0
+        self.chamadas_evitadas = 0.0
+
+        self._lock = threading.Lock()
+        self._init_db()
+
+    # --------------------------------------------------
+    # INIT DB
+    # --------------------------------------------------
+    def _init_db(self):
+        dirname = os.path.dirname(self.db_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+
+        # rendimento histórico de cada consulta (bairro ausente = "")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS query_stats (
+                nicho TEXT,
+                cidade TEXT,
+                bairro TEXT,
+                execucoes INTEGER,
+                chamadas INTEGER,
+                resultados INTEGER,
+                novos INTEGER,
+                rendimento REAL,
+                updated_at TEXT,
+                PRIMARY KEY (nicho, cidade, bairro)
+            )
+        """)
+
+        # execuções desde a última varredura completa, por nicho
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS query_sweeps (
+                nicho TEXT PRIMARY KEY,
+                execucoes_desde_completa INTEGER,
+                ultima_completa TEXT
+            )
+        """)
+        self.conn.commit()
+
+    # --------------------------------------------------
+    # PLANO: LOCAIS A CONSULTAR NESTA EXECUÇÃO
+    # --------------------------------------------------
+    def planejar(
+        self,
+        nicho: str,
+        locais: List[Tuple[str, Optional[str]]]
+    ) -> List[Tuple[str, Optional[str]]]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT execucoes_desde_completa FROM query_sweeps WHERE nicho = ?",
+                (nicho,)
+            ).fetchone()
+
+            completa = (
+                self.force_full_sweep
+                or row is None
+                or row[0] + 1 >= self.full_sweep_every
+            )
+            self._varredura_completa[nicho] = completa
+
+            if completa:
+                return list(locais)
+
+            stats = {
+                (cidade, bairro): (execucoes, chamadas, rendimento)
+                for cidade, bairro, execucoes, chamadas, rendimento in self.conn.execute(
+                    """
+                    SELECT cidade, bairro, execucoes, chamadas, rendimento
+                    FROM query_stats WHERE nicho = ?
+                    """,
+                    (nicho,)
+                )
+            }
+
+            plano = []
+            for cidade, bairro in locais:
+                execucoes, chamadas, rendimento = stats.get((cidade, bairro or ""), (0, 0, 0.0))
+
+                if execucoes >= self.min_runs and rendimento < self.min_yield:
+                    # redundante: pula e estima as chamadas pela média histórica
+                    self.consultas_puladas += 1
+                    self.chamadas_evitadas += chamadas / execucoes
+                    continue
+
+                plano.append((cidade, bairro))
+
+            return plano
+
+    # --------------------------------------------------
+    # REGISTRO: RENDIMENTO MARGINAL DE CADA CONSULTA
+    # --------------------------------------------------
+    def registrar(
+        self,
+        nicho: str,
+        consultas: Iterable[Tuple[str, Optional[str], List[str], int]]
+    ):
+        # (cidade, bairro, place_ids, páginas), na ordem em que foram consultadas
+        now = datetime.utcnow().isoformat()
+        vistos = set()
+
+        with self._lock:
+            with self.conn:
+                for cidade, bairro, place_ids, chamadas in consultas:
+                    novos = len(set(place_ids) - vistos)
+                    vistos.update(place_ids)
+
+                    # consulta sem nenhuma página concluída: nada a medir
+                    if chamadas <= 0:
+                        continue
+
+                    rendimento = novos / chamadas
+                    self.conn.execute(
+                        """
+                        INSERT INTO query_stats (
+                            nicho, cidade, bairro, execucoes, chamadas,
+                            resultados, novos, rendimento, updated_at
+                        )
+                        VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?)
+                        ON CONFLICT (nicho, cidade, bairro) DO UPDATE SET
+                            execucoes = execucoes + 1,
+                            chamadas = chamadas + excluded.chamadas,
+                            resultados = resultados + excluded.resultados,
+                            novos = novos + excluded.novos,
+                            rendimento = ? * excluded.rendimento + ? * rendimento,
+                            updated_at = excluded.updated_at
+                        """,
+                        (
+                            nicho, cidade, bairro or "", chamadas,
+                            len(place_ids), novos, rendimento, now,
+                            _EMA_ALPHA, 1 - _EMA_ALPHA
+                        )
+                    )
+
+                completa = self._varredura_completa.pop(nicho, True)
+                self.conn.execute(
+                    """
+                    INSERT INTO query_sweeps (nicho, execucoes_desde_completa, ultima_completa)
+                    VALUES (?, 0, ?)
+                    ON CONFLICT (nicho) DO UPDATE SET
+                        execucoes_desde_completa = CASE WHEN ? THEN 0
+                            ELSE execucoes_desde_completa + 1 END,
+                        ultima_completa = CASE WHEN ? THEN excluded.ultima_completa
+                            ELSE ultima_completa END
+                    """,
+                    (nicho, now, completa, completa)
+                )
+
+    # --------------------------------------------------
+    # RESUMO
+    # --------------------------------------------------
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                "consultas_puladas": self.consultas_puladas,
+                "chamadas_evitadas": round(self.chamadas_evitadas, 1),
+                "custo_evitado": round(self.chamadas_evitadas * TEXT_SEARCH_COST, 2)
+            }
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
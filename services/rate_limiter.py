@@ -0,0 +1,148 @@
+import os
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+# ======================================================
+# ENV / CONFIG (AIMD)
+# ======================================================
+
+# aumento aditivo (QPS) por resposta OK e fator de corte por throttling
+PLACES_QPS_STEP = float(os.getenv("PLACES_QPS_STEP", 0.05))
+PLACES_QPS_DECREASE = float(os.getenv("PLACES_QPS_DECREASE", 0.5))
+PLACES_QPS_MIN = float(os.getenv("PLACES_QPS_MIN", 0.5))
+
+# ======================================================
+# TOKEN BUCKET (THREAD-SAFE / ASYNC)
+# ======================================================
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        # rate <= 0 desativa o limite
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.sucessos = 0
+        self.throttles = 0
+        self.backoffs = 0
+        self.backoff_seconds = 0.0
+
+    # --------------------------------------------------
+    # RESERVA UM TOKEN E RETORNA A ESPERA NECESSÁRIA
+    # --------------------------------------------------
+    def _reserve(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            # saldo negativo = fila de reservas já comprometidas
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+
+            return -self._tokens / self.rate
+
+    # --------------------------------------------------
+    # ACQUIRE (BLOQUEANTE / ASYNC)
+    # --------------------------------------------------
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    # --------------------------------------------------
+    # SINAIS DA API (CONTADORES; SEM ADAPTAÇÃO NO BUCKET FIXO)
+    # --------------------------------------------------
+    def record_success(self):
+        with self._lock:
+            self.sucessos += 1
+
+    def record_throttle(self):
+        with self._lock:
+            self.throttles += 1
+
+    def record_backoff(self, seconds: float):
+        with self._lock:
+            self.backoffs += 1
+            self.backoff_seconds += seconds
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "rate": round(self.rate, 2),
+                "sucessos": self.sucessos,
+                "throttles": self.throttles,
+                "backoffs": self.backoffs,
+                "backoff_segundos": round(self.backoff_seconds, 1)
+            }
+
+# ======================================================
+# LIMITADOR ADAPTATIVO (AIMD)
+# ======================================================
+
+class AdaptiveRateLimiter(TokenBucket):
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float = PLACES_QPS_MIN,
+        max_rate: Optional[float] = None,
+        step: float = PLACES_QPS_STEP,
+        decrease: float = PLACES_QPS_DECREASE,
+        cooldown: float = 1.0
+    ):
+        super().__init__(rate)
+
+        # teto: o QPS configurado (a API nunca é sondada acima dele)
+        self.min_rate = min(min_rate, rate) if rate > 0 else min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.step = step
+        self.decrease = decrease
+
+        # vários requests em voo batem no limite juntos: um corte por janela
+        self.cooldown = cooldown
+        self._last_cut = float("-inf")
+
+    def record_success(self):
+        with self._lock:
+            self.sucessos += 1
+
+            # aumento aditivo até o teto
+            if self.rate > 0:
+                self.rate = min(self.max_rate, self.rate + self.step)
+
+    def record_throttle(self):
+        with self._lock:
+            self.throttles += 1
+
+            # sem limite configurado (rate <= 0) só o backoff atua
+            if self.rate <= 0:
+                return
+
+            now = time.monotonic()
+            if now - self._last_cut < self.cooldown:
+                return
+            self._last_cut = now
+
+            # corte multiplicativo
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+
+            # descarta o burst acumulado
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = now
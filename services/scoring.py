@@ -1,3 +1,6 @@
+import re
+import numpy as np
+import pandas as pd
 from typing import Dict
 from config import (
     SCORE_REGRAS,
@@ -5,6 +8,33 @@ from config import (
     BAIRROS_CURITIBA
 )
 
+# uma única alternação para todos os bairros (comparada ao endereço em minúsculas)
+_BAIRROS_RE = (
+    re.compile("|".join(re.escape(bairro.lower()) for bairro in BAIRROS_CURITIBA))
+    if BAIRROS_CURITIBA else None
+)
+
+# ordem dos componentes em score_motivos
+COMPONENTES = [
+    "tem_site",
+    "nicho_alto_ticket",
+    "concorrencia_alta",
+    "email_corporativo",
+    "regiao_valorizada"
+]
+
+# ======================================================
+# HELPERS (MÁSCARAS VETORIZADAS)
+# ======================================================
+
+def _preenchido(df: pd.DataFrame, coluna: str) -> pd.Series:
+    # equivalente vetorizado de bool(lead.get(coluna))
+    if coluna not in df:
+        return pd.Series(False, index=df.index)
+
+    serie = df[coluna].astype(object)
+    return serie.notna() & (serie != "") & (serie != 0)
+
 # ======================================================
 # SCORING ENGINE
 # ======================================================
@@ -20,13 +50,10 @@ class LeadScorer:
         if not endereco:
             return False
 
-        endereco_lower = endereco.lower()
-
-        for bairro in BAIRROS_CURITIBA:
-            if bairro.lower() in endereco_lower:
-                return True
+        if _BAIRROS_RE is None:
+            return False
 
-        return False
+        return _BAIRROS_RE.search(endereco.lower()) is not None
 
     # --------------------------------------------------
     # CALCULA SCORE TOTAL
@@ -46,7 +73,8 @@ class LeadScorer:
             motivos.append("nicho_alto_ticket")
 
         # 3. Concorrência alta
-        concorrencia = lead.get("concorrencia", 0)
+        # leads anteriores à migração: concorrencia NULL
+        concorrencia = lead.get("concorrencia") or 0
         if concorrencia >= 10:
             score += SCORE_REGRAS["concorrencia_alta"]
             motivos.append("concorrencia_alta")
@@ -78,4 +106,64 @@ class LeadScorer:
             "status": status
         })
 
-        return lead
\ No newline at end of file
+        return lead
+
+    # --------------------------------------------------
+    # SCORE EM LOTE (MESMO RESULTADO DE calcular_score)
+    # --------------------------------------------------
+    def score_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        tem_site = _preenchido(df, "site")
+        tem_email = _preenchido(df, "email_corporativo")
+
+        concorrencia = (
+            pd.to_numeric(df["concorrencia"], errors="coerce").fillna(0)
+            if "concorrencia" in df else pd.Series(0, index=df.index)
+        )
+
+        if "endereco" in df and _BAIRROS_RE is not None:
+            regiao = (
+                df["endereco"].fillna("").astype(str).str.lower()
+                .str.contains(_BAIRROS_RE, regex=True)
+            )
+        else:
+            regiao = pd.Series(False, index=df.index)
+
+        mascaras = {
+            "tem_site": tem_site,
+            "nicho_alto_ticket": _preenchido(df, "nicho"),
+            "concorrencia_alta": concorrencia >= 10,
+            "email_corporativo": tem_email,
+            "regiao_valorizada": regiao
+        }
+
+        score = np.zeros(len(df), dtype=np.int64)
+        bits = np.zeros(len(df), dtype=np.int64)
+
+        for i, componente in enumerate(COMPONENTES):
+            mascara = mascaras[componente].to_numpy(dtype=bool)
+            score += mascara * SCORE_REGRAS[componente]
+            bits |= mascara.astype(np.int64) << i
+
+        # motivos: uma string por combinação de componentes (no máximo 2^5)
+        motivos = pd.Series(bits, index=df.index).map({
+            combinacao: ",".join(
+                c for i, c in enumerate(COMPONENTES) if combinacao >> i & 1
+            )
+            for combinacao in np.unique(bits)
+        })
+
+        # normalizar score
+        score = np.minimum(score, 100)
+
+        # classificação final
+        status = np.select(
+            [score >= SCORE_MINIMO_APROVACAO, tem_site & ~tem_email],
+            ["qualificado", "sem_email"],
+            default="descartado"
+        )
+
+        return df.assign(
+            score_valor=score,
+            score_motivos=motivos,
+            status=status
+        )
@@ -0,0 +1,90 @@
+import tldextract
+from typing import Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+# lista de sufixos embarcada no pacote (sem download em runtime)
+_EXTRACT = tldextract.TLDExtract(suffix_list_urls=())
+
+TRACKING_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {
+    "gclid", "gbraid", "wbraid", "fbclid", "msclkid", "yclid",
+    "igshid", "mc_cid", "mc_eid", "_ga", "_gl", "ref", "srsltid"
+}
+
+# plataformas onde o domínio é compartilhado por vários negócios:
+# a identidade do site inclui o host completo e o caminho
+SHARED_DOMAINS = {
+    "facebook.com", "instagram.com", "linktr.ee", "wa.me", "whatsapp.com",
+    "google.com", "business.site", "negocio.site", "wixsite.com",
+    "wordpress.com", "blogspot.com", "webnode.page", "ueniweb.com",
+    "linkedin.com", "youtube.com", "tiktok.com", "ifood.com.br"
+}
+
+# ======================================================
+# HELPERS
+# ======================================================
+
+def _is_tracking(param: str) -> bool:
+    param = param.lower()
+    return param in TRACKING_PARAMS or param.startswith(TRACKING_PREFIXES)
+
+
+def canonical_url(url: Optional[str]) -> Optional[str]:
+    # esquema padrão https, host minúsculo, sem fragmento, sem parâmetros de rastreio
+    if not url or not url.strip():
+        return None
+
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+
+    # porta inválida / IPv6 malformado: website ruim do Places vira lead sem crawl
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+
+    host = (parts.hostname or "").lower()
+    if not host:
+        return None
+
+    netloc = f"{host}:{port}" if port else host
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking(k)
+    ])
+
+    return urlunsplit((parts.scheme.lower(), netloc, parts.path.rstrip("/"), query, ""))
+
+
+def registered_domain(host: str) -> Optional[str]:
+    ext = _EXTRACT(host)
+    if not ext.suffix:
+        # IP, localhost, host interno
+        return None
+    return f"{ext.domain}.{ext.suffix}"
+
+# ======================================================
+# CANONICALIZAÇÃO: (CHAVE DO SITE, URL A CRAWLEAR)
+# ======================================================
+
+def canonicalize_site(url: Optional[str]) -> Optional[Tuple[str, str]]:
+    canonical = canonical_url(url)
+    if canonical is None:
+        return None
+
+    parts = urlsplit(canonical)
+    domain = registered_domain(parts.hostname)
+
+    # sem domínio registrável ou plataforma compartilhada: a URL é o site
+    if domain is None or domain in SHARED_DOMAINS:
+        chave = canonical.split("://", 1)[1]
+        return chave[4:] if chave.startswith("www.") else chave, canonical
+
+    # um crawl por domínio: www/subpaths/filiais caem na home do host
+    return domain, urlunsplit((parts.scheme, parts.netloc, "", "", ""))
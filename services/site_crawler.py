@@ -1,15 +1,15 @@
-import re
 import time
 import requests
-import tldextract
-from bs4 import BeautifulSoup
-from typing import List, Dict
+from urllib.parse import urlparse
+from typing import Dict, Optional, Tuple
 from tenacity import retry, wait_fixed, stop_after_attempt
 
-from config import (
-    EMAIL_DOMINIOS_GENERICOS,
-    EMAIL_FUNCIONAL_KEYWORDS
-)
+from services.html_scan import CRAWL_CHUNK_BYTES, CRAWL_MAX_BYTES, is_html
+from services.page_analysis import AnalysisPool
+from services.crawl_cache import CrawlCache, conditional_headers, content_hash
+from services.site_canonical import canonical_url
+from services.metrics import METRICS
+from services.traffic_archive import TrafficArchive, resposta_gravada
 
 HEADERS = {
     "User-Agent": None  # será preenchido no init
@@ -18,92 +18,144 @@ HEADERS = {
 TIMEOUT = 15
 CRAWL_DELAY = 1.2
 
+# resultado de páginas que não são HTML
+PAGINA_VAZIA = {"emails": {}, "contact_links": []}
+
 # ======================================================
 # SITE CRAWLER
 # ======================================================
 
 class SiteCrawler:
-    def __init__(self, user_agent: str):
+    def __init__(
+        self,
+        user_agent: str,
+        analysis: Optional[AnalysisPool] = None,
+        cache: Optional[CrawlCache] = None,
+        traffic: Optional[TrafficArchive] = None
+    ):
         HEADERS["User-Agent"] = user_agent
         self.session = requests.Session()
         self.session.headers.update(HEADERS)
 
+        # camada de CPU (parsing/regex); sem pool, roda no próprio processo
+        self.analysis = analysis or AnalysisPool(workers=0)
+
+        # resultado por página + validadores HTTP (opcional)
+        self.cache = cache
+
+        # gravação (TRAFFIC_RECORD) ou reprodução (DRY_RUN) das páginas
+        self.traffic = traffic
+
     # --------------------------------------------------
     # REQUEST COM RETRY
     # --------------------------------------------------
     @retry(wait=wait_fixed(2), stop=stop_after_attempt(3))
-    def _get(self, url: str) -> requests.Response:
-        response = self.session.get(
-            url,
-            timeout=TIMEOUT,
-            allow_redirects=True
-        )
+    def _get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        # stream: o corpo é lido em chunks por _read_body
+        # latência até os headers, por host
+        with METRICS.timer("crawl_http", host=urlparse(url).hostname or ""):
+            response = self.session.get(
+                url,
+                headers=headers,
+                timeout=TIMEOUT,
+                allow_redirects=True,
+                stream=True
+            )
         response.raise_for_status()
         return response
 
-    # --------------------------------------------------
-    # NORMALIZA URL
-    # --------------------------------------------------
-    def _normalize_url(self, url: str) -> str:
-        if not url.startswith("http"):
-            return f"https://{url}"
-        return url.rstrip("/")
+    def _replaying(self) -> bool:
+        return bool(self.traffic and self.traffic.replaying)
 
-    # --------------------------------------------------
-    # EXTRAI EMAILS DO HTML
-    # --------------------------------------------------
-    def _extract_emails(self, html: str) -> List[str]:
-        emails = set(
-            re.findall(
-                r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
-                html
-            )
-        )
-        return list(emails)
+    def _request(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        # DRY_RUN: página gravada (ausente = site fora do ar)
+        if self._replaying():
+            return resposta_gravada(url, *self.traffic.replay_page(url))
+
+        response = self._get(url, headers=headers)
+        if not self.traffic:
+            return response
+
+        # gravação: o corpo (já limitado) é lido aqui e devolvido em memória
+        raw = self._read_body(response)
+        body, encoding = raw if raw else (None, response.encoding)
+        self.traffic.record_page(url, response.status_code, response.headers, body, encoding)
+        return resposta_gravada(url, response.status_code, response.headers, body, encoding)
 
     # --------------------------------------------------
-    # CLASSIFICA EMAIL
+    # CAMADA DE I/O: BYTES CRUS (LIMITE DE BYTES, SÓ HTML)
     # --------------------------------------------------
-    def _classify_email(self, email: str) -> Dict:
-        email = email.lower()
-        domain = email.split("@")[-1]
-
-        # genérico
-        if domain in EMAIL_DOMINIOS_GENERICOS:
-            return {
-                "email": email,
-                "tipo": "generico"
-            }
-
-        # funcional
-        for keyword in EMAIL_FUNCIONAL_KEYWORDS:
-            if keyword in email:
-                return {
-                    "email": email,
-                    "tipo": "funcional"
-                }
-
-        return {
-            "email": email,
-            "tipo": "corporativo"
-        }
+    def _read_body(self, response: requests.Response) -> Optional[Tuple[bytes, Optional[str]]]:
+        try:
+            if not is_html(response.headers.get("Content-Type")):
+                return None
+
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=CRAWL_CHUNK_BYTES):
+                body.extend(chunk)
+                if len(body) >= CRAWL_MAX_BYTES:
+                    del body[CRAWL_MAX_BYTES:]
+                    break
+
+            return bytes(body), response.encoding
+        finally:
+            response.close()
 
     # --------------------------------------------------
-    # IDENTIFICA LINKS DE CONTATO
+    # PÁGINA ANALISADA (CACHE -> GET CONDICIONAL -> DOWNLOAD)
     # --------------------------------------------------
-    def _find_contact_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
-        links = set()
+    def _cached_page(self, url: str) -> Optional[Dict]:
+        if self.cache is None:
+            return None
+        return self.cache.get(url)
+
+    def _reuse_page(self, url: str, entry: Optional[Dict], digest: Optional[str]) -> bool:
+        # mesmo conteúdo de antes: renova o TTL e pula a análise
+        if entry is None or entry["content_hash"] != digest:
+            return False
+        self.cache.revalidate(url, "inalterados")
+        return True
+
+    def _store_page(self, url: str, site_url: str, analise: Dict, headers, digest: Optional[str]):
+        if self.cache is not None:
+            self.cache.set(url, site_url, analise, headers, digest)
 
-        for a in soup.find_all("a", href=True):
-            href = a["href"].lower()
+    def _analisar_url(self, url: str, site_url: str) -> Dict:
+        entry = self._cached_page(url)
 
-            if any(k in href for k in ["contato", "contact", "fale", "about"]):
-                if href.startswith("http"):
-                    links.add(href)
-                else:
-                    links.add(f"{base_url}/{href.lstrip('/')}")
+        if entry and entry["fresh"]:
+            self.cache.hit()
+            return entry
 
-        return list(links)
+        try:
+            response = self._request(url, headers=conditional_headers(entry))
+        except Exception:
+            # site fora do ar: usa o último resultado conhecido
+            if entry:
+                return entry
+            raise
+
+        if entry and response.status_code == 304:
+            response.close()
+            self.cache.revalidate(url)
+            return entry
+
+        raw = self._read_body(response)
+        digest = content_hash(raw[0] if raw else None)
+
+        if self._reuse_page(url, entry, digest):
+            return entry
+
+        analise = self.analysis.analisar(*raw, site_url) if raw else PAGINA_VAZIA
+        self._store_page(url, site_url, analise, response.headers, digest)
+        return analise
+
+    # --------------------------------------------------
+    # NORMALIZA URL
+    # --------------------------------------------------
+    def _normalize_url(self, url: str) -> str:
+        # https por padrão, host minúsculo, sem fragmento/parâmetros de rastreio
+        return canonical_url(url) or url
 
     # --------------------------------------------------
     # CRAWL SITE COMPLETO (LEVE)
@@ -120,33 +172,37 @@ class SiteCrawler:
         site_url = self._normalize_url(site_url)
 
         try:
-            response = self._get(site_url)
+            # emails da home + links de contato (camada de CPU ou cache)
+            analise = self._analisar_url(site_url, site_url)
         except Exception:
             return result
 
-        soup = BeautifulSoup(response.text, "lxml")
-
-        # emails da home
-        emails = self._extract_emails(response.text)
-
-        # buscar páginas de contato
-        contact_links = self._find_contact_links(soup, site_url)
+        emails = dict(analise["emails"])
 
-        for link in contact_links:
+        for link in analise["contact_links"]:
             try:
-                time.sleep(CRAWL_DELAY)
-                r = self._get(link)
-                emails.extend(self._extract_emails(r.text))
+                entry = self._cached_page(link)
+                if not (entry and entry["fresh"]) and not self._replaying():
+                    time.sleep(CRAWL_DELAY)
+                emails.update(self._analisar_url(link, site_url)["emails"])
             except Exception:
                 continue
 
-        # classificar emails
-        for email in set(emails):
-            classification = self._classify_email(email)
+        return self._build_result(emails)
+
+    # --------------------------------------------------
+    # MONTA RESULTADO FINAL (EMAILS JÁ CLASSIFICADOS)
+    # --------------------------------------------------
+    def _build_result(self, emails: Dict[str, str]) -> Dict:
+        result = {
+            "emails_corporativos": [],
+            "emails_genericos": []
+        }
 
-            if classification["tipo"] == "generico":
+        for email, tipo in emails.items():
+            if tipo == "generico":
                 result["emails_genericos"].append(email)
             else:
                 result["emails_corporativos"].append(email)
 
-        return result
\ No newline at end of file
+        return result
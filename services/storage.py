@@ -1,25 +1,147 @@
 import sqlite3
 import os
-from typing import Dict, Optional
+import json
+import time
+import hashlib
+import atexit
+import threading
+import pandas as pd
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
-from config import OUTPUT_LEADS_QUALIFICADOS, OUTPUT_LEADS_SEM_EMAIL, OUTPUT_LEADS_DESCARTADOS
+from services.csv_export import CsvExporter
+from services.utils import BloomFilter
+from services.metrics import METRICS
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+STORAGE_BATCH_SIZE = int(os.getenv("STORAGE_BATCH_SIZE", 200))
+STORAGE_FLUSH_INTERVAL = float(os.getenv("STORAGE_FLUSH_INTERVAL", 2.0))
+
+# acima deste volume, o índice em memória vira bloom filter (+ fallback no DB)
+STORAGE_BLOOM_THRESHOLD = int(os.getenv("STORAGE_BLOOM_THRESHOLD", 2_000_000))
+
+PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA busy_timeout=30000"
+]
+
+# colunas adicionadas depois da criação original da tabela leads
+# (tudo que o scorer e a exportação precisam para reprocessar offline)
+LEADS_MIGRACOES = {
+    "telefone": "TEXT",
+    "endereco": "TEXT",
+    "concorrencia": "INTEGER",
+    "address_components": "TEXT",
+    "score_motivos": "TEXT",
+    "estado": "TEXT",
+    "enriched_at": "TEXT",
+    "change_hash": "TEXT"
+}
+
+LEADS_COLUNAS = [
+    "place_id",
+    "nome",
+    "site",
+    "email",
+    "telefone",
+    "endereco",
+    "concorrencia",
+    "address_components",
+    "status",
+    "score",
+    "score_motivos",
+    "nicho",
+    "estado",
+    "cidade",
+    "bairro",
+    "created_at",
+    "enriched_at",
+    "change_hash"
+]
+
+# dados do lead que mudam com o tempo (change_hash / histórico de revisões)
+CAMPOS_RASTREADOS = ("nome", "endereco", "telefone", "site", "email_corporativo")
+
+
+def lead_hash(lead: Dict) -> str:
+    valores = [lead.get(campo) or "" for campo in CAMPOS_RASTREADOS]
+    return hashlib.sha1(json.dumps(valores, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+# ======================================================
+# ÍNDICE EM MEMÓRIA (SET EXATO OU BLOOM FILTER)
+# ======================================================
+
+class KnownSet:
+    def __init__(self, values: Iterable[str], total: int, bloom_threshold: int):
+        # exato: resposta definitiva; bloom: "não" é definitivo, "sim" exige DB
+        # values é consumido uma vez (cursor): o volume vem de total
+        self.exact = total < bloom_threshold
+
+        if self.exact:
+            self._items = set(values)
+        else:
+            self._items = BloomFilter(capacity=total * 2)
+            for value in values:
+                self._items.add(value)
+
+    def add(self, value: str):
+        self._items.add(value)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._items
 
 # ======================================================
 # STORAGE / CACHE (SQLITE)
 # ======================================================
 
 class Storage:
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = STORAGE_BATCH_SIZE,
+        flush_interval: float = STORAGE_FLUSH_INTERVAL,
+        bloom_threshold: int = STORAGE_BLOOM_THRESHOLD,
+        exporter: Optional[CsvExporter] = None
+    ):
         self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.bloom_threshold = bloom_threshold
+
+        # conexão única, compartilhada pelas threads do pipeline via lock
+        self._lock = threading.RLock()
+        self.conn = None
+
+        # escritas pendentes (flush por tamanho, tempo ou shutdown)
+        self._pending_leads = []
+        self._pending_place_ids = set()
+        self._last_flush = time.monotonic()
+
+        self.exporter = exporter or CsvExporter()
+
         self._init_db()
+        self._load_known()
+        atexit.register(self.close)
 
     # --------------------------------------------------
     # INIT DB
     # --------------------------------------------------
     def _init_db(self):
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        dirname = os.path.dirname(self.db_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in PRAGMAS:
+            self.conn.execute(pragma)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self.conn
             cursor = conn.cursor()
 
             # Tabela principal de leads
@@ -39,16 +161,48 @@ class Storage:
                 )
             """)
 
-            # Cache de sites já crawleados
+            # bancos antigos: adiciona as colunas que faltam
+            existentes = {row[1] for row in cursor.execute("PRAGMA table_info(leads)")}
+            for coluna, tipo in LEADS_MIGRACOES.items():
+                if coluna not in existentes:
+                    cursor.execute(f"ALTER TABLE leads ADD COLUMN {coluna} {tipo}")
+
+            # leads anteriores à revisão incremental: enriquecidos na criação
+            cursor.execute("UPDATE leads SET enriched_at = created_at WHERE enriched_at IS NULL")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_leads_enriched_at ON leads (enriched_at)")
+
+            # diferenças campo a campo encontradas nas revisões
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS crawled_sites (
-                    site TEXT PRIMARY KEY,
-                    last_crawled TEXT
+                CREATE TABLE IF NOT EXISTS lead_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    place_id TEXT,
+                    campo TEXT,
+                    valor_anterior TEXT,
+                    valor_novo TEXT,
+                    changed_at TEXT
                 )
             """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_lead_history_place ON lead_history (place_id)")
 
             conn.commit()
 
+    # --------------------------------------------------
+    # CARGA DO ÍNDICE EM MEMÓRIA
+    # --------------------------------------------------
+    def _load_known(self):
+        with self._lock, METRICS.timer("storage", op="load_known"):
+            total = self.conn.execute(
+                "SELECT COUNT(*) FROM leads WHERE place_id IS NOT NULL"
+            ).fetchone()[0]
+
+            # cursor percorrido direto para o índice, sem lista intermediária
+            cursor = self.conn.execute(
+                "SELECT place_id FROM leads WHERE place_id IS NOT NULL"
+            )
+            self._known_leads = KnownSet(
+                (row[0] for row in cursor), total, self.bloom_threshold
+            )
+
     # --------------------------------------------------
     # CHECKS
     # --------------------------------------------------
@@ -56,128 +210,264 @@ class Storage:
         if not place_id:
             return False
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT 1 FROM leads WHERE place_id = ? LIMIT 1",
-                (place_id,)
-            )
-            return cursor.fetchone() is not None
+        with self._lock:
+            if place_id not in self._known_leads:
+                return False
 
-    def site_crawled(self, site: Optional[str]) -> bool:
-        if not site:
-            return False
+            if self._known_leads.exact or place_id in self._pending_place_ids:
+                return True
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT 1 FROM crawled_sites WHERE site = ? LIMIT 1",
-                (site,)
-            )
-            return cursor.fetchone() is not None
+            with METRICS.timer("storage", op="lead_exists"):
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    "SELECT 1 FROM leads WHERE place_id = ? LIMIT 1",
+                    (place_id,)
+                )
+                return cursor.fetchone() is not None
 
     # --------------------------------------------------
-    # SAVE CRAWLED SITE
+    # FILTRO EM LOTE (UMA CONSULTA PARA N PLACE_IDS)
     # --------------------------------------------------
-    def mark_site_crawled(self, site: str):
-        if not site:
-            return
+    def filter_new_place_ids(self, place_ids: Iterable[Optional[str]]) -> List[str]:
+        unique = list(dict.fromkeys(pid for pid in place_ids if pid))
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR IGNORE INTO crawled_sites (site, last_crawled)
-                VALUES (?, ?)
-                """,
-                (site, datetime.utcnow().isoformat())
-            )
-            conn.commit()
+        with self._lock, METRICS.timer("storage", op="filter_new_place_ids"):
+            # negativos do índice são definitivos
+            novos = [pid for pid in unique if pid not in self._known_leads]
+
+            if self._known_leads.exact:
+                return novos
+
+            # positivos do bloom: confirma com uma única consulta via tabela temporária
+            duvidosos = [
+                pid for pid in unique
+                if pid in self._known_leads and pid not in self._pending_place_ids
+            ]
+            if duvidosos:
+                self.conn.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS _filtro_ids (place_id TEXT PRIMARY KEY)"
+                )
+                self.conn.execute("DELETE FROM _filtro_ids")
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO _filtro_ids (place_id) VALUES (?)",
+                    ((pid,) for pid in duvidosos)
+                )
+                ausentes = {
+                    row[0] for row in self.conn.execute(
+                        """
+                        SELECT f.place_id FROM _filtro_ids f
+                        LEFT JOIN leads l ON l.place_id = f.place_id
+                        WHERE l.place_id IS NULL
+                        """
+                    )
+                }
+                self.conn.execute("DELETE FROM _filtro_ids")
+                self.conn.commit()
+
+                novos_set = set(novos) | ausentes
+                novos = [pid for pid in unique if pid in novos_set]
+
+            return novos
 
     # --------------------------------------------------
     # SAVE LEAD
     # --------------------------------------------------
     def save_lead(self, lead: Dict):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        now = datetime.utcnow().isoformat()
+
+        with self._lock:
+            self._pending_leads.append((
+                lead.get("place_id"),
+                lead.get("nome"),
+                lead.get("site"),
+                lead.get("email_corporativo"),
+                lead.get("telefone"),
+                lead.get("endereco"),
+                lead.get("concorrencia"),
+                json.dumps(lead.get("address_components") or [], ensure_ascii=False),
+                lead.get("status"),
+                lead.get("score_valor"),
+                lead.get("score_motivos"),
+                lead.get("nicho"),
+                lead.get("estado"),
+                lead.get("cidade"),
+                lead.get("bairro"),
+                now,
+                now,
+                lead_hash(lead)
+            ))
+            if lead.get("place_id"):
+                self._pending_place_ids.add(lead.get("place_id"))
+                self._known_leads.add(lead.get("place_id"))
+            self._maybe_flush()
+
+    # --------------------------------------------------
+    # REVISÃO INCREMENTAL (LEADS COM ENRIQUECIMENTO VENCIDO)
+    # --------------------------------------------------
+    def leads_para_revisar(self, antes_de: str, limite: int) -> List[Dict]:
+        # maior score primeiro; no empate, o enriquecimento mais antigo
+        self.flush()
 
-            cursor.execute(
+        with self._lock, METRICS.timer("storage", op="leads_para_revisar"):
+            cursor = self.conn.execute(
                 """
-                INSERT OR IGNORE INTO leads (
-                    place_id,
-                    nome,
-                    site,
-                    email,
-                    status,
-                    score,
-                    nicho,
-                    cidade,
-                    bairro,
-                    created_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                SELECT
+                    place_id, nome, site, email AS email_corporativo,
+                    telefone, endereco, COALESCE(concorrencia, 0) AS concorrencia, status,
+                    score AS score_valor, nicho, estado, cidade, bairro,
+                    enriched_at, change_hash
+                FROM leads
+                WHERE place_id IS NOT NULL AND enriched_at < ?
+                ORDER BY score DESC, enriched_at
+                LIMIT ?
+                """,
+                (antes_de, limite)
+            )
+            colunas = [d[0] for d in cursor.description]
+            return [dict(zip(colunas, row)) for row in cursor.fetchall()]
+
+    def registrar_revisao(self, lead: Dict, diferencas: List[Tuple[str, Optional[str], Optional[str]]]):
+        now = datetime.utcnow().isoformat()
+
+        with self._lock, METRICS.timer("storage", op="registrar_revisao"), self.conn:
+            self.conn.execute(
+                """
+                UPDATE leads SET
+                    nome = ?, site = ?, email = ?, telefone = ?, endereco = ?,
+                    address_components = COALESCE(?, address_components),
+                    status = ?, score = ?, score_motivos = ?,
+                    enriched_at = ?, change_hash = ?
+                WHERE place_id = ?
                 """,
                 (
-                    lead.get("place_id"),
                     lead.get("nome"),
-                    lead.get("email_site"),
+                    lead.get("site"),
                     lead.get("email_corporativo"),
+                    lead.get("telefone"),
+                    lead.get("endereco"),
+                    # sem Place Details (NOT_FOUND) mantém os componentes gravados
+                    json.dumps(lead["address_components"], ensure_ascii=False)
+                    if "address_components" in lead else None,
                     lead.get("status"),
                     lead.get("score_valor"),
-                    lead.get("nicho"),
-                    lead.get("cidade"),
-                    lead.get("bairro"),
-                    datetime.utcnow().isoformat()
+                    lead.get("score_motivos"),
+                    now,
+                    lead_hash(lead),
+                    lead.get("place_id")
                 )
             )
-            conn.commit()
+            self.conn.executemany(
+                """
+                INSERT INTO lead_history (place_id, campo, valor_anterior, valor_novo, changed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                ((lead.get("place_id"), campo, antes, depois, now) for campo, antes, depois in diferencas)
+            )
+
+        METRICS.inc("storage_linhas", len(diferencas), tabela="lead_history")
 
     # --------------------------------------------------
-    # EXPORT CSV (APPEND SAFE)
+    # LEITURA EM BLOCOS (REPROCESSAMENTO OFFLINE)
     # --------------------------------------------------
-    def export_csv(self, lead: Dict):
-        status = lead.get("status")
+    def iter_lead_chunks(
+        self,
+        chunk_size: int = 50_000,
+        desde: Optional[str] = None
+    ) -> Iterator[pd.DataFrame]:
+        self.flush()
+        ultimo_id = 0
 
-        if status == "qualificado":
-            path = OUTPUT_LEADS_QUALIFICADOS
-        elif status == "sem_email":
-            path = OUTPUT_LEADS_SEM_EMAIL
-        else:
-            path = OUTPUT_LEADS_DESCARTADOS
-
-        header = [
-            "nome",
-            "site",
-            "email",
-            "telefone",
-            "cidade",
-            "bairro",
-            "nicho",
-            "score_valor",
-            "status"
-        ]
-
-        exists = os.path.isfile(path)
-
-        def sanitize(value):
-            if value is None:
-                return ""
-            return str(value).replace('"', '').replace("\n", " ").strip()
-
-        with open(path, "a", encoding="utf-8") as f:
-            if not exists:
-                f.write(",".join(header) + "\n")
-
-            row = [
-                sanitize(lead.get("nome")),
-                sanitize(lead.get("site")),
-                sanitize(lead.get("email_corporativo")),
-                sanitize(lead.get("telefone")),
-                sanitize(lead.get("cidade")),
-                sanitize(lead.get("bairro")),
-                sanitize(lead.get("nicho")),
-                sanitize(lead.get("score_valor")),
-                sanitize(lead.get("status"))
-            ]
+        # paginação por id: cada bloco é lido inteiro antes de qualquer UPDATE
+        # (desde: só leads gravados a partir deste instante, ISO/UTC)
+        while True:
+            with self._lock:
+                df = pd.read_sql_query(
+                    """
+                    SELECT
+                        id, place_id, nome, site, email AS email_corporativo,
+                        telefone, endereco, concorrencia, address_components,
+                        status, score AS score_valor, score_motivos,
+                        nicho, estado, cidade, bairro
+                    FROM leads
+                    WHERE id > ? AND (? IS NULL OR created_at >= ?)
+                    ORDER BY id
+                    LIMIT ?
+                    """,
+                    self.conn,
+                    params=(ultimo_id, desde, desde, chunk_size)
+                )
+
+            if df.empty:
+                return
 
-            f.write(",".join(f'"{v}"' for v in row) + "\n")
\ No newline at end of file
+            ultimo_id = int(df["id"].iloc[-1])
+            yield df
+
+    # --------------------------------------------------
+    # ATUALIZA SCORE / STATUS EM LOTE (UMA TRANSAÇÃO)
+    # --------------------------------------------------
+    def update_scores(self, df: pd.DataFrame):
+        rows = zip(
+            df["score_valor"].astype(int).tolist(),
+            df["score_motivos"].tolist(),
+            df["status"].tolist(),
+            df["id"].astype(int).tolist()
+        )
+
+        with self._lock, METRICS.timer("storage", op="update_scores"):
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE leads SET score = ?, score_motivos = ?, status = ? WHERE id = ?",
+                    rows
+                )
+
+    # --------------------------------------------------
+    # FLUSH EM LOTE (UMA TRANSAÇÃO)
+    # --------------------------------------------------
+    def _maybe_flush(self):
+        pending = len(self._pending_leads)
+        expired = time.monotonic() - self._last_flush >= self.flush_interval
+
+        if pending >= self.batch_size or expired:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._last_flush = time.monotonic()
+
+            if not self._pending_leads:
+                return
+
+            METRICS.inc("storage_linhas", len(self._pending_leads), tabela="leads")
+
+            with METRICS.timer("storage", op="flush"), self.conn:
+                self.conn.executemany(
+                    f"""
+                    INSERT OR IGNORE INTO leads ({", ".join(LEADS_COLUNAS)})
+                    VALUES ({", ".join("?" * len(LEADS_COLUNAS))})
+                    """,
+                    self._pending_leads
+                )
+
+            self._pending_leads = []
+            self._pending_place_ids = set()
+
+    # --------------------------------------------------
+    # SHUTDOWN (FLUSH GARANTIDO)
+    # --------------------------------------------------
+    def close(self):
+        with self._lock:
+            if self.conn is None:
+                return
+
+            self.flush()
+            self.conn.close()
+            self.conn = None
+
+        self.exporter.close()
+
+    # --------------------------------------------------
+    # EXPORT CSV (HANDLES BUFFERIZADOS POR STATUS)
+    # --------------------------------------------------
+    def export_csv(self, lead: Dict):
+        self.exporter.write(lead)
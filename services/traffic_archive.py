@@ -0,0 +1,182 @@
+import io
+import os
+import gzip
+import json
+import base64
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Mapping, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from services.http_cache import ResponseCache
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+# grava as respostas da Places API e dos sites durante uma execução real
+TRAFFIC_RECORD = os.getenv("TRAFFIC_RECORD", "false").lower() in ("1", "true", "yes")
+
+# DRY_RUN: reproduz o arquivo gravado, sem rede e sem esperas
+DRY_RUN = os.getenv("DRY_RUN", "false").lower() in ("1", "true", "yes")
+
+TRAFFIC_ARCHIVE = os.getenv("TRAFFIC_ARCHIVE", "data/traffic.jsonl.gz")
+
+# CSVs do DRY_RUN (regenerados a cada reprodução, fora de outputs/ real)
+DRY_RUN_OUTPUT_DIR = os.getenv("DRY_RUN_OUTPUT_DIR", "outputs/dry_run")
+
+# únicos cabeçalhos usados pela camada de crawling / cache de crawling
+HEADERS_GRAVADOS = ("Content-Type", "ETag", "Last-Modified")
+
+# requisição que não está no arquivo: a execução divergiu da gravada
+RESPOSTA_AUSENTE = {"status": "ZERO_RESULTS", "results": []}
+
+
+class TrafficMiss(Exception):
+    pass
+
+# ======================================================
+# ARQUIVO DE TRÁFEGO (JSONL + GZIP, UMA RESPOSTA POR LINHA)
+# ======================================================
+
+class TrafficArchive:
+    def __init__(self, path: str = TRAFFIC_ARCHIVE, mode: str = "replay"):
+        self.path = path
+        self.mode = mode
+
+        self.stats = {"gravados": 0, "reproduzidos": 0, "ausentes": 0}
+
+        # replay: respostas por chave na ordem gravada (a última se repete)
+        self._respostas: Dict[str, deque] = defaultdict(deque)
+        self._file = None
+
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            self._load()
+        else:
+            dirname = os.path.dirname(path)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+
+            # arquivo temporário: uma gravação interrompida não apaga a anterior
+            self._file = gzip.open(f"{path}.tmp", "wt", encoding="utf-8")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            raise RuntimeError(f"DRY_RUN sem arquivo de tráfego: {self.path} (grave com TRAFFIC_RECORD=true)")
+
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for linha in f:
+                registro = json.loads(linha)
+                self._respostas[registro.pop("k")].append(registro)
+
+    def _write(self, chave: str, registro: Dict):
+        linha = json.dumps({"k": chave, **registro}, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(linha + "\n")
+            self.stats["gravados"] += 1
+
+    def _next(self, chave: str) -> Dict:
+        with self._lock:
+            fila = self._respostas.get(chave)
+            if not fila:
+                self.stats["ausentes"] += 1
+                raise TrafficMiss(chave)
+
+            self.stats["reproduzidos"] += 1
+            return fila.popleft() if len(fila) > 1 else fila[0]
+
+    # --------------------------------------------------
+    # PLACES API (CHAVE = ENDPOINT + PARÂMETROS, SEM API KEY)
+    # --------------------------------------------------
+    def record_api(self, endpoint: str, params: Dict, http_status: int, data: Optional[Dict]):
+        self._write(ResponseCache.make_key(endpoint, params), {"s": http_status, "d": data})
+
+    def replay_api(self, endpoint: str, params: Dict) -> Tuple[int, Optional[Dict]]:
+        try:
+            registro = self._next(ResponseCache.make_key(endpoint, params))
+        except TrafficMiss:
+            return 200, RESPOSTA_AUSENTE
+        return registro["s"], registro["d"]
+
+    # --------------------------------------------------
+    # SITES (CHAVE = URL; CORPO JÁ LIMITADO A CRAWL_MAX_BYTES)
+    # --------------------------------------------------
+    def record_page(
+        self,
+        url: str,
+        status: int,
+        headers: Mapping,
+        body: Optional[bytes],
+        encoding: Optional[str]
+    ):
+        self._write(f"GET {url}", {
+            "s": status,
+            "h": {nome: headers[nome] for nome in HEADERS_GRAVADOS if headers.get(nome)},
+            "b": base64.b64encode(body).decode("ascii") if body is not None else None,
+            "e": encoding
+        })
+
+    def replay_page(self, url: str) -> Tuple[int, CaseInsensitiveDict, Optional[bytes], Optional[str]]:
+        registro = self._next(f"GET {url}")
+        body = base64.b64decode(registro["b"]) if registro["b"] is not None else None
+        return registro["s"], CaseInsensitiveDict(registro["h"]), body, registro["e"]
+
+    # --------------------------------------------------
+    # RESUMO / ENCERRAMENTO
+    # --------------------------------------------------
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def close(self, ok: bool = True):
+        # ok=False (erro / Ctrl-C): descarta a gravação parcial e mantém a anterior
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+
+            if ok:
+                os.replace(f"{self.path}.tmp", self.path)
+            else:
+                os.remove(f"{self.path}.tmp")
+
+# ======================================================
+# HELPERS
+# ======================================================
+
+def traffic_from_env() -> Optional[TrafficArchive]:
+    if DRY_RUN:
+        return TrafficArchive(TRAFFIC_ARCHIVE, "replay")
+    if TRAFFIC_RECORD:
+        return TrafficArchive(TRAFFIC_ARCHIVE, "record")
+    return None
+
+
+def resposta_gravada(
+    url: str,
+    status: int,
+    headers: Mapping,
+    body: Optional[bytes],
+    encoding: Optional[str]
+) -> requests.Response:
+    # Response do requests sobre bytes em memória (mesma interface para o crawler)
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = encoding
+    response.raw = io.BytesIO(body or b"")
+    return response
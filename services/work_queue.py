@@ -0,0 +1,487 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from config import (
+    ESTADO,
+    CIDADE_PRINCIPAL,
+    CIDADES_ADICIONAIS,
+    BAIRROS_CURITIBA
+)
+
+from services.query_planner import QueryPlanner
+
+# ======================================================
+# ENV / CONFIG
+# ======================================================
+
+# arquivo JSON {estado: {cidade: [bairros]}}; sem ele, Curitiba + RMC do config.py
+REGIOES_PATH = os.getenv("REGIOES_PATH")
+
+# processos worker da execução distribuída (a cota de QPS é dividida entre eles)
+SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", 1))
+
+# unidade sem renovação por este tempo volta para a fila (worker caiu)
+SHARD_LEASE_SECONDS = float(os.getenv("SHARD_LEASE_SECONDS", 120))
+
+# reservas por unidade antes de desistir dela (unidade que derruba workers)
+SHARD_MAX_TENTATIVAS = int(os.getenv("SHARD_MAX_TENTATIVAS", 3))
+
+# unidades abertas ao mesmo tempo por worker (coletadas em paralelo; o resto fica livre)
+SHARD_UNIDADES_EM_VOO = int(os.getenv("SHARD_UNIDADES_EM_VOO", 4))
+
+# (estado, cidade, bairro); bairro ausente = cidade inteira
+Local = Tuple[str, str, Optional[str]]
+
+# ======================================================
+# REGIÕES -> UNIDADES DE TRABALHO
+# ======================================================
+
+def carregar_regioes(path: Optional[str] = REGIOES_PATH) -> Dict[str, Dict[str, List[str]]]:
+    if not path:
+        regioes = {CIDADE_PRINCIPAL: list(BAIRROS_CURITIBA)}
+        regioes.update((cidade, []) for cidade in CIDADES_ADICIONAIS)
+        return {ESTADO: regioes}
+
+    with open(path, encoding="utf-8") as f:
+        regioes = json.load(f)
+
+    for estado, cidades in regioes.items():
+        if not isinstance(cidades, dict):
+            raise ValueError(f"REGIOES_PATH: '{estado}' deve mapear cidade -> lista de bairros")
+
+    return regioes
+
+
+def listar_locais_regioes(regioes: Dict[str, Dict[str, List[str]]]) -> List[Local]:
+    locais = []
+    for estado, cidades in regioes.items():
+        for cidade, bairros in cidades.items():
+            if bairros:
+                locais.extend((estado, cidade, bairro) for bairro in bairros)
+            else:
+                locais.append((estado, cidade, None))
+    return locais
+
+
+def gerar_unidades(
+    regioes: Dict[str, Dict[str, List[str]]],
+    nichos: List[str],
+    planner: Optional[QueryPlanner] = None
+) -> List[Tuple[str, str, str, Optional[str]]]:
+    # (nicho, estado, cidade, bairro); locais de rendimento baixo ficam de fora
+    locais = listar_locais_regioes(regioes)
+    unidades = []
+
+    for nicho in nichos:
+        plano = locais
+        if planner:
+            mantidos = set(planner.planejar(nicho, [(cidade, bairro) for _, cidade, bairro in locais]))
+            plano = [local for local in locais if (local[1], local[2]) in mantidos]
+
+        unidades.extend((nicho, estado, cidade, bairro) for estado, cidade, bairro in plano)
+
+    return unidades
+
+# ======================================================
+# FILA DE UNIDADES COM LEASE (SQLITE COMPARTILHADO ENTRE PROCESSOS)
+# ======================================================
+
+class WorkQueue:
+    def __init__(
+        self,
+        db_path: str,
+        lease: float = SHARD_LEASE_SECONDS,
+        max_tentativas: int = SHARD_MAX_TENTATIVAS
+    ):
+        self.db_path = db_path
+        self.lease = lease
+        self.max_tentativas = max_tentativas
+
+        self._lock = threading.Lock()
+        self._init_db()
+
+    # --------------------------------------------------
+    # INIT DB
+    # --------------------------------------------------
+    def _init_db(self):
+        dirname = os.path.dirname(self.db_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+        # um plano aberto por vez; coordenador que cai retoma o mesmo plano
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS shard_plans (
+                plano TEXT PRIMARY KEY,
+                unidades INTEGER,
+                created_at TEXT,
+                finished_at TEXT
+            )
+        """)
+
+        # status: pendente -> em_execucao (lease) -> concluida | falhou
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS work_units (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                plano TEXT,
+                nicho TEXT,
+                estado TEXT,
+                cidade TEXT,
+                bairro TEXT,
+                status TEXT,
+                worker TEXT,
+                lease_ate REAL,
+                tentativas INTEGER DEFAULT 0,
+                paginas INTEGER,
+                place_ids TEXT,
+                leads INTEGER,
+                updated_at TEXT
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_work_units_status ON work_units (plano, status)"
+        )
+
+        # dono de cada place_id no plano: bairros vizinhos devolvem os mesmos lugares
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS place_claims (
+                place_id TEXT PRIMARY KEY,
+                unit_id INTEGER
+            )
+        """)
+        self.conn.commit()
+
+    # --------------------------------------------------
+    # PLANO
+    # --------------------------------------------------
+    def plano_aberto(self) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute(
+                """
+                SELECT plano, unidades, created_at FROM shard_plans
+                WHERE finished_at IS NULL
+                ORDER BY created_at DESC LIMIT 1
+                """
+            ).fetchone()
+
+        if row is None:
+            return None
+        return {"plano": row[0], "unidades": row[1], "created_at": row[2]}
+
+    def criar_plano(self, unidades: List[Tuple[str, str, str, Optional[str]]]) -> Dict:
+        aberto = self.plano_aberto()
+        if aberto:
+            return aberto
+
+        now = datetime.utcnow().isoformat()
+        plano = datetime.utcnow().strftime("%Y%m%dT%H%M%S.%f")
+
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO shard_plans (plano, unidades, created_at) VALUES (?, ?, ?)",
+                    (plano, len(unidades), now)
+                )
+                self.conn.executemany(
+                    """
+                    INSERT INTO work_units (plano, nicho, estado, cidade, bairro, status, updated_at)
+                    VALUES (?, ?, ?, ?, ?, 'pendente', ?)
+                    """,
+                    ((plano, nicho, estado, cidade, bairro or "", now)
+                     for nicho, estado, cidade, bairro in unidades)
+                )
+                self.conn.execute("DELETE FROM place_claims")
+
+        return {"plano": plano, "unidades": len(unidades), "created_at": now}
+
+    def fechar_plano(self, plano: str):
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE shard_plans SET finished_at = ? WHERE plano = ?",
+                    (datetime.utcnow().isoformat(), plano)
+                )
+                self.conn.execute("DELETE FROM place_claims")
+
+    # --------------------------------------------------
+    # RESERVA / RENOVAÇÃO / DEVOLUÇÃO
+    # --------------------------------------------------
+    def reservar(self, plano: str, worker: str) -> Optional[Dict]:
+        with self._lock:
+            while True:
+                now = time.time()
+
+                # BEGIN IMMEDIATE: só um processo escolhe a próxima unidade por vez
+                self.conn.execute("BEGIN IMMEDIATE")
+                try:
+                    row = self.conn.execute(
+                        """
+                        SELECT id, nicho, estado, cidade, bairro, tentativas FROM work_units
+                        WHERE plano = ? AND (
+                            status = 'pendente'
+                            OR (status = 'em_execucao' AND lease_ate < ?)
+                        )
+                        ORDER BY id LIMIT 1
+                        """,
+                        (plano, now)
+                    ).fetchone()
+
+                    if row is None:
+                        self.conn.commit()
+                        return None
+
+                    unit_id, nicho, estado, cidade, bairro, tentativas = row
+
+                    if tentativas >= self.max_tentativas:
+                        self.conn.execute(
+                            "UPDATE work_units SET status = 'falhou', worker = NULL, updated_at = ? WHERE id = ?",
+                            (datetime.utcnow().isoformat(), unit_id)
+                        )
+                        self.conn.commit()
+                        print(f"[Shards] Unidade {unit_id} ({nicho} / {bairro or cidade}) desistida após {tentativas} tentativas")
+                        continue
+
+                    self.conn.execute(
+                        """
+                        UPDATE work_units
+                        SET status = 'em_execucao', worker = ?, lease_ate = ?,
+                            tentativas = tentativas + 1, updated_at = ?
+                        WHERE id = ?
+                        """,
+                        (worker, now + self.lease, datetime.utcnow().isoformat(), unit_id)
+                    )
+                    self.conn.commit()
+                except BaseException:
+                    self.conn.rollback()
+                    raise
+
+                return {
+                    "id": unit_id,
+                    "nicho": nicho,
+                    "estado": estado,
+                    "cidade": cidade,
+                    "bairro": bairro or None,
+                    "retomada": tentativas > 0
+                }
+
+    def renovar(self, worker: str, unit_ids: List[int]):
+        # só as unidades que este processo tem abertas (id reaproveitado não herda leases)
+        if not unit_ids:
+            return
+
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    f"""
+                    UPDATE work_units SET lease_ate = ?
+                    WHERE worker = ? AND status = 'em_execucao'
+                    AND id IN ({",".join("?" * len(unit_ids))})
+                    """,
+                    (time.time() + self.lease, worker, *unit_ids)
+                )
+
+    def devolver(self, worker: str):
+        # encerramento com erro ou worker morto (coordenador): as unidades voltam na hora
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    """
+                    UPDATE work_units SET status = 'pendente', worker = NULL, lease_ate = NULL
+                    WHERE worker = ? AND status = 'em_execucao'
+                    """,
+                    (worker,)
+                )
+
+    # --------------------------------------------------
+    # RESULTADO DA UNIDADE
+    # --------------------------------------------------
+    def registrar_coleta(self, unit_id: int, place_ids: List[str], paginas: int, leads: int):
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE work_units SET place_ids = ?, paginas = ?, leads = ? WHERE id = ?",
+                    (json.dumps(place_ids), paginas, leads, unit_id)
+                )
+
+    def concluir(self, unit_id: int):
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    """
+                    UPDATE work_units SET status = 'concluida', worker = NULL, lease_ate = NULL, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (datetime.utcnow().isoformat(), unit_id)
+                )
+
+    def reivindicar(self, place_id: str, unit_id: int) -> bool:
+        # primeiro a reivindicar processa; unidade retomada mantém as suas
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO place_claims (place_id, unit_id) VALUES (?, ?)",
+                    (place_id, unit_id)
+                )
+                row = self.conn.execute(
+                    "SELECT unit_id FROM place_claims WHERE place_id = ?",
+                    (place_id,)
+                ).fetchone()
+        return row[0] == unit_id
+
+    # --------------------------------------------------
+    # PROGRESSO / RENDIMENTO
+    # --------------------------------------------------
+    def progresso(self, plano: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT status, COUNT(*) FROM work_units WHERE plano = ? GROUP BY status",
+                (plano,)
+            ).fetchall()
+
+            retomadas = self.conn.execute(
+                "SELECT COUNT(*) FROM work_units WHERE plano = ? AND tentativas > 1",
+                (plano,)
+            ).fetchone()[0]
+
+        progresso = {"pendente": 0, "em_execucao": 0, "concluida": 0, "falhou": 0}
+        progresso.update(dict(rows))
+        progresso["retomadas"] = retomadas
+        return progresso
+
+    def rendimento(self, plano: str) -> Dict[str, List[Tuple[str, Optional[str], List[str], int]]]:
+        # por nicho, na ordem do plano: entrada de QueryPlanner.registrar
+        with self._lock:
+            rows = self.conn.execute(
+                """
+                SELECT nicho, cidade, bairro, place_ids, paginas FROM work_units
+                WHERE plano = ? AND status = 'concluida'
+                ORDER BY id
+                """,
+                (plano,)
+            ).fetchall()
+
+        por_nicho: Dict[str, List] = {}
+        for nicho, cidade, bairro, place_ids, paginas in rows:
+            por_nicho.setdefault(nicho, []).append(
+                (cidade, bairro or None, json.loads(place_ids or "[]"), paginas or 0)
+            )
+        return por_nicho
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+# ======================================================
+# SESSÃO DE UM WORKER (FONTE DO PIPELINE + CONTAGEM POR UNIDADE)
+# ======================================================
+
+class WorkerSession:
+    def __init__(
+        self,
+        queue: WorkQueue,
+        plano: str,
+        worker: Optional[str] = None,
+        workers: int = SHARD_WORKERS,
+        em_voo: int = SHARD_UNIDADES_EM_VOO
+    ):
+        self.queue = queue
+        self.plano = plano
+        self.worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+        self.workers = max(1, workers)
+        self.em_voo = max(1, em_voo)
+
+        # leads ainda no pipeline por unidade aberta (coleta concluída)
+        self._pendentes: Dict[int, int] = {}
+
+        # unidades reservadas por esta sessão e ainda não concluídas (heartbeat)
+        self._abertas: set = set()
+        self.stats = {"unidades": 0, "retomadas": 0, "candidatos": 0}
+
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+
+        # heartbeat: renova o lease das unidades abertas enquanto o processo vive
+        self._heartbeat = threading.Thread(target=self._renovar, name="shard-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def _renovar(self):
+        while not self._stop.wait(self.queue.lease / 3):
+            with self._cond:
+                abertas = list(self._abertas)
+            self.queue.renovar(self.worker, abertas)
+
+    # --------------------------------------------------
+    # FONTE: RESERVA UNIDADES SOB DEMANDA
+    # --------------------------------------------------
+    def unidades(self, parado: Callable[[], bool]) -> Iterator[Dict]:
+        while not parado():
+            # não segura unidades além do que o pipeline consegue processar
+            with self._cond:
+                if len(self._abertas) >= self.em_voo:
+                    self._cond.wait(0.5)
+                    continue
+
+            unidade = self.queue.reservar(self.plano, self.worker)
+
+            if unidade is None:
+                # fila vazia: termina quando ninguém mais tiver unidades em execução
+                # (lease de worker que caiu vence e a unidade volta para a fila)
+                progresso = self.queue.progresso(self.plano)
+                with self._cond:
+                    abertas = len(self._abertas)
+                if progresso["pendente"] + progresso["em_execucao"] - abertas <= 0:
+                    return
+                time.sleep(min(1.0, self.queue.lease / 4))
+                continue
+
+            with self._cond:
+                self._abertas.add(unidade["id"])
+
+            self.stats["unidades"] += 1
+            self.stats["retomadas"] += int(unidade["retomada"])
+            yield unidade
+
+    # --------------------------------------------------
+    # CONTAGEM: UNIDADE CONCLUI QUANDO O ÚLTIMO LEAD SAI DO PIPELINE
+    # --------------------------------------------------
+    def abrir(self, unidade: Dict, place_ids: List[str], paginas: int, leads: int) -> bool:
+        self.queue.registrar_coleta(unidade["id"], place_ids, paginas, leads)
+        self.stats["candidatos"] += leads
+
+        with self._cond:
+            self._pendentes[unidade["id"]] = leads
+        return leads == 0
+
+    def item_concluido(self, unit_id: int) -> bool:
+        with self._cond:
+            self._pendentes[unit_id] -= 1
+            return self._pendentes[unit_id] == 0
+
+    def concluir(self, unit_id: int):
+        self.queue.concluir(unit_id)
+
+        with self._cond:
+            self._pendentes.pop(unit_id, None)
+            self._abertas.discard(unit_id)
+            self._cond.notify_all()
+
+    def reivindicar(self, place_id: str, unit_id: int) -> bool:
+        return self.queue.reivindicar(place_id, unit_id)
+
+    def summary(self) -> Dict:
+        return {"worker": self.worker, **self.stats}
+
+    def close(self, erro: bool = False):
+        self._stop.set()
+        self._heartbeat.join()
+        if erro:
+            self.queue.devolver(self.worker)
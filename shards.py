@@ -0,0 +1,227 @@
+import os
+import sys
+import time
+import subprocess
+from dotenv import load_dotenv
+
+from config import NICHOS_ALTO_TICKET
+from services.work_queue import (
+    WorkQueue,
+    WorkerSession,
+    SHARD_WORKERS,
+    carregar_regioes,
+    gerar_unidades
+)
+from services.query_planner import QueryPlanner
+from services.storage import Storage
+from services.csv_export import CsvExporter
+from services.metrics import METRICS_REPORT_PATH
+
+# ======================================================
+# BOOTSTRAP
+# ======================================================
+
+load_dotenv()
+
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH")
+SEARCH_MODE = os.getenv("SEARCH_MODE", "bairros").lower()
+
+# log (stdout) de cada worker
+SHARD_LOG_DIR = os.getenv("SHARD_LOG_DIR", "outputs/shards")
+
+# intervalo entre as linhas de progresso do coordenador (segundos)
+SHARD_REPORT_INTERVAL = float(os.getenv("SHARD_REPORT_INTERVAL", 10))
+
+# reinícios por worker que caiu, enquanto ainda houver unidades
+SHARD_MAX_REINICIOS = int(os.getenv("SHARD_MAX_REINICIOS", 3))
+
+if not SQLITE_DB_PATH:
+    raise RuntimeError("SQLITE_DB_PATH não definido no .env")
+
+# ======================================================
+# WORKER (UM PROCESSO; PODE SER INICIADO À MÃO PARA SOMAR CAPACIDADE)
+# ======================================================
+
+def worker(worker_id=None):
+    from main import main
+
+    fila = WorkQueue(SQLITE_DB_PATH)
+    aberto = fila.plano_aberto()
+    if not aberto:
+        raise SystemExit("Nenhum plano aberto: rode python shards.py run [workers]")
+
+    # id único por processo: um worker reiniciado não renova os leases do anterior
+    if worker_id:
+        worker_id = f"{worker_id}-{os.getpid()}"
+
+    try:
+        main(fila=WorkerSession(fila, aberto["plano"], worker_id))
+    finally:
+        fila.close()
+
+# ======================================================
+# COORDENADOR: PLANO -> N WORKERS -> CONSOLIDAÇÃO
+# ======================================================
+
+def _iniciar_worker(n: int, workers: int) -> subprocess.Popen:
+    base, ext = os.path.splitext(METRICS_REPORT_PATH)
+    env = dict(os.environ)
+    env.update({
+        "SHARD_WORKERS": str(workers),
+        "METRICS_REPORT_PATH": f"{base}_w{n}{ext}"
+    })
+
+    # o pool de análise de cada worker divide os núcleos com os demais
+    env.setdefault("ANALYSIS_WORKERS", str(max(1, (os.cpu_count() or 1) // workers)))
+
+    os.makedirs(SHARD_LOG_DIR, exist_ok=True)
+    log = open(os.path.join(SHARD_LOG_DIR, f"worker_{n}.log"), "a", encoding="utf-8")
+
+    return subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "worker", f"w{n}"],
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT
+    )
+
+
+def _imprimir_progresso(progresso, total):
+    print(
+        f"[Shards] {progresso['concluida']}/{total} unidades concluídas, "
+        f"{progresso['em_execucao']} em execução, {progresso['pendente']} pendentes, "
+        f"{progresso['falhou']} desistidas, {progresso['retomadas']} retomadas"
+    )
+
+
+def consolidar(fila: WorkQueue, planner: QueryPlanner, plano):
+    # rendimento de cada local, por nicho e na ordem do plano (planner)
+    for nicho, consultas in fila.rendimento(plano["plano"]).items():
+        planner.registrar(nicho, consultas)
+
+    # leads gravados pelos workers neste plano -> CSVs (um único escritor)
+    storage = Storage(db_path=SQLITE_DB_PATH)
+    exporter = CsvExporter()
+    totais = {"processados": 0, "qualificado": 0, "sem_email": 0, "descartado": 0}
+
+    try:
+        for chunk in storage.iter_lead_chunks(desde=plano["created_at"]):
+            for lead in chunk.astype(object).where(chunk.notna(), None).to_dict("records"):
+                exporter.write(lead)
+
+            totais["processados"] += len(chunk)
+            for status, total in chunk["status"].value_counts().items():
+                totais[status if status in totais else "descartado"] += int(total)
+    finally:
+        exporter.close()
+        storage.close()
+
+    fila.fechar_plano(plano["plano"])
+    return totais
+
+
+def run(workers: int = SHARD_WORKERS):
+    print(f"▶ Execução distribuída: {workers} workers")
+
+    # geo: a quadtree depende do resultado de cada tile; não vira unidade independente
+    if SEARCH_MODE == "geo":
+        raise RuntimeError("SEARCH_MODE=geo não é suportado na execução distribuída")
+
+    fila = WorkQueue(SQLITE_DB_PATH)
+    planner = QueryPlanner(db_path=SQLITE_DB_PATH)
+
+    plano = fila.plano_aberto()
+    if plano:
+        print(f"Retomando o plano {plano['plano']} ({plano['unidades']} unidades)")
+    else:
+        unidades = gerar_unidades(carregar_regioes(), NICHOS_ALTO_TICKET, planner)
+        plano = fila.criar_plano(unidades)
+        print(f"Plano {plano['plano']}: {plano['unidades']} unidades (nicho x local)")
+
+    processos = {n: _iniciar_worker(n, workers) for n in range(workers)}
+    reinicios = {n: 0 for n in range(workers)}
+    ultimo_relatorio = 0.0
+
+    try:
+        while processos:
+            time.sleep(0.5)
+            progresso = fila.progresso(plano["plano"])
+            restantes = progresso["pendente"] + progresso["em_execucao"]
+
+            for n, proc in list(processos.items()):
+                code = proc.poll()
+                if code is None:
+                    continue
+
+                del processos[n]
+                if code == 0:
+                    continue
+
+                # unidades abertas do processo morto voltam à fila antes do reinício
+                print(f"[Shards] Worker w{n} saiu com código {code} (log em {SHARD_LOG_DIR}/worker_{n}.log)")
+                fila.devolver(f"w{n}-{proc.pid}")
+                if restantes and reinicios[n] < SHARD_MAX_REINICIOS:
+                    reinicios[n] += 1
+                    processos[n] = _iniciar_worker(n, workers)
+
+            if time.monotonic() - ultimo_relatorio >= SHARD_REPORT_INTERVAL:
+                ultimo_relatorio = time.monotonic()
+                _imprimir_progresso(progresso, plano["unidades"])
+    except KeyboardInterrupt:
+        for proc in processos.values():
+            proc.terminate()
+        raise
+
+    progresso = fila.progresso(plano["plano"])
+    _imprimir_progresso(progresso, plano["unidades"])
+
+    if progresso["pendente"] + progresso["em_execucao"]:
+        # workers esgotaram os reinícios: o próximo run retoma o mesmo plano
+        print("Plano incompleto: rode de novo para retomar as unidades restantes")
+        planner.close()
+        fila.close()
+        raise SystemExit(1)
+
+    totais = consolidar(fila, planner, plano)
+
+    print("\n====== RESUMO DA EXECUÇÃO DISTRIBUÍDA ======")
+    print(f"Leads processados: {totais['processados']}")
+    print(f"Qualificados: {totais['qualificado']}")
+    print(f"Sem email corporativo: {totais['sem_email']}")
+    print(f"Descartados: {totais['descartado']}")
+    print(f"Unidades desistidas: {progresso['falhou']}, retomadas: {progresso['retomadas']}")
+    print(f"Métricas por worker em {os.path.splitext(METRICS_REPORT_PATH)[0]}_w*.json")
+    print("Arquivos CSV gerados em /outputs")
+
+    planner.close()
+    fila.close()
+
+
+def status():
+    fila = WorkQueue(SQLITE_DB_PATH)
+    plano = fila.plano_aberto()
+
+    if not plano:
+        print("Nenhum plano aberto")
+    else:
+        print(f"Plano {plano['plano']} (criado em {plano['created_at']})")
+        _imprimir_progresso(fila.progresso(plano["plano"]), plano["unidades"])
+
+    fila.close()
+
+# ======================================================
+# ENTRYPOINT
+# ======================================================
+# python shards.py run [workers] | worker [id] | status
+
+if __name__ == "__main__":
+    comando = sys.argv[1] if len(sys.argv) > 1 else "run"
+    argumento = sys.argv[2] if len(sys.argv) > 2 else None
+
+    if comando == "run":
+        run(int(argumento) if argumento else SHARD_WORKERS)
+    elif comando == "worker":
+        worker(argumento)
+    elif comando == "status":
+        status()
+    else:
+        raise SystemExit(f"comando desconhecido: {comando} (run | worker | status)")
@@ -0,0 +1,120 @@
+import os
+import sys
+import sqlite3
+
+import pytest
+
+# testes importam main/services a partir da raiz do repositório
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "benchmarks"))
+
+from fake_servers import FakePlaces
+
+import services.places_client as places_client
+import services.async_places_client as async_places_client
+from services.places_client import GooglePlacesClient
+from services.rate_limiter import AdaptiveRateLimiter
+
+
+def apontar_places(monkeypatch, places: FakePlaces):
+    # clients sync e async contra o servidor local, sem esperas fixas
+    monkeypatch.setattr(places_client, "API_KEY", "teste")
+    monkeypatch.setattr(places_client, "PLACES_TEXT_SEARCH_URL", places.text_search_url)
+    monkeypatch.setattr(places_client, "PLACES_DETAILS_URL", places.details_url)
+    monkeypatch.setattr(places_client, "PAGE_TOKEN_DELAY", places.token_delay)
+    monkeypatch.setattr(places_client, "PAGE_TOKEN_RETRY_DELAY", 0.05)
+    monkeypatch.setattr(places_client, "REQUEST_DELAY", 0)
+    monkeypatch.setattr(async_places_client, "API_KEY", "teste")
+    monkeypatch.setattr(async_places_client, "PLACES_TEXT_SEARCH_URL", places.text_search_url)
+
+
+class Interrompido(BaseException):
+    pass
+
+
+class ClienteRegistrado(GooglePlacesClient):
+    # registra cada request à API: pedidas (query, pagetoken) e respostas (params, data);
+    # interrompe antes do request de número `parar_em`
+    def __init__(self, pedidas=None, parar_em=None, **kwargs):
+        super().__init__(rate_limiter=AdaptiveRateLimiter(0), **kwargs)
+        self.pedidas = [] if pedidas is None else pedidas
+        self.respostas = []
+        self.parar_em = parar_em
+
+    def _request(self, url, endpoint, params):
+        if self.parar_em is not None and len(self.pedidas) >= self.parar_em:
+            raise Interrompido()
+        self.pedidas.append((params["query"], params.get("pagetoken")))
+
+        http_status, data = super()._request(url, endpoint, params)
+        self.respostas.append((dict(params), data))
+        return http_status, data
+
+
+def place_ids(leads):
+    return sorted(lead["place_id"] for lead in leads)
+
+
+def criar_banco_original(db_path, leads):
+    # schema anterior às migrações (sem concorrencia, endereco, enriched_at...)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE leads (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                place_id TEXT UNIQUE,
+                nome TEXT,
+                site TEXT,
+                email TEXT,
+                status TEXT,
+                score INTEGER,
+                nicho TEXT,
+                cidade TEXT,
+                bairro TEXT,
+                created_at TEXT
+            )
+        """)
+        conn.executemany(
+            """
+            INSERT INTO leads (place_id, nome, site, email, status, score, nicho, cidade, bairro, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            leads
+        )
+
+
+@pytest.fixture
+def tres_paginas(monkeypatch):
+    monkeypatch.setattr(places_client, "MAX_PAGES", 3)
+
+
+@pytest.fixture
+def iniciar_servidor():
+    # sobe servidores locais de fake_servers (devolve a URL base); todos caem no teardown
+    servidores = []
+
+    def iniciar(servidor):
+        base = servidor.start()
+        servidores.append(servidor)
+        return base
+
+    yield iniciar
+    for servidor in servidores:
+        servidor.stop()
+
+
+@pytest.fixture
+def iniciar_places(iniciar_servidor, monkeypatch):
+    # Places falso (FakePlaces ou subclasse) com os clients apontados para ele
+    def iniciar(classe=FakePlaces, *args, **kwargs):
+        places = classe(*args, **kwargs)
+        iniciar_servidor(places)
+        apontar_places(monkeypatch, places)
+        return places
+
+    return iniciar
+
+
+@pytest.fixture
+def fake_places(iniciar_places):
+    return iniciar_places(token_delay=0.05)
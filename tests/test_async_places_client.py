@@ -0,0 +1,18 @@
+from services.places_client import GooglePlacesClient
+from services.rate_limiter import AdaptiveRateLimiter
+from services.async_places_client import coletar_por_nicho_async
+
+
+def test_async_devolve_os_mesmos_place_ids_do_sync(fake_places):
+    sync = GooglePlacesClient(rate_limiter=AdaptiveRateLimiter(0)).coletar_por_nicho("dentista")
+    chamadas_sync = fake_places.calls["text_search"]
+
+    assincrono = coletar_por_nicho_async("dentista", rate_limiter=AdaptiveRateLimiter(0))
+
+    ids_sync = [lead["place_id"] for lead in sync]
+    ids_async = [lead["place_id"] for lead in assincrono]
+
+    assert ids_sync and len(set(ids_sync)) == len(ids_sync)
+    assert set(ids_async) == set(ids_sync)
+    assert len(ids_async) == len(ids_sync)
+    assert fake_places.calls["text_search"] == 2 * chamadas_sync
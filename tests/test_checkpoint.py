@@ -0,0 +1,48 @@
+import pytest
+
+from services.checkpoint import RunCheckpoint
+
+from conftest import ClienteRegistrado, Interrompido, place_ids
+
+
+def test_execucao_interrompida_retoma_sem_repetir_nem_perder_paginas(fake_places, tres_paginas, tmp_path):
+    referencia = []
+    esperado = place_ids(ClienteRegistrado(referencia).coletar_por_nicho("dentista"))
+    assert any(token for _, token in referencia)
+
+    checkpoint = RunCheckpoint(str(tmp_path / "estado.db"))
+    pedidas = []
+
+    # interrompe no meio da paginação (páginas 2/3 de várias consultas abertas)
+    with pytest.raises(Interrompido):
+        ClienteRegistrado(pedidas, parar_em=len(referencia) // 2, checkpoint=checkpoint).coletar_por_nicho("dentista")
+    checkpoint.close()
+
+    antes = len(pedidas)
+    checkpoint = RunCheckpoint(str(tmp_path / "estado.db"))
+    retomado = ClienteRegistrado(pedidas, checkpoint=checkpoint).coletar_por_nicho("dentista")
+    checkpoint.close()
+
+    assert 0 < antes < len(pedidas)
+    assert len(pedidas) == len(set(pedidas)) == len(referencia)
+    assert set(pedidas) == set(referencia)
+    assert place_ids(retomado) == esperado
+
+
+def test_token_expirado_recomeca_a_consulta(fake_places, iniciar_places, tres_paginas, tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path / "estado.db"))
+
+    referencia = []
+    esperado = place_ids(ClienteRegistrado(referencia).coletar_por_nicho("dentista"))
+    with pytest.raises(Interrompido):
+        ClienteRegistrado([], parar_em=len(referencia) // 2, checkpoint=checkpoint).coletar_por_nicho("dentista")
+
+    # servidor novo não conhece os tokens salvos: consultas parciais recomeçam
+    places = iniciar_places(token_delay=0.05)
+    try:
+        retomado = ClienteRegistrado([], checkpoint=checkpoint).coletar_por_nicho("dentista")
+    finally:
+        checkpoint.close()
+
+    assert places.calls["token_invalido"] > 0
+    assert place_ids(retomado) == esperado
@@ -0,0 +1,87 @@
+import pytest
+from tenacity import wait_fixed
+
+import services.site_crawler as site_crawler
+from services.async_site_crawler import AsyncCrawlerBridge, AsyncSiteCrawler
+from services.crawl_cache import CrawlCache
+from services.site_crawler import SiteCrawler
+
+from fake_servers import SiteFarm
+
+SITES = ["s1", "s2", "s3"]
+
+# cada site: home + página de contato
+PAGINAS = 2 * len(SITES)
+
+
+@pytest.fixture(params=["sync", "async"])
+def crawler_factory(request, monkeypatch):
+    monkeypatch.setattr(site_crawler, "CRAWL_DELAY", 0)
+    monkeypatch.setattr(SiteCrawler._get.retry, "wait", wait_fixed(0))
+    monkeypatch.setattr(AsyncSiteCrawler._fetch_async.retry, "wait", wait_fixed(0))
+    bridges = []
+
+    def criar(cache):
+        if request.param == "sync":
+            return SiteCrawler(user_agent="teste", cache=cache)
+        bridge = AsyncCrawlerBridge(user_agent="teste", cache=cache, host_delay=0)
+        bridges.append(bridge)
+        return bridge
+
+    yield criar
+    for bridge in bridges:
+        bridge.close()
+
+
+def _crawl(crawler, base):
+    return {site: crawler.crawl_site(f"{base}/{site}") for site in SITES}
+
+
+def _duas_execucoes(servidor, base, crawler_factory, tmp_path, ttl, antes_da_segunda=None):
+    primeira = _crawl(crawler_factory(CrawlCache(str(tmp_path / "crawl.db"), ttl=ttl)), base)
+    hits = servidor.hits
+
+    if antes_da_segunda:
+        antes_da_segunda()
+
+    cache = CrawlCache(str(tmp_path / "crawl.db"), ttl=ttl)
+    segunda = _crawl(crawler_factory(cache), base)
+
+    assert any(r["emails_corporativos"] for r in primeira.values())
+    assert segunda == primeira
+    return cache.summary(), servidor.hits - hits
+
+
+def test_pagina_fresca_nao_gera_request(iniciar_servidor, crawler_factory, tmp_path):
+    servidor = SiteFarm(blocos=5)
+    stats, requests = _duas_execucoes(servidor, iniciar_servidor(servidor), crawler_factory, tmp_path, ttl=3600)
+
+    assert requests == 0
+    assert stats == {"frescos": PAGINAS, "revalidados": 0, "inalterados": 0, "baixados": 0}
+
+
+def test_pagina_vencida_revalida_com_304(iniciar_servidor, crawler_factory, tmp_path):
+    servidor = SiteFarm(blocos=5)
+    stats, requests = _duas_execucoes(servidor, iniciar_servidor(servidor), crawler_factory, tmp_path, ttl=-1)
+
+    assert requests == PAGINAS
+    assert stats == {"frescos": 0, "revalidados": PAGINAS, "inalterados": 0, "baixados": 0}
+
+
+def test_pagina_vencida_sem_etag_e_mesmo_hash_nao_e_reanalisada(iniciar_servidor, crawler_factory, tmp_path):
+    servidor = SiteFarm(blocos=5, etag=False)
+    stats, requests = _duas_execucoes(servidor, iniciar_servidor(servidor), crawler_factory, tmp_path, ttl=-1)
+
+    assert requests == PAGINAS
+    assert stats == {"frescos": 0, "revalidados": 0, "inalterados": PAGINAS, "baixados": 0}
+
+
+def test_site_fora_do_ar_usa_o_ultimo_resultado(iniciar_servidor, crawler_factory, tmp_path):
+    servidor = SiteFarm(blocos=5)
+    stats, requests = _duas_execucoes(
+        servidor, iniciar_servidor(servidor), crawler_factory, tmp_path, ttl=-1,
+        antes_da_segunda=servidor.stop
+    )
+
+    assert requests == 0
+    assert stats == {"frescos": 0, "revalidados": 0, "inalterados": 0, "baixados": 0}
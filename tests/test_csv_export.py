@@ -0,0 +1,29 @@
+import csv
+
+import pytest
+
+from services.csv_export import CsvExporter
+
+
+def _linhas(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_escrita_depois_do_close_falha_sem_reabrir_o_arquivo(tmp_path):
+    exporter = CsvExporter(output_dir=str(tmp_path))
+    exporter.write({"nome": 'Empresa "A"', "status": "qualificado"})
+    exporter.close()
+
+    path = exporter.paths["qualificado"]
+    antes = _linhas(path)
+    assert [linha[0] for linha in antes] == ["nome", 'Empresa "A"']
+
+    with pytest.raises(RuntimeError):
+        exporter.write({"nome": "Empresa B", "status": "qualificado"})
+    with pytest.raises(RuntimeError):
+        exporter.write({"nome": "Empresa C", "status": "descartado"})
+
+    exporter.close()
+    assert _linhas(path) == antes
+    assert not (tmp_path / "leads_descartados.csv").exists()
@@ -0,0 +1,78 @@
+import random
+
+from services.email_extractor import classify_email, decode_cfemail, extract_emails
+from services.site_crawler import SiteCrawler
+
+from bench_email_extraction import _cfemail, gerar_pagina
+
+
+def test_decode_cfemail():
+    assert decode_cfemail(_cfemail("contato@empresa.com.br", 0x42)) == "contato@empresa.com.br"
+    assert decode_cfemail("zz") == ""
+
+
+def test_extrai_cloudflare_mailto_entidades_e_texto():
+    html = (
+        f'<span class="__cf_email__" data-cfemail="{_cfemail("cf@empresa.com.br", 0x42)}">[email protected]</span>'
+        f'<a href="/cdn-cgi/l/email-protection#{_cfemail("hash@empresa.com.br", 0x1f)}">email</a>'
+        '<a href="mailto:Vendas%40Empresa.com.br?subject=Orçamento">vendas</a>'
+        "<p>comercial&#64;empresa.com.br</p>"
+        "<p>Fale com joao.silva@empresa.com.br.</p>"
+    )
+
+    assert sorted(extract_emails(html)) == [
+        "cf@empresa.com.br",
+        "comercial@empresa.com.br",
+        "hash@empresa.com.br",
+        "joao.silva@empresa.com.br",
+        "vendas@empresa.com.br"
+    ]
+
+
+def test_descarta_assets_placeholders_e_blocos_de_codigo():
+    html = (
+        '<img src="/img/logo@2x.png" srcset="banner@3x.webp 3x">'
+        '<link href="/static/app.min@1.2.css">'
+        "<p>seu-email@example.com, nome@seudominio.com.br</p>"
+        '<script>Sentry.init({dsn: "https://abc@o1.ingest.sentry.io/1"}); var x = "js@empresa.com.br";</script>'
+        "<style>.a { background: url(icone@2x.svg) }</style>"
+        "<!-- antigo@empresa.com.br -->"
+        '<img src="data:image/png;base64,aGVsbG9AZW1wcmVzYS5jb20uYnI=">'
+        "<footer>contato@empresa.com.br</footer>"
+    )
+
+    assert extract_emails(html) == ["contato@empresa.com.br"]
+
+
+def test_json_ld_e_preservado():
+    html = '<script type="application/ld+json">{"email": "sac@empresa.com.br"}</script>'
+    assert extract_emails(html) == ["sac@empresa.com.br"]
+
+
+def test_classificacao_dominio_generico_vence_keyword():
+    assert classify_email("contato@gmail.com") == "generico"
+    assert classify_email("Joao@Hotmail.com") == "generico"
+    assert classify_email("contato@empresa.com.br") == "funcional"
+    assert classify_email("orcamento.obras@empresa.com.br") == "funcional"
+    assert classify_email("joao@empresa.com.br") == "corporativo"
+
+
+def test_resultado_do_crawl_prefere_dominio_proprio():
+    emails = {
+        "loja@gmail.com": classify_email("loja@gmail.com"),
+        "contato@empresa.com.br": classify_email("contato@empresa.com.br"),
+        "joao@empresa.com.br": classify_email("joao@empresa.com.br")
+    }
+
+    resultado = SiteCrawler(user_agent="teste")._build_result(emails)
+
+    assert sorted(resultado["emails_corporativos"]) == ["contato@empresa.com.br", "joao@empresa.com.br"]
+    assert resultado["emails_genericos"] == ["loja@gmail.com"]
+
+
+def test_corpus_do_benchmark_sem_falsos_positivos_nem_perdas():
+    rnd = random.Random(42)
+
+    for i in range(20):
+        html, gabarito = gerar_pagina(i, rnd)
+        assert set(extract_emails(html)) == gabarito
@@ -0,0 +1,60 @@
+import pytest
+
+from config import BBOX_CURITIBA
+from services.geo_search import GeoSearch
+from services.places_client import GooglePlacesClient
+from services.rate_limiter import AdaptiveRateLimiter
+
+from fake_servers import FakePlacesGeo
+
+
+@pytest.fixture
+def places_geo(iniciar_places):
+    return lambda lugares: iniciar_places(FakePlacesGeo, bbox=BBOX_CURITIBA, lugares=lugares)
+
+
+def _coletar(places, geo):
+    client = GooglePlacesClient(rate_limiter=AdaptiveRateLimiter(0))
+    busca = GeoSearch(client) if geo else None
+    leads = busca.coletar_por_nicho("dentista") if geo else client.coletar_por_nicho("dentista")
+
+    # só Curitiba: a região metropolitana é consultada por texto nos dois modos
+    unicos = {lead["place_id"] for lead in leads if "-geo-" in lead["place_id"]}
+    return unicos, places.calls["text_search"], busca
+
+
+def test_fake_respeita_location_e_radius(places_geo):
+    places = places_geo(2000)
+    centro = (-25.4284, -49.2733)
+
+    data = GooglePlacesClient().text_search("dentista Curitiba PR", location=centro, radius=800)
+    distancias = [
+        places._distancia(centro, (r["geometry"]["location"]["lat"], r["geometry"]["location"]["lng"]))
+        for r in data["results"]
+    ]
+
+    assert distancias and max(distancias) <= 800
+
+
+def test_geo_subdivide_e_cobre_alem_do_teto_dos_bairros(places_geo):
+    bairros, chamadas_bairros, _ = _coletar(places_geo(4000), geo=False)
+    geo, chamadas_geo, busca = _coletar(places_geo(4000), geo=True)
+
+    stats = busca.summary()
+    assert stats["subdivididos"] > 0 and stats["tiles"] > 1
+
+    # cada consulta de bairro para no teto da API: a cobertura estaciona
+    assert len(geo) > 3 * len(bairros)
+    assert len(geo) >= 0.95 * 4000
+
+    # o custo extra da quadtree vem em leads novos (vários por chamada)
+    assert (len(geo) - len(bairros)) / (chamadas_geo - chamadas_bairros) >= 4
+
+
+def test_rendimento_da_quadtree_nao_cai_com_a_densidade(places_geo):
+    esparso, chamadas_esparso, _ = _coletar(places_geo(1000), geo=True)
+    denso, chamadas_denso, _ = _coletar(places_geo(4000), geo=True)
+
+    assert len(esparso) >= 0.95 * 1000
+    assert len(denso) >= 0.95 * 4000
+    assert len(denso) / chamadas_denso >= 0.9 * len(esparso) / chamadas_esparso
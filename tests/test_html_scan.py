@@ -0,0 +1,89 @@
+import pytest
+
+import services.site_crawler as site_crawler
+from services.html_scan import PageScanner, is_html
+from services.page_analysis import analisar_pagina
+from services.site_crawler import PAGINA_VAZIA, SiteCrawler
+
+from fake_servers import _Servidor
+
+HTML = (
+    '<html><body><p>Atenção: orçamento grátis</p>'
+    '<a href="/contato">Contato</a><a href="/servicos">Serviços</a>'
+    "<footer>comercial@empresa.com.br</footer></body></html>"
+)
+
+
+class PaginasFixas(_Servidor):
+    # {caminho: (Content-Type, corpo)}
+    def __init__(self, paginas):
+        super().__init__(0.0)
+        self.paginas = paginas
+
+    def responder(self, request):
+        content_type, body = self.paginas[request.path]
+        return 200, {"Content-Type": content_type}, body
+
+
+def test_limite_de_bytes_trunca_e_para_de_ler():
+    scanner = PageScanner(max_bytes=100)
+
+    assert scanner.feed(b"a" * 60)
+    assert not scanner.feed(b"b" * 60)
+    assert not scanner.feed(b"c" * 60)
+
+    texto, _ = scanner.close()
+    assert scanner.truncated
+    assert scanner.bytes_read == 100
+    assert texto == "a" * 60 + "b" * 40
+
+
+def test_decodificacao_incremental_entre_chunks():
+    # um byte por chunk: caracteres multibyte e tags partidas no meio
+    scanner = PageScanner(encoding="utf-8")
+    for byte in HTML.encode("utf-8"):
+        assert scanner.feed(bytes([byte]))
+
+    texto, hrefs = scanner.close()
+    assert texto == HTML
+    assert hrefs == ["/contato", "/servicos"]
+
+
+def test_charset_desconhecido_le_como_utf8():
+    analise = analisar_pagina(HTML.encode("utf-8"), "utf8mb4", "https://empresa.com.br")
+
+    assert analise["emails"] == {"comercial@empresa.com.br": "funcional"}
+    assert analise["contact_links"] == ["https://empresa.com.br/contato"]
+
+
+def test_content_type_html():
+    assert is_html(None)
+    assert is_html("text/html; charset=ISO-8859-1")
+    assert is_html("Application/XHTML+XML")
+    assert not is_html("application/pdf")
+    assert not is_html("image/png")
+
+
+@pytest.fixture
+def paginas(iniciar_servidor, monkeypatch):
+    monkeypatch.setattr(site_crawler, "CRAWL_MAX_BYTES", 2_000)
+
+    corpo = HTML.encode("utf-8")
+    servidor = PaginasFixas({
+        "/catalogo.pdf": ("application/pdf", b"%PDF-1.4 vendas@empresa.com.br"),
+        "/pagina": ("text/html; charset=utf-8", corpo),
+        "/longa": ("text/html; charset=utf-8", b" " * 2_000 + corpo)
+    })
+    return iniciar_servidor(servidor)
+
+
+def test_crawler_pula_nao_html_e_respeita_o_limite(paginas):
+    crawler = SiteCrawler(user_agent="teste")
+
+    assert crawler._analisar_url(f"{paginas}/catalogo.pdf", paginas) == PAGINA_VAZIA
+    assert crawler._analisar_url(f"{paginas}/pagina", paginas)["emails"] == {
+        "comercial@empresa.com.br": "funcional"
+    }
+
+    # email depois de CRAWL_MAX_BYTES: fora do corpo lido
+    assert crawler._analisar_url(f"{paginas}/longa", paginas) == PAGINA_VAZIA
@@ -0,0 +1,54 @@
+from services.http_cache import ResponseCache
+from services.places_client import text_search_params
+
+from conftest import ClienteRegistrado, place_ids
+
+
+def _remover(cache, params):
+    with cache._lock:
+        cache.conn.execute(
+            "DELETE FROM http_cache WHERE cache_key = ?",
+            (cache.make_key("text_search", params),)
+        )
+        cache.conn.commit()
+
+
+def test_primeira_pagina_so_vale_com_as_seguintes_em_cache(tmp_path):
+    cache = ResponseCache(db_path=str(tmp_path / "cache.db"))
+    pagina_1 = text_search_params("dentista em Batel")
+    pagina_2 = text_search_params("dentista em Batel", page_token="abc")
+
+    cache.set("text_search", pagina_1, {"status": "OK", "results": [], "next_page_token": "abc"})
+    cache.set("text_search", pagina_2, {"status": "OK", "results": []})
+    assert cache.get_pagina("text_search", pagina_1)["next_page_token"] == "abc"
+
+    _remover(cache, pagina_2)
+    assert cache.get_pagina("text_search", pagina_1) is None
+    assert cache.misses["text_search"] == 1
+
+    cache.close()
+
+
+def test_pagina_seguinte_fora_do_cache_refaz_a_consulta(fake_places, iniciar_places, tres_paginas, tmp_path):
+    cache = ResponseCache(db_path=str(tmp_path / "cache.db"))
+    cliente = ClienteRegistrado(cache=cache)
+    esperado = place_ids(cliente.coletar_por_nicho("dentista"))
+
+    # 2ª página de cada consulta sai do cache (TTL / LRU); as demais ficam
+    removidas = 0
+    for params, data in cliente.respostas:
+        if "pagetoken" not in params and data.get("next_page_token"):
+            _remover(cache, {**params, "pagetoken": data["next_page_token"]})
+            removidas += 1
+    assert removidas
+
+    # servidor novo: os tokens guardados nas 1ªs páginas já expiraram
+    novo = iniciar_places(token_delay=0.05)
+    try:
+        refeito = ClienteRegistrado(cache=cache).coletar_por_nicho("dentista")
+    finally:
+        cache.close()
+
+    assert place_ids(refeito) == esperado
+    assert novo.calls["token_invalido"] == 0
+    assert novo.calls["text_search"] == 2 * removidas
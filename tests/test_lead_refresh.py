@@ -0,0 +1,36 @@
+import sqlite3
+
+from services.csv_export import CsvExporter
+from services.lead_refresh import RefreshScheduler
+from services.scoring import LeadScorer
+from services.storage import Storage
+
+from conftest import criar_banco_original
+
+
+def test_revisao_de_banco_migrado_pontua_leads_antigos(tmp_path):
+    db_path = str(tmp_path / "leads.db")
+    criar_banco_original(db_path, [
+        ("antigo_1", "Empresa 1", "https://empresa1.com.br", "contato@empresa1.com.br",
+         "qualificado", 90, "dedetizadora", "Curitiba", "Batel", "2024-01-01T00:00:00"),
+        ("antigo_2", "Empresa 2", None, None,
+         "descartado", 20, "guincho", "Curitiba", "Centro", "2024-01-02T00:00:00")
+    ])
+
+    storage = Storage(db_path, exporter=CsvExporter(output_dir=str(tmp_path / "outputs")))
+    refresh = RefreshScheduler(storage, ttl_days=0)
+    scorer = LeadScorer()
+
+    try:
+        leads = list(refresh.pendentes())
+        assert [lead["place_id"] for lead in leads] == ["antigo_1", "antigo_2"]
+
+        for lead in leads:
+            assert lead["concorrencia"] == 0
+            refresh.registrar(scorer.calcular_score(lead))
+    finally:
+        storage.close()
+
+    assert refresh.summary()["revisados"] == 2
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM leads WHERE enriched_at > created_at").fetchone()[0] == 2
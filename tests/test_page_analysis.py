@@ -0,0 +1,53 @@
+import asyncio
+import random
+
+import pytest
+
+from services.page_analysis import AnalysisPool, analisar_pagina
+
+from bench_email_extraction import gerar_pagina
+from fake_servers import CONTATO_LEGADO, SiteFarm
+
+
+@pytest.fixture(scope="module")
+def paginas():
+    rnd = random.Random(7)
+    farm = SiteFarm(blocos=20, legados=True)
+    corpus = [(gerar_pagina(i, rnd)[0].encode("utf-8"), "utf-8") for i in range(5)]
+
+    # sites comuns (utf-8) e um legado (latin-1, URL de contato acentuada)
+    sites = [f"s{i}" for i in range(30)]
+    legado = next(site for site in sites if farm.legado(site))
+
+    for site in [site for site in sites if not farm.legado(site)][:3]:
+        for pagina in ("", "contato"):
+            corpus.append((farm._pagina(site, pagina).encode("utf-8"), "utf-8"))
+    for pagina in ("", CONTATO_LEGADO):
+        corpus.append((farm._pagina(legado, pagina).encode("iso-8859-1"), "iso-8859-1"))
+
+    return [(body, encoding, f"https://empresa{n}.com.br") for n, (body, encoding) in enumerate(corpus)]
+
+
+def _normalizado(analises):
+    # contact_links vem de um set: a ordem muda entre processos (hash seed)
+    return [{**a, "contact_links": sorted(a["contact_links"])} for a in analises]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = AnalysisPool(workers=2)
+    yield pool
+    pool.close()
+
+
+def test_pool_spawn_devolve_o_mesmo_resultado_da_analise_local(pool, paginas):
+    esperado = _normalizado(analisar_pagina(*pagina) for pagina in paginas)
+    assert any(analise["emails"] for analise in esperado)
+    assert any(analise["contact_links"] for analise in esperado)
+
+    async def _todas():
+        return await asyncio.gather(*(pool.analisar_async(*pagina) for pagina in paginas))
+
+    assert _normalizado(pool.analisar(*pagina) for pagina in paginas) == esperado
+    assert _normalizado(asyncio.run(_todas())) == esperado
+    assert _normalizado(pool.map(paginas)) == esperado
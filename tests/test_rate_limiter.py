@@ -0,0 +1,138 @@
+import json
+import time
+import asyncio
+
+import pytest
+from tenacity import wait_fixed
+
+from services.places_client import GooglePlacesClient
+from services.async_places_client import AsyncGooglePlacesClient
+from services.rate_limiter import AdaptiveRateLimiter
+
+from fake_servers import FakePlaces
+
+
+class PlacesComThrottling(FakePlaces):
+    # responde a sequência `injetar` (429 / OVER_QUERY_LIMIT / página HTML de proxy) antes de voltar ao normal
+    def __init__(self, injetar, **kwargs):
+        super().__init__(**kwargs)
+        self.injetar = list(injetar)
+        self.respostas = []
+
+    def responder(self, request):
+        with self._lock:
+            falha = self.injetar.pop(0) if self.injetar else None
+            self.respostas.append(falha or "OK")
+
+        if falha == 429:
+            return 429, {"Content-Type": "application/json"}, b"{}"
+        if falha == "html":
+            return 200, {"Content-Type": "text/html"}, b"<html><body>Bad gateway</body></html>"
+        if falha:
+            return 200, {"Content-Type": "application/json"}, json.dumps({"status": falha, "results": []}).encode("utf-8")
+        return super().responder(request)
+
+
+@pytest.fixture
+def backoff_curto(monkeypatch):
+    # backoff exponencial real (até PLACES_BACKOFF_MAX) deixaria o teste lento;
+    # 4 esperas de 0.3s ainda cobrem a janela de 1s do limite do servidor
+    monkeypatch.setattr(GooglePlacesClient.text_search.retry, "wait", wait_fixed(0.3))
+    monkeypatch.setattr(AsyncGooglePlacesClient.text_search.retry, "wait", wait_fixed(0.3))
+
+
+@pytest.fixture
+def stub(iniciar_places):
+    return lambda injetar, **kwargs: iniciar_places(PlacesComThrottling, injetar, **kwargs)
+
+
+def test_429_e_over_query_limit_sao_retentados_e_cortam_o_ritmo(stub, backoff_curto):
+    places = stub([429, "OVER_QUERY_LIMIT"])
+    limiter = AdaptiveRateLimiter(10, step=0.5, cooldown=0)
+
+    data = GooglePlacesClient(rate_limiter=limiter).text_search("dentista Batel, Curitiba PR")
+
+    assert data["status"] == "OK" and data["results"]
+    assert places.respostas == [429, "OVER_QUERY_LIMIT", "OK"]
+
+    stats = limiter.stats()
+    assert stats["throttles"] == 2
+    assert stats["backoffs"] == 2
+    assert stats["sucessos"] == 1
+
+    # 10 -> 5 -> 2.5 (corte multiplicativo) -> 3.0 (aumento aditivo)
+    assert stats["rate"] == pytest.approx(3.0)
+
+
+def test_resposta_nao_json_e_retentada(stub, backoff_curto):
+    places = stub(["html"])
+    data = GooglePlacesClient(rate_limiter=AdaptiveRateLimiter(0)).text_search("dentista Batel, Curitiba PR")
+
+    assert data["status"] == "OK" and data["results"]
+    assert places.respostas == ["html", "OK"]
+
+
+def test_resposta_nao_json_e_retentada_no_client_async(stub, backoff_curto):
+    places = stub(["html"])
+
+    async def _buscar():
+        async with AsyncGooglePlacesClient(rate_limiter=AdaptiveRateLimiter(0)) as client:
+            return await client.text_search("dentista Batel, Curitiba PR")
+
+    data = asyncio.run(_buscar())
+
+    assert data["status"] == "OK" and data["results"]
+    assert places.respostas == ["html", "OK"]
+
+
+def test_retentativas_esgotadas_propagam_o_erro(stub, backoff_curto):
+    places = stub(["OVER_QUERY_LIMIT"] * 10)
+
+    with pytest.raises(Exception, match="OVER_QUERY_LIMIT"):
+        GooglePlacesClient(rate_limiter=AdaptiveRateLimiter(10)).text_search("dentista Batel, Curitiba PR")
+
+    assert len(places.respostas) == GooglePlacesClient.text_search.retry.stop.max_attempt_number
+
+
+def test_um_corte_por_janela_de_cooldown():
+    limiter = AdaptiveRateLimiter(8, cooldown=0.2)
+
+    # requests em voo batem no limite juntos: só o primeiro corta
+    for _ in range(5):
+        limiter.record_throttle()
+    assert limiter.rate == pytest.approx(4)
+
+    time.sleep(0.25)
+    limiter.record_throttle()
+    assert limiter.rate == pytest.approx(2)
+    assert limiter.stats()["throttles"] == 6
+
+
+def test_ritmo_respeita_o_piso_e_volta_ao_teto():
+    limiter = AdaptiveRateLimiter(4, min_rate=1, step=0.5, cooldown=0)
+
+    for _ in range(5):
+        limiter.record_throttle()
+    assert limiter.rate == pytest.approx(1)
+
+    for _ in range(20):
+        limiter.record_success()
+    assert limiter.rate == pytest.approx(4)
+
+
+def test_coleta_sob_throttling_do_servidor_nao_perde_resultados(fake_places, stub, backoff_curto):
+    esperado = {lead["place_id"] for lead in GooglePlacesClient(
+        rate_limiter=AdaptiveRateLimiter(0)
+    ).coletar_por_nicho("dentista")}
+
+    # servidor aceita 20 QPS; o cliente começa no dobro
+    places = stub([], qps=20, token_delay=0.05)
+    limiter = AdaptiveRateLimiter(40, min_rate=15, cooldown=0.2)
+    coletado = {lead["place_id"] for lead in GooglePlacesClient(
+        rate_limiter=limiter
+    ).coletar_por_nicho("dentista")}
+
+    assert places.calls["throttled"] > 0
+    assert limiter.stats()["throttles"] == places.calls["throttled"]
+    assert limiter.rate < 40
+    assert coletado == esperado
@@ -0,0 +1,48 @@
+import csv
+import importlib
+import sqlite3
+
+from services.storage import Storage
+
+from conftest import criar_banco_original
+
+
+def _rescore(monkeypatch, db_path):
+    monkeypatch.setenv("SQLITE_DB_PATH", db_path)
+    rescore = importlib.import_module("rescore")
+    monkeypatch.setattr(rescore, "SQLITE_DB_PATH", db_path)
+    rescore.rescore()
+
+
+def test_lead_sem_dados_do_scorer_mantem_score_gravado(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    db_path = str(tmp_path / "leads.db")
+
+    # site + nicho + concorrência alta: qualificado sem email corporativo
+    criar_banco_original(db_path, [
+        ("antigo", "Empresa Antiga", "https://antiga.com.br", None,
+         "qualificado", 70, "dedetizadora", "Curitiba", "Batel", "2024-01-01T00:00:00")
+    ])
+
+    storage = Storage(db_path)
+    storage.save_lead({
+        "place_id": "novo", "nome": "Empresa Nova", "site": "https://nova.com.br",
+        "concorrencia": 3, "endereco": "Rua X, Centro, Curitiba", "nicho": "guincho",
+        "status": "qualificado", "score_valor": 95
+    })
+    storage.close()
+
+    _rescore(monkeypatch, db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        gravados = dict(conn.execute("SELECT place_id, score || ' ' || status FROM leads"))
+
+    assert gravados["antigo"] == "70 qualificado"
+    assert gravados["novo"] == "60 sem_email"
+
+    with open(tmp_path / "outputs" / "leads_qualificados.csv", encoding="utf-8") as f:
+        assert [row["nome"] for row in csv.DictReader(f)] == ["Empresa Antiga"]
+
+    saida = capsys.readouterr().out
+    assert "Status alterados: 1" in saida
+    assert "Sem dados para reavaliar (score mantido): 1" in saida
@@ -0,0 +1,20 @@
+import pytest
+
+from services.site_canonical import canonicalize_site
+
+
+@pytest.mark.parametrize("url", [
+    "http://example.com:99999/",
+    "http://example.com:abc/",
+    "http://[::1/"
+])
+def test_website_malformado_nao_crawlea(url):
+    assert canonicalize_site(url) is None
+
+
+def test_variantes_do_mesmo_dominio_viram_um_site():
+    chaves = {
+        canonicalize_site(url)
+        for url in ("http://www.x.com.br/", "https://x.com.br/?utm_source=gmb", "x.com.br/curitiba")
+    }
+    assert {chave for chave, _ in chaves} == {"x.com.br"}
@@ -0,0 +1,31 @@
+import pytest
+
+from services.csv_export import CsvExporter
+from services.storage import Storage
+
+
+def _lead(i):
+    return {"place_id": f"place_{i}", "nome": f"Empresa {i}", "status": "qualificado"}
+
+
+@pytest.mark.parametrize("bloom_threshold", [1_000_000, 1])
+def test_indice_carregado_reconhece_leads_gravados(tmp_path, bloom_threshold):
+    db_path = str(tmp_path / "leads.db")
+    exporter = CsvExporter(output_dir=str(tmp_path / "outputs"))
+
+    storage = Storage(db_path, exporter=exporter)
+    for i in range(500):
+        storage.save_lead(_lead(i))
+    storage.close()
+
+    # nova execução: índice em memória carregado a partir do banco
+    storage = Storage(db_path, bloom_threshold=bloom_threshold, exporter=exporter)
+    try:
+        assert storage._known_leads.exact == (bloom_threshold > 500)
+        assert all(storage.lead_exists(f"place_{i}") for i in range(500))
+        assert not storage.lead_exists("place_999")
+        assert storage.filter_new_place_ids(["place_1", "place_999", "place_2", "place_1000"]) == [
+            "place_999", "place_1000"
+        ]
+    finally:
+        storage.close()
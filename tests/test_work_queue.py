@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import signal
+import subprocess
+
+from services.work_queue import WorkQueue, WorkerSession
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# worker descartável: reserva unidades, renova o lease e fica parado até ser morto
+WORKER = """
+import sys, time
+from services.work_queue import WorkQueue, WorkerSession
+fila = WorkQueue(sys.argv[1], lease=float(sys.argv[3]))
+sessao = WorkerSession(fila, sys.argv[2], sys.argv[4], em_voo=2)
+fonte = sessao.unidades(lambda: False)
+print(next(fonte)["id"], next(fonte)["id"], flush=True)
+time.sleep(3600)
+"""
+
+UNIDADES = [("dentista", "PR", "Curitiba", bairro) for bairro in ("Batel", "Centro", "Cajuru", "Xaxim")]
+
+
+def _worker_morto(db_path, plano, lease, worker_id):
+    proc = subprocess.Popen(
+        [sys.executable, "-c", WORKER, db_path, plano, str(lease), worker_id],
+        cwd=RAIZ,
+        stdout=subprocess.PIPE,
+        text=True
+    )
+    reservadas = [int(unit_id) for unit_id in proc.stdout.readline().split()]
+    os.kill(proc.pid, signal.SIGKILL)
+    proc.wait()
+    return proc, reservadas
+
+
+def _status(fila, reservadas):
+    marcadores = ",".join("?" * len(reservadas))
+    return dict(fila.conn.execute(
+        f"SELECT id, status FROM work_units WHERE id IN ({marcadores})", reservadas
+    ).fetchall())
+
+
+def test_lease_do_worker_morto_vence_mesmo_com_id_reaproveitado(tmp_path):
+    db_path = str(tmp_path / "fila.db")
+    fila = WorkQueue(db_path, lease=1.5)
+    plano = fila.criar_plano(UNIDADES)["plano"]
+
+    _, reservadas = _worker_morto(db_path, plano, 1.5, "w0")
+    assert len(reservadas) == 2
+
+    # reinício com o mesmo id lógico: o heartbeat só renova o que a sessão abriu
+    sessao = WorkerSession(fila, plano, "w0", em_voo=4)
+    try:
+        time.sleep(2.5)
+        retomadas = [
+            unidade["id"]
+            for unidade in (fila.reservar(plano, "w1") for _ in range(4))
+            if unidade and unidade["retomada"]
+        ]
+        assert sorted(retomadas) == sorted(reservadas)
+    finally:
+        sessao.close()
+        fila.close()
+
+
+def test_coordenador_devolve_unidades_do_worker_morto(tmp_path):
+    db_path = str(tmp_path / "fila.db")
+    fila = WorkQueue(db_path, lease=3600)
+    plano = fila.criar_plano(UNIDADES)["plano"]
+
+    proc, reservadas = _worker_morto(db_path, plano, 3600, f"w0-{os.getpid()}")
+    assert set(_status(fila, reservadas).values()) == {"em_execucao"}
+
+    # shards.run: sem esperar o lease, as unidades do processo morto voltam à fila
+    fila.devolver(f"w0-{os.getpid()}")
+    assert set(_status(fila, reservadas).values()) == {"pendente"}
+
+    reservada = fila.reservar(plano, "w0-novo")
+    assert reservada["id"] in reservadas and reservada["retomada"]
+    fila.close()
+
+
+def test_worker_que_conclui_tudo_termina(tmp_path):
+    fila = WorkQueue(str(tmp_path / "fila.db"), lease=5)
+    plano = fila.criar_plano(UNIDADES)["plano"]
+    sessao = WorkerSession(fila, plano, "w0", em_voo=4)
+
+    for unidade in sessao.unidades(lambda: False):
+        assert sessao.abrir(unidade, [], 1, 0)
+        sessao.concluir(unidade["id"])
+
+    sessao.close()
+    assert fila.progresso(plano)["concluida"] == len(UNIDADES)
+    fila.close()